@@ -1,13 +1,50 @@
 # SPDX-License-Identifier: GPL-3.0-only
 # Copyright (C) 2025 Samuel Amen Ague
 
-from utils import PyInstallerWorkspaceGUI
-from PySide6.QtWidgets import QApplication
+from utils import startup
 import sys
 
+
+def _profile_option(argv):
+    """Retire --profile-startup[=trace.json] de argv ; retourne le chemin de la trace ou None."""
+    for arg in list(argv[1:]):
+        if arg == "--profile-startup" or arg.startswith("--profile-startup="):
+            argv.remove(arg)
+            return arg.partition("=")[2] or startup.DEFAULT_TRACE
+    return None
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    win = PyInstallerWorkspaceGUI()
-    win.show()
-    sys.exit(app.exec())
+    # --profile-startup : imports chronométrés module par module et trace Chrome (utils/startup.py)
+    # PYCOMPILER_STARTUP_TIMING=1 : durée des phases de démarrage seulement, sur stderr
+    trace_path = _profile_option(sys.argv)
+    if trace_path:
+        startup.enable()
+        startup.install_import_hook()
+    with startup.phase("import PySide6"):
+        from PySide6.QtCore import QTimer
+        from PySide6.QtWidgets import QApplication
+    with startup.phase("import utils.worker"):
+        from utils import PyInstallerWorkspaceGUI
+    with startup.phase("QApplication"):
+        app = QApplication(sys.argv)
+    with startup.phase("PyInstallerWorkspaceGUI.__init__"):
+        win = PyInstallerWorkspaceGUI()
+
+    def on_first_paint():
+        startup.mark("first paint")
+        startup.remove_import_hook()
+        startup.print_report()
+        if trace_path:
+            try:
+                path = startup.write_trace(trace_path)
+                print(f"[startup] trace écrite : {path} (chrome://tracing, Perfetto ou speedscope)", file=sys.stderr)
+            except OSError as e:
+                print(f"[startup] écriture de la trace impossible : {e}", file=sys.stderr)
 
+    if startup.ENABLED:
+        # Rapport et trace produits juste après le premier rendu de la fenêtre
+        paint_watch = startup.watch_first_paint(win, lambda: QTimer.singleShot(0, on_first_paint))
+    with startup.phase("show"):
+        win.show()
+    sys.exit(app.exec())
@@ -65,6 +65,10 @@ if (Test-Path -Path 'requirements.txt') {
     Write-Host "⚠️ Aucun fichier requirements.txt trouvé. Dépendances non installées."
 }
 
+# Precompile the UI (pyside6-uic) so startup skips runtime .ui parsing; QUiLoader is the fallback
+Write-Host "🧩 Précompilation de l'interface..."
+& $VENV_PY 'utils/ui_cache.py'
+
 # Run main.py with the venv Python
 Write-Host "🚀 Lancement de main.py..."
 & $VENV_PY 'main.py'
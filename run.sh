@@ -24,6 +24,10 @@ else
     echo "⚠️ Aucun fichier requirements.txt trouvé. Dépendances non installées."
 fi
 
+# Précompiler l'interface (pyside6-uic) ; en cas d'échec, QUiLoader prend le relais
+echo "🧩 Précompilation de l'interface..."
+"$VENV_DIR/bin/python" utils/ui_cache.py
+
 # Lancer le programme principal
 echo "🚀 Lancement de main.py..."
 "$VENV_DIR/bin/python" main.py
@@ -31,81 +31,66 @@ Expose :
     PyInstallerWorkspaceGUI
 """
 
-# Préférences utilisateur
-from .preferences import (
-    MAX_PARALLEL as MAX_PARALLEL,
-    PREFS_FILE as PREFS_FILE,
-    load_preferences as load_preferences,
-    save_preferences as save_preferences,
-    update_ui_state as update_ui_state,
-)
+import importlib
 
-# Compilation
-from .compiler import (
-    compile_all as compile_all,
-    try_start_processes as try_start_processes,
-    start_compilation_process as start_compilation_process,
-    handle_stdout as handle_stdout,
-    handle_stderr as handle_stderr,
-    handle_finished as handle_finished,
-    try_install_missing_modules as try_install_missing_modules,
-    show_error_dialog as show_error_dialog,
-    cancel_all_compilations as cancel_all_compilations,
-    build_pyinstaller_command as build_pyinstaller_command,
-    build_nuitka_command as build_nuitka_command,
-)
+# Nom exporté -> module qui le définit ; importé au premier accès (PEP 562) pour que
+# « from utils import PyInstallerWorkspaceGUI » ne charge pas tous les sous-systèmes.
+_EXPORTS = {
+    # Préférences utilisateur
+    "MAX_PARALLEL": ".preferences",
+    "PREFS_FILE": ".preferences",
+    "load_preferences": ".preferences",
+    "save_preferences": ".preferences",
+    "update_ui_state": ".preferences",
+    # Compilation
+    "compile_all": ".compiler",
+    "try_start_processes": ".compiler",
+    "start_compilation_process": ".compiler",
+    "handle_stdout": ".compiler",
+    "handle_stderr": ".compiler",
+    "handle_finished": ".compiler",
+    "try_install_missing_modules": ".compiler",
+    "show_error_dialog": ".compiler",
+    "cancel_all_compilations": ".compiler",
+    "build_pyinstaller_command": ".compiler",
+    "build_nuitka_command": ".compiler",
+    # Analyse de dépendances
+    "suggest_missing_dependencies": ".dependency_analysis",
+    "_install_next_dependency": ".dependency_analysis",
+    "_on_dep_pip_output": ".dependency_analysis",
+    "_on_dep_pip_finished": ".dependency_analysis",
+    # Dialogues
+    "ProgressDialog": ".dialogs",
+    # UI principale
+    "PyInstallerWorkspaceGUI": ".worker",
+}
 
-# Analyse de dépendances
-from .dependency_analysis import (
-    suggest_missing_dependencies as suggest_missing_dependencies,
-    _install_next_dependency as _install_next_dependency,
-    _on_dep_pip_output as _on_dep_pip_output,
-    _on_dep_pip_finished as _on_dep_pip_finished,
-)
+# API structurée (optionnel) : section -> noms exportés
+_API_SECTIONS = {
+    "preferences": ".preferences",
+    "compiler": ".compiler",
+    "dependency_analysis": ".dependency_analysis",
+    "dialogs": ".dialogs",
+    "ui": ".worker",
+}
 
-# Dialogues
-from .dialogs import (
-    ProgressDialog as ProgressDialog,
-)
 
-# UI principale
-from .worker import PyInstallerWorkspaceGUI as PyInstallerWorkspaceGUI
-
-# API structurée (optionnel)
-api = {
-    "preferences": {
-        "MAX_PARALLEL": MAX_PARALLEL,
-        "PREFS_FILE": PREFS_FILE,
-        "load_preferences": load_preferences,
-        "save_preferences": save_preferences,
-        "update_ui_state": update_ui_state,
-    },
-    "compiler": {
-        "compile_all": compile_all,
-        "try_start_processes": try_start_processes,
-        "start_compilation_process": start_compilation_process,
-        "handle_stdout": handle_stdout,
-        "handle_stderr": handle_stderr,
-        "handle_finished": handle_finished,
-        "try_install_missing_modules": try_install_missing_modules,
-        "show_error_dialog": show_error_dialog,
-        "cancel_all_compilations": cancel_all_compilations,
-        "build_pyinstaller_command": build_pyinstaller_command,
-        "build_nuitka_command": build_nuitka_command,
-    },
-    "dependency_analysis": {
-        "suggest_missing_dependencies": suggest_missing_dependencies,
-        "_install_next_dependency": _install_next_dependency,
-        "_on_dep_pip_output": _on_dep_pip_output,
-        "_on_dep_pip_finished": _on_dep_pip_finished,
-    },
-    "dialogs": {
-        "ProgressDialog": ProgressDialog,
-    },
-    "ui": {
-        "PyInstallerWorkspaceGUI": PyInstallerWorkspaceGUI,
-    }
-}
+def __getattr__(name):
+    if name == "api":
+        value = {
+            section: {n: __getattr__(n) for n, module in _EXPORTS.items() if module == source}
+            for section, source in _API_SECTIONS.items()
+        }
+    elif name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 __all__ = [
     # Préférences utilisateur
@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Analyse de taille des artefacts pour PyCompiler Pro++.
+Localise les sorties PyInstaller/Nuitka d'une compilation, attribue les octets aux paquets
+Python et aux bibliothèques partagées, et signale les régressions par rapport à la
+compilation précédente de la même cible.
+"""
+import ast
+import os
+import platform
+import re
+
+from .build_history import previous_records, update_record
+
+SHARED_LIB_RE = re.compile(r"\.(so(\.\d+)*|dll|dylib|pyd)$", re.IGNORECASE)
+# Seuils de régression : +5 % et au moins 256 Ko
+REGRESSION_RATIO = 0.05
+REGRESSION_MIN_BYTES = 256 * 1024
+
+
+def describe_build(self, file, use_nuitka, options=None):
+    """
+    Capture, au lancement, ce qu'il faut pour retrouver les sorties d'une compilation
+    (les widgets peuvent changer pendant que la compilation tourne).
+    options : surcharges propres au job (mode matrice), prioritaires sur les widgets.
+    """
+    options = options or {}
+    base = os.path.splitext(os.path.basename(file))[0]
+    if use_nuitka:
+        if options.get("onefile", bool(self.nuitka_onefile and self.nuitka_onefile.isChecked())):
+            mode = "onefile"
+        elif options.get("standalone", bool(self.nuitka_standalone and self.nuitka_standalone.isChecked())):
+            mode = "standalone"
+        else:
+            mode = "accelerated"
+        output_dir = options.get("output_dir") or (self.nuitka_output_dir.text().strip() if self.nuitka_output_dir else "")
+        build = {
+            "compiler": "nuitka",
+            "mode": mode,
+            "name": base,
+            "output_dir": os.path.join(self.workspace_dir, output_dir or "."),
+        }
+    else:
+        custom_name = self.output_name_input.text().strip()
+        output_dir = options.get("distpath") or self.output_dir_input.text().strip()
+        build = {
+            "compiler": "pyinstaller",
+            "mode": "onefile" if options.get("onefile", self.opt_onefile.isChecked()) else "onedir",
+            "name": custom_name or base,
+            "output_dir": os.path.join(self.workspace_dir, output_dir or "dist"),
+            "workpath": options.get("workpath") or os.path.join(self.workspace_dir, "build"),
+            "noupx": bool(options.get("noupx", self.opt_noupx.isChecked())),
+        }
+    for key in ("label", "matrix_run"):
+        if options.get(key):
+            build[key] = options[key]
+    return build
+
+
+def locate_artifacts(build):
+    """
+    Retourne (executable, dossier_analyse) pour une compilation décrite par describe_build.
+    Le dossier d'analyse est None quand seul un exécutable onefile est disponible.
+    """
+    exe_suffix = ".exe" if platform.system() == "Windows" else ""
+    out = build["output_dir"]
+    name = build["name"]
+    if build["compiler"] == "pyinstaller":
+        if build["mode"] == "onefile":
+            return os.path.join(out, name + exe_suffix), None
+        folder = os.path.join(out, name)
+        return os.path.join(folder, name + exe_suffix), folder
+    dist = os.path.join(out, f"{name}.dist")
+    if build["mode"] == "standalone":
+        return os.path.join(dist, name + (exe_suffix or ".bin")), dist
+    # onefile et accéléré produisent <nom>.bin (ou .exe) ; le .dist reste pour l'onefile
+    exe = os.path.join(out, name + (exe_suffix or ".bin"))
+    return exe, dist if build["mode"] == "onefile" and os.path.isdir(dist) else None
+
+
+def outputs_outside(build, workspace_dir):
+    """Sorties (exécutable, dossier) situées hors du workspace : ni transférables ni mises en cache."""
+    exe, folder = locate_artifacts(build)
+    root = os.path.abspath(workspace_dir)
+    outside = []
+    for p in [exe] + ([folder] if folder else []):
+        try:
+            inside = os.path.commonpath([os.path.abspath(p), root]) == root
+        except ValueError:
+            inside = False  # autre lecteur (Windows)
+        if not inside:
+            outside.append(p)
+    return outside
+
+
+def artifact_paths(build, workspace_dir):
+    """
+    Sorties d'une compilation à transférer (agent distant, cache d'artefacts), relatives au
+    workspace : exécutable, dossier onedir/standalone et TOC PyInstaller pour l'analyse de taille.
+    """
+    exe, folder = locate_artifacts(build)
+    paths = [exe] + ([folder] if folder else [])
+    if build.get("workpath"):
+        paths.append(os.path.join(build["workpath"], build["name"]))
+    root = os.path.abspath(workspace_dir)
+    return [
+        os.path.relpath(p, root) for p in paths
+        if os.path.commonpath([os.path.abspath(p), root]) == root
+    ]
+
+
+def _attribute(rel_path, size, breakdown):
+    parts = rel_path.replace("\\", "/").split("/")
+    if parts[0] == "_internal" and len(parts) > 1:
+        parts = parts[1:]  # PyInstaller >= 6 range tout sous _internal
+    filename = parts[-1]
+    if len(parts) == 1 and SHARED_LIB_RE.search(filename) and not filename.endswith(".pyd") and ".cpython-" not in filename:
+        breakdown["shared_libs"][filename] = breakdown["shared_libs"].get(filename, 0) + size
+    elif len(parts) > 1:
+        pkg = parts[0]
+        breakdown["packages"][pkg] = breakdown["packages"].get(pkg, 0) + size
+    elif filename.endswith((".pyd", ".so")):
+        pkg = filename.split(".", 1)[0]
+        breakdown["packages"][pkg] = breakdown["packages"].get(pkg, 0) + size
+    else:
+        breakdown["other"] += size
+
+
+def _iter_toc_entries(node):
+    """Parcourt récursivement une TOC PyInstaller évaluée et produit les tuples (nom, chemin, type)."""
+    if isinstance(node, (list, tuple)):
+        if len(node) == 3 and all(isinstance(x, str) for x in node) and node[2].isupper():
+            yield node
+        else:
+            for child in node:
+                yield from _iter_toc_entries(child)
+
+
+def _toc_breakdown(workpath, name, breakdown):
+    """Attribue le contenu d'un onefile PyInstaller à partir des TOC du dossier build/."""
+    build_dir = os.path.join(workpath, name)
+    found = False
+    for toc in ("PKG-00.toc", "PYZ-00.toc"):
+        try:
+            with open(os.path.join(build_dir, toc), "r", encoding="utf-8") as f:
+                tree = ast.literal_eval(f.read())
+        except Exception:
+            continue
+        found = True
+        for dest, src, typecode in _iter_toc_entries(tree):
+            if typecode in ("PYZ", "PKG") or not os.path.isfile(src):
+                continue
+            size = os.path.getsize(src)
+            if typecode == "PYMODULE":
+                pkg = dest.split(".", 1)[0]
+                breakdown["packages"][pkg] = breakdown["packages"].get(pkg, 0) + size
+            else:
+                _attribute(dest, size, breakdown)
+    return found
+
+
+def size_breakdown(build):
+    """Calcule la répartition des octets d'une compilation."""
+    exe, folder = locate_artifacts(build)
+    breakdown = {"total": 0, "executable": exe, "packages": {}, "shared_libs": {}, "other": 0}
+    if folder and os.path.isdir(folder):
+        for root, _, files in os.walk(folder):
+            for f in files:
+                full = os.path.join(root, f)
+                try:
+                    size = os.path.getsize(full)
+                except OSError:
+                    continue
+                _attribute(os.path.relpath(full, folder), size, breakdown)
+                if build["mode"] != "onefile":
+                    breakdown["total"] += size
+    elif build["compiler"] == "pyinstaller" and build.get("workpath"):
+        _toc_breakdown(build["workpath"], build["name"], breakdown)
+    if build["mode"] == "onefile" and os.path.isfile(exe):
+        breakdown["total"] = os.path.getsize(exe)
+    return breakdown
+
+
+def find_regressions(current, previous):
+    """Compare deux répartitions et retourne une liste de messages de régression."""
+    messages = []
+    old_total = previous.get("total", 0)
+    delta = current["total"] - old_total
+    if old_total and delta > REGRESSION_MIN_BYTES and delta > old_total * REGRESSION_RATIO:
+        messages.append(f"Taille totale : {old_total / 1048576:.1f} Mo → {current['total'] / 1048576:.1f} Mo (+{delta / 1048576:.1f} Mo)")
+        for key in ("packages", "shared_libs"):
+            old = previous.get(key, {})
+            grown = sorted(
+                ((n, s - old.get(n, 0)) for n, s in current[key].items() if s - old.get(n, 0) > REGRESSION_MIN_BYTES),
+                key=lambda x: x[1], reverse=True,
+            )
+            for n, d in grown[:5]:
+                status = "nouveau" if n not in old else "croissance"
+                messages.append(f"  {n} : +{d / 1048576:.1f} Mo ({status})")
+    return messages
+
+
+def analyze_artifact_sizes(context, emit):
+    """Étape post-build : mesure, enregistre et compare la taille des artefacts."""
+    build = context["build"]
+    breakdown = size_breakdown(build)
+    if not breakdown["total"] and not breakdown["packages"]:
+        emit(f"⚠️ Analyse de taille : aucun artefact trouvé pour {context['target']} ({breakdown['executable']}).")
+        return
+    update_record(context["workspace_dir"], context["record_id"], size=breakdown)
+    top = sorted(list(breakdown["packages"].items()) + list(breakdown["shared_libs"].items()), key=lambda x: x[1], reverse=True)[:5]
+    emit(
+        f"📦 {context['target']} ({build['compiler']} {build['mode']}) : {breakdown['total'] / 1048576:.1f} Mo — "
+        + ", ".join(f"{n} {s / 1048576:.1f} Mo" for n, s in top)
+    )
+    previous = previous_records(
+        context["workspace_dir"], context["target"], build["compiler"], build["mode"],
+        before_id=context["record_id"], predicate=lambda r: "size" in r and r.get("label") == build.get("label"),
+    )
+    if previous:
+        regressions = find_regressions(breakdown, previous[0]["size"])
+        if regressions:
+            emit("<span style='color:orange;'>⚠️ Régression de taille détectée :<br>" + "<br>".join(regressions) + "</span>")
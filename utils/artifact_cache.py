@@ -0,0 +1,248 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Cache d'artefacts partagé pour PyCompiler Pro++ (bibliothèque standard uniquement).
+Les sorties d'une compilation sont stockées sous forme d'archive tar.gz, indexées par une clé
+SHA-256 (sources + commande + verrou du venv, voir build_cache.py). Deux implémentations :
+un serveur HTTP minimal à partager dans l'équipe, et un dossier local qui le remplace.
+
+    python utils/artifact_cache.py --serve --host 0.0.0.0 --port 8766 --dir ~/.pycompiler_cache --token <secret>
+
+Protocole : HEAD/GET/PUT /<clé>, en-tête X-Cache-Token si le serveur a un jeton.
+(hors boucle locale, un jeton est obligatoire : les exécutables du cache sont extraits puis distribués)
+"""
+import argparse
+import ipaddress
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8766
+KEY_RE = re.compile(r"^[0-9a-f]{64}$")
+TOKEN_HEADER = "X-Cache-Token"
+COPY_CHUNK = 1024 * 1024
+
+
+def _check_key(key):
+    if not KEY_RE.match(key):
+        raise ValueError(f"Clé de cache invalide : {key!r}")
+
+
+class LocalCache:
+    """Cache dans un dossier (disque local ou partage réseau monté)."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.location = self.root
+
+    def _path(self, key):
+        _check_key(key)
+        return os.path.join(self.root, key[:2], key + ".tar.gz")
+
+    def has(self, key):
+        return os.path.isfile(self._path(key))
+
+    def get(self, key, dest):
+        """Copie l'archive dans le fichier binaire dest ; False si absente."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, dest, COPY_CHUNK)
+            os.utime(path)  # dernière utilisation, pour un éventuel nettoyage LRU
+            return True
+        except FileNotFoundError:
+            return False
+
+    def put(self, key, src_path):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out, open(src_path, "rb") as src:
+                shutil.copyfileobj(src, out, COPY_CHUNK)
+            os.replace(tmp, path)  # écriture atomique : un lecteur ne voit jamais d'archive partielle
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+class HttpCache:
+    """Client du serveur de cache (urllib)."""
+
+    def __init__(self, url, token="", timeout=30):
+        self.base = url.rstrip("/")
+        self.location = self.base
+        self.token = token
+        self.timeout = timeout
+
+    def _request(self, method, key, data=None, headers=None):
+        _check_key(key)
+        req = urllib.request.Request(f"{self.base}/{key}", data=data, method=method, headers=dict(headers or {}))
+        if self.token:
+            req.add_header(TOKEN_HEADER, self.token)
+        return urllib.request.urlopen(req, timeout=self.timeout)
+
+    def has(self, key):
+        try:
+            with self._request("HEAD", key):
+                return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+
+    def get(self, key, dest):
+        try:
+            with self._request("GET", key) as resp:
+                shutil.copyfileobj(resp, dest, COPY_CHUNK)
+            return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+
+    def put(self, key, src_path):
+        size = os.path.getsize(src_path)
+        with open(src_path, "rb") as f:
+            headers = {"Content-Length": str(size), "Content-Type": "application/gzip"}
+            with self._request("PUT", key, data=f, headers=headers):
+                pass
+
+
+def open_cache(location, token=""):
+    """Cache correspondant à une préférence : URL http(s) ou chemin de dossier ; None si vide."""
+    location = (location or "").strip()
+    if not location:
+        return None
+    if location.startswith(("http://", "https://")):
+        return HttpCache(location, token)
+    return LocalCache(location)
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    server_version = "PyCompilerCache/1"
+
+    def _key(self):
+        key = self.path.strip("/")
+        if not KEY_RE.match(key):
+            self.send_error(400, "Clé invalide")
+            return None
+        token = self.server.token
+        if token and not secrets.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+            self.send_error(403, "Jeton invalide")
+            return None
+        return key
+
+    def do_HEAD(self):
+        key = self._key()
+        if key is None:
+            return
+        path = self.server.store._path(key)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(os.path.getsize(path)))
+        self.end_headers()
+
+    def do_GET(self):
+        key = self._key()
+        if key is None:
+            return
+        path = self.server.store._path(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            self.send_error(404)
+            return
+        with f:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/gzip")
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile, COPY_CHUNK)
+        os.utime(path)
+
+    def do_PUT(self):
+        key = self._key()
+        if key is None:
+            return
+        length = int(self.headers.get("Content-Length", "0"))
+        if length <= 0:
+            self.send_error(411)
+            return
+        with tempfile.NamedTemporaryFile(dir=self.server.store.root, suffix=".upload", delete=False) as tmp:
+            remaining = length
+            while remaining:
+                chunk = self.rfile.read(min(COPY_CHUNK, remaining))
+                if not chunk:
+                    break
+                tmp.write(chunk)
+                remaining -= len(chunk)
+        try:
+            if remaining:
+                self.send_error(400, "Envoi incomplet")
+                return
+            self.server.store.put(key, tmp.name)
+        finally:
+            os.remove(tmp.name)
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, fmt, *args):
+        print(f"[cache] {self.address_string()} {fmt % args}", flush=True)
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def serve(host, port, root, token=""):
+    if not token and not is_loopback(host):
+        raise ValueError(f"un jeton est obligatoire pour écouter sur {host}")
+    store = LocalCache(root)
+    os.makedirs(store.root, exist_ok=True)
+    server = ThreadingHTTPServer((host, port), CacheRequestHandler)
+    server.daemon_threads = True
+    server.store = store
+    server.token = token
+    print(f"[cache] LISTENING {server.server_address[1]} ({store.root})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur de cache d'artefacts PyCompiler Pro++")
+    parser.add_argument("--serve", action="store_true", help="Démarrer le serveur HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--dir", default=os.path.join("~", ".pycompiler_cache"))
+    parser.add_argument("--token", default=os.environ.get("PYCOMPILER_CACHE_TOKEN", ""))
+    args = parser.parse_args(argv)
+    if not args.serve:
+        parser.print_help()
+        return
+    if not args.token and not is_loopback(args.host):
+        parser.error(f"--token (ou PYCOMPILER_CACHE_TOKEN) est obligatoire pour écouter sur {args.host}")
+    serve(args.host, args.port, args.dir, args.token)
+
+
+if __name__ == "__main__":
+    main()
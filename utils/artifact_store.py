@@ -0,0 +1,324 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Inventaire et nettoyage des sorties de compilation pour PyCompiler Pro++.
+Après chaque compilation réussie (étape post-build record_artifacts), ses sorties (exécutable,
+dossier onedir/.dist) et ses intermédiaires (build/<nom>, .spec, .build/.onefile-build de Nuitka,
+.temp_obfuscated) sont inscrits dans <workspace>/.pycompiler/artifacts.json avec leur taille
+et leur dernière utilisation ; le workspace est ajouté au registre global ~/.pycompiler/workspaces.json.
+
+À la fin de chaque lot, un nettoyage en arrière-plan applique, dans l'ordre :
+- keep_last : au-delà des N compilations les plus récentes d'une variante de cible (même
+  cible et même configuration de matrice, ou même compilateur, mode et dossier de sortie),
+  les plus anciennes sont supprimées ;
+- quota du workspace puis quota global (tous les workspaces du registre) : suppression LRU,
+  intermédiaires d'abord ; la sortie la plus récente de chaque variante n'est jamais supprimée.
+Le nettoyage attend la fin des étapes post-build en cours (inscription des sorties).
+Les fichiers partagés par liens physiques (pool de dedup.py) ne sont comptés qu'une fois, au
+profit de la sortie la plus récemment utilisée : une entrée ancienne ne « pèse » que ses octets
+propres, qui sont ceux réellement libérés ; le pool est purgé après suppression.
+"""
+import json
+import os
+import shutil
+import stat
+import threading
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from .artifact_analysis import locate_artifacts
+from .build_history import history_dir
+from .dedup import pool_root, prune_pool
+
+STORE_FILE = "artifacts.json"
+REGISTRY_DIR = os.path.join(os.path.expanduser("~"), ".pycompiler")
+REGISTRY_FILE = os.path.join(REGISTRY_DIR, "workspaces.json")
+DEFAULT_SETTINGS = {"workspace_quota_mb": 10240, "global_quota_mb": 51200, "keep_last": 3}
+KIND_OUTPUT = "output"
+KIND_INTERMEDIATE = "intermediate"
+MB = 1024 * 1024
+
+_lock = threading.Lock()
+
+
+def store_settings(self):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(getattr(self, "artifact_store", None) or {})
+    return settings
+
+
+def _store_path(workspace_dir):
+    return os.path.join(history_dir(workspace_dir), STORE_FILE)
+
+
+def load_store(workspace_dir):
+    try:
+        with open(_store_path(workspace_dir), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else []
+    except Exception:
+        return []
+
+
+def _save_store(workspace_dir, entries):
+    os.makedirs(history_dir(workspace_dir), exist_ok=True)
+    tmp = _store_path(workspace_dir) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(tmp, _store_path(workspace_dir))
+
+
+def load_registry():
+    try:
+        with open(REGISTRY_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [w for w in data if isinstance(w, str)] if isinstance(data, list) else []
+    except Exception:
+        return []
+
+
+def _register_workspace(workspace_dir):
+    workspace_dir = os.path.abspath(workspace_dir)
+    workspaces = load_registry()
+    if workspace_dir in workspaces:
+        return
+    os.makedirs(REGISTRY_DIR, exist_ok=True)
+    tmp = REGISTRY_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(workspaces + [workspace_dir], f, indent=2)
+    os.replace(tmp, REGISTRY_FILE)
+
+
+def disk_size(path, seen=None):
+    """Taille de path ; chaque inode (liens physiques) n'est compté qu'une fois, y compris entre appels partageant seen."""
+    seen = set() if seen is None else seen
+    if os.path.isfile(path) or os.path.islink(path):
+        files = [path]
+    else:
+        files = (os.path.join(root, name) for root, _dirs, names in os.walk(path) for name in names)
+    total = 0
+    for file in files:
+        try:
+            st = os.lstat(file)
+        except OSError:
+            continue
+        if st.st_nlink > 1:
+            if (st.st_dev, st.st_ino) in seen:
+                continue
+            seen.add((st.st_dev, st.st_ino))
+        total += st.st_size
+    return total
+
+
+def _shared_sizes(items):
+    """Recalcule la taille des entrées [(workspace, entrée)] : un inode partagé compte pour la plus récente."""
+    seen = set()
+    for w, e in sorted(items, key=lambda item: item[1]["last_used"], reverse=True):
+        e["size"] = disk_size(os.path.join(w, e["path"]), seen)
+
+
+def build_paths(build, workspace_dir):
+    """(chemin, type) des sorties et intermédiaires d'une compilation décrite par describe_build."""
+    exe, folder = locate_artifacts(build)
+    paths = [(exe, KIND_OUTPUT)] + ([(folder, KIND_OUTPUT)] if folder else [])
+    name = build["name"]
+    if build["compiler"] == "pyinstaller":
+        workpath = build.get("workpath") or os.path.join(workspace_dir, "build")
+        paths.append((os.path.join(workpath, name), KIND_INTERMEDIATE))
+        for spec_dir in {workspace_dir, os.path.dirname(workpath)}:
+            paths.append((os.path.join(spec_dir, name + ".spec"), KIND_INTERMEDIATE))
+    else:
+        for suffix in (".build", ".onefile-build"):
+            paths.append((os.path.join(build["output_dir"], name + suffix), KIND_INTERMEDIATE))
+    paths.append((os.path.join(workspace_dir, ".temp_obfuscated"), KIND_INTERMEDIATE))
+    paths = [(os.path.abspath(p), kind) for p, kind in paths if os.path.exists(p)]
+    # L'exécutable d'un onedir/.dist est compté avec son dossier
+    folders = [p for p, _kind in paths if os.path.isdir(p)]
+    return [
+        (p, kind) for p, kind in paths
+        if not any(p != d and os.path.commonpath([p, d]) == d for d in folders)
+    ]
+
+
+def build_variant(build, workspace_dir):
+    """Variante d'une compilation pour la rétention : configuration de matrice, sinon compilateur/mode/sortie."""
+    if build.get("label"):
+        return build["label"]
+    out = os.path.relpath(os.path.abspath(build["output_dir"]), os.path.abspath(workspace_dir)).replace("\\", "/")
+    return f"{build['compiler']}/{build['mode']}:{out}"
+
+
+def _variant_key(entry):
+    return entry["target"], entry.get("variant", "")
+
+
+def record_artifacts(context, emit):
+    """Étape post-build : inscrit les sorties de la compilation dans l'inventaire du workspace."""
+    workspace_dir = context["workspace_dir"]
+    root = os.path.abspath(workspace_dir)
+    now = time.time()
+    variant = build_variant(context["build"], workspace_dir)
+    with _lock:
+        entries = {e["path"]: e for e in load_store(workspace_dir)}
+        for path, kind in build_paths(context["build"], workspace_dir):
+            full = os.path.abspath(path)
+            if os.path.commonpath([full, root]) != root:
+                continue  # dossier de sortie hors du workspace : non géré
+            rel = os.path.relpath(full, root)
+            entries[rel] = {
+                "path": rel, "target": context["target"] if rel != ".temp_obfuscated" else "*",
+                "kind": kind, "size": disk_size(full), "last_used": now, "built": now, "variant": variant,
+            }
+        _save_store(workspace_dir, list(entries.values()))
+        _register_workspace(workspace_dir)
+
+
+def _force_remove(func, path, _exc):
+    # Windows : les bibliothèques du pool de déduplication sont en lecture seule
+    try:
+        os.chmod(path, stat.S_IMODE(os.lstat(path).st_mode) | stat.S_IWUSR)
+        func(path)
+    except OSError:
+        pass
+
+
+def _evict(workspace_dir, entry):
+    full = os.path.join(workspace_dir, entry["path"])
+    if os.path.isdir(full) and not os.path.islink(full):
+        shutil.rmtree(full, onerror=_force_remove)
+    else:
+        try:
+            os.remove(full)
+        except FileNotFoundError:
+            pass
+    return not os.path.exists(full)
+
+
+def _newest_outputs(entries):
+    newest = {}
+    for e in entries:
+        if e["kind"] == KIND_OUTPUT and e["last_used"] >= newest.get(_variant_key(e), {}).get("last_used", -1):
+            newest[_variant_key(e)] = e
+    return {id(e) for e in newest.values()}
+
+
+def _lru_candidates(entries):
+    """Entrées supprimables, intermédiaires d'abord puis sorties, les moins récemment utilisées en tête."""
+    protected = _newest_outputs(entries)
+    candidates = [e for e in entries if id(e) not in protected]
+    return sorted(candidates, key=lambda e: (e["kind"] != KIND_INTERMEDIATE, e["last_used"]))
+
+
+def gc_workspace(workspace_dir, settings):
+    """Applique keep_last et le quota du workspace ; retourne (octets libérés, entrées supprimées)."""
+    freed, evicted = 0, []
+    with _lock:
+        entries = []
+        for e in load_store(workspace_dir):
+            full = os.path.join(workspace_dir, e["path"])
+            if os.path.exists(full):
+                # Reconstruite hors inventaire depuis : la date la plus récente fait foi
+                e["last_used"] = max(e["last_used"], os.path.getmtime(full))
+                entries.append(e)
+        _shared_sizes([(workspace_dir, e) for e in entries])
+        by_variant = {}
+        for e in entries:
+            if e["kind"] == KIND_OUTPUT:
+                by_variant.setdefault(_variant_key(e), []).append(e)
+        doomed = []
+        for outputs in by_variant.values():
+            # Une compilation peut avoir plusieurs sorties (exécutable onefile + .dist) : on compte les compilations
+            builds = sorted({e.get("built", e["last_used"]) for e in outputs}, reverse=True)
+            kept = set(builds[:settings["keep_last"]])
+            doomed += [e for e in outputs if e.get("built", e["last_used"]) not in kept]
+        quota = settings["workspace_quota_mb"] * MB
+        total = sum(e["size"] for e in entries if e not in doomed)
+        for e in _lru_candidates([e for e in entries if e not in doomed]):
+            if total <= quota:
+                break
+            doomed.append(e)
+            total -= e["size"]
+        for e in doomed:
+            if _evict(workspace_dir, e):
+                freed += e["size"]
+                evicted.append(e)
+                entries.remove(e)
+        _save_store(workspace_dir, entries)
+    return freed, evicted
+
+
+def gc_global(settings):
+    """Quota global sur l'ensemble des workspaces du registre (LRU)."""
+    workspaces = [w for w in load_registry() if os.path.isdir(w)]
+    pool = [(w, e) for w in workspaces for e in load_store(w) if os.path.exists(os.path.join(w, e["path"]))]
+    _shared_sizes(pool)
+    total = sum(e["size"] for _w, e in pool)
+    quota = settings["global_quota_mb"] * MB
+    if total <= quota:
+        return 0, []
+    protected = set()
+    for w in workspaces:
+        protected |= _newest_outputs([e for ww, e in pool if ww == w])
+    candidates = sorted(
+        ((w, e) for w, e in pool if id(e) not in protected),
+        key=lambda item: (item[1]["kind"] != KIND_INTERMEDIATE, item[1]["last_used"]),
+    )
+    freed, evicted, touched = 0, [], {}
+    for w, e in candidates:
+        if total <= quota:
+            break
+        if _evict(w, e):
+            total -= e["size"]
+            freed += e["size"]
+            evicted.append(e)
+            touched.setdefault(w, set()).add(e["path"])
+    with _lock:
+        for w, paths in touched.items():
+            _save_store(w, [e for e in load_store(w) if e["path"] not in paths])
+    return freed, evicted
+
+
+class StoreGCWorker(QThread):
+    message = Signal(str)
+
+    def __init__(self, workspace_dir, settings, dedup_pool=None, parent=None):
+        super().__init__(parent)
+        self.workspace_dir = workspace_dir
+        self.settings = settings
+        self.dedup_pool = dedup_pool
+
+    def run(self):
+        try:
+            freed, evicted = gc_workspace(self.workspace_dir, self.settings)
+            global_freed, global_evicted = gc_global(self.settings)
+            if self.dedup_pool and (evicted or global_evicted):
+                prune_pool(self.dedup_pool)  # libère les bibliothèques qui n'étaient plus liées qu'au pool
+        except Exception as e:
+            self.message.emit(f"⚠️ Nettoyage des artefacts impossible : {e}")
+            return
+        freed += global_freed
+        evicted += global_evicted
+        if evicted:
+            self.message.emit(
+                f"🧹 Nettoyage des artefacts : {len(evicted)} élément(s) supprimé(s), {freed / MB:.1f} Mo libérés "
+                f"({', '.join(e['path'] for e in evicted[:5])}{'...' if len(evicted) > 5 else ''})."
+            )
+
+
+def start_artifact_gc(self):
+    """Lance le nettoyage en arrière-plan (fin de lot), après les étapes post-build en cours."""
+    if not self.workspace_dir or getattr(self, "_store_gc_worker", None) is not None:
+        return
+    if getattr(self, "_post_build_workers", None):
+        # record_artifacts n'a pas encore inscrit toutes les sorties : relancé par post_build.py
+        self._artifact_gc_pending = True
+        return
+    self._artifact_gc_pending = False
+    dedup_pool = pool_root(self.workspace_dir, getattr(self, "dedup_pool", "")) if getattr(self, "dedup_enabled", True) else None
+    worker = StoreGCWorker(self.workspace_dir, store_settings(self), dedup_pool, self)
+    self._store_gc_worker = worker
+    worker.message.connect(self.log.append)
+    worker.finished.connect(lambda: setattr(self, "_store_gc_worker", None))
+    worker.start()
@@ -0,0 +1,170 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Mesure du démarrage des exécutables produits pour PyCompiler Pro++.
+Lance chaque exécutable N fois dans un dossier temporaire isolé (cwd et TMPDIR dédiés)
+avec un argument de test configurable, et relève la latence à froid et à chaud,
+la mémoire maximale (RSS de l'arbre de processus) et le temps d'extraction onefile.
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+from .build_history import load_history, update_record
+
+POLL_INTERVAL = 0.005
+
+
+def _tree_rss(proc):
+    import psutil
+    total = 0
+    try:
+        procs = [proc] + proc.children(recursive=True)
+    except psutil.Error:
+        return 0
+    for p in procs:
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def _kill_tree(proc):
+    import psutil
+    try:
+        procs = proc.children(recursive=True) + [proc]
+    except psutil.Error:
+        procs = [proc]
+    for p in procs:
+        try:
+            p.kill()
+        except psutil.Error:
+            pass
+
+
+def run_once(exe, args, timeout):
+    """
+    Exécute une fois le binaire dans un bac à sable temporaire.
+    Retourne {wall_ms, peak_rss, extraction_ms, exit_code, timed_out}.
+    L'extraction onefile est mesurée comme le délai avant l'apparition du processus
+    enfant (le bootloader extrait l'archive puis lance l'interpréteur).
+    """
+    import psutil
+    sandbox = tempfile.mkdtemp(prefix="pycompiler_bench_")
+    env = dict(os.environ)
+    for var in ("TMPDIR", "TEMP", "TMP"):
+        env[var] = sandbox
+    result = {"wall_ms": None, "peak_rss": 0, "extraction_ms": None, "exit_code": None, "timed_out": False}
+    try:
+        start = time.perf_counter()
+        proc = psutil.Popen([exe] + list(args), cwd=sandbox, env=env,
+                            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        while True:
+            code = proc.poll()
+            now = time.perf_counter()
+            if code is not None:
+                break
+            result["peak_rss"] = max(result["peak_rss"], _tree_rss(proc))
+            if result["extraction_ms"] is None:
+                try:
+                    if proc.children():
+                        result["extraction_ms"] = (now - start) * 1000
+                except psutil.Error:
+                    pass
+            if now - start > timeout:
+                result["timed_out"] = True
+                _kill_tree(proc)
+                code = proc.wait()
+                break
+            time.sleep(POLL_INTERVAL)
+        result["wall_ms"] = (time.perf_counter() - start) * 1000
+        result["exit_code"] = code
+    finally:
+        shutil.rmtree(sandbox, ignore_errors=True)
+    return result
+
+
+def benchmark_executable(exe, runs=5, smoke_args=None, timeout=30.0):
+    """
+    Lance l'exécutable `runs` fois. Le premier lancement abouti est compté comme démarrage à
+    froid, les suivants comme démarrages à chaud (médiane) ; les lancements interrompus par le
+    délai sont exclus des latences (None si tous l'ont été).
+    """
+    samples = [run_once(exe, smoke_args or [], timeout) for _ in range(max(1, runs))]
+    # Un lancement interrompu mesure le délai maximal, pas le démarrage (application GUI sans argument de test)
+    completed = [s for s in samples if not s["timed_out"]]
+    walls = [s["wall_ms"] for s in completed if s["wall_ms"] is not None]
+    extractions = [s["extraction_ms"] for s in completed if s["extraction_ms"] is not None]
+    warm = walls[1:] or walls
+    return {
+        "runs": len(samples),
+        "smoke_args": list(smoke_args or []),
+        "cold_ms": walls[0] if walls else None,
+        "warm_ms": statistics.median(warm) if warm else None,
+        "warm_min_ms": min(warm) if warm else None,
+        "peak_rss_mb": max(s["peak_rss"] for s in samples) / (1024 * 1024),
+        "extraction_ms": statistics.median(extractions) if extractions else None,
+        "exit_codes": sorted({s["exit_code"] for s in samples if s["exit_code"] is not None}),
+        "timeouts": sum(1 for s in samples if s["timed_out"]),
+    }
+
+
+def startup_comparison(workspace_dir, target):
+    """Dernière mesure de démarrage de la cible pour chaque couple (compilateur, mode)."""
+    latest = {}
+    for r in load_history(workspace_dir):
+        if r.get("target") == target and "startup" in r:
+            latest[(r.get("compiler"), r.get("mode"))] = r
+    return latest
+
+
+def format_comparison(latest):
+    lines = []
+    for (compiler, mode), r in sorted(latest.items(), key=lambda x: (x[1]["startup"].get("warm_ms") or 0)):
+        s = r["startup"]
+        size = r.get("size", {}).get("total")
+        if s.get("cold_ms") is None or s.get("warm_ms") is None:
+            # Benchmark en échec ou interrompu : aucune latence mesurée
+            lines.append(f"- {compiler} {mode} : aucune mesure exploitable")
+            continue
+        line = f"- {compiler} {mode} : froid {s['cold_ms']:.0f} ms, chaud {s['warm_ms']:.0f} ms, RSS {s['peak_rss_mb']:.1f} Mo"
+        if s.get("extraction_ms") is not None:
+            line += f", extraction {s['extraction_ms']:.0f} ms"
+        if size:
+            line += f", taille {size / 1048576:.1f} Mo"
+        lines.append(line)
+    return lines
+
+
+def benchmark_startup(context, emit):
+    """Étape post-build optionnelle : mesure le démarrage de l'exécutable produit."""
+    settings = context.get("settings", {})
+    if not settings.get("benchmark_enabled"):
+        return
+    from .artifact_analysis import locate_artifacts
+    exe, _ = locate_artifacts(context["build"])
+    if not os.path.isfile(exe):
+        emit(f"⚠️ Benchmark : exécutable introuvable ({exe}).")
+        return
+    runs = int(settings.get("benchmark_runs", 5))
+    smoke = settings.get("benchmark_smoke_arg", "")
+    emit(f"⏱️ Benchmark de démarrage : {os.path.basename(exe)} ({runs} lancements)...")
+    result = benchmark_executable(exe, runs, smoke.split() if smoke else [], float(settings.get("benchmark_timeout", 30)))
+    update_record(context["workspace_dir"], context["record_id"], startup=result)
+    if result["cold_ms"] is None:
+        if result["timeouts"]:
+            emit(
+                f"⚠️ Benchmark : les {result['timeouts']} lancement(s) ont dépassé {settings.get('benchmark_timeout', 30)} s, "
+                "aucune latence mesurée (application GUI ? renseignez un argument de test qui la fait quitter)."
+            )
+        else:
+            emit("⚠️ Benchmark : aucune mesure exploitable.")
+        return
+    if result["timeouts"]:
+        emit(f"⚠️ Benchmark : {result['timeouts']} lancement(s) interrompu(s) après {settings.get('benchmark_timeout', 30)} s.")
+    emit(f"<b>Comparaison du démarrage pour {context['target']} :</b><br>" + "<br>".join(format_comparison(startup_comparison(context["workspace_dir"], context["target"]))))
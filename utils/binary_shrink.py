@@ -0,0 +1,333 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Réduction des binaires des sorties de compilation pour PyCompiler Pro++ (étape post-build).
+Les bibliothèques partagées d'un dossier onedir/.dist (.so, .pyd, .dll, .dylib) sont traitées
+en parallèle : suppression des symboles de débogage (strip) puis, en option, compression UPX.
+Un seul pool de threads (un par cœur, moins celui de l'interface) est partagé par toutes les
+compilations post-traitées en même temps, et strip/upx tournent avec la priorité réduite de la
+politique de ressources (nice/ionice, BELOW_NORMAL sous Windows) : les compilations en cours
+gardent leurs cœurs. Chaque résultat est mis en cache dans ~/.pycompiler/shrink_cache, indexé par
+l'empreinte SHA-256 du binaire d'entrée et la recette (outils et arguments) : une bibliothèque
+inchangée n'est jamais recompressée. Quand UPX est activé, PyInstaller reçoit --noupx pour les
+builds onedir (sa passe UPX, une bibliothèque à la fois, est remplacée par cette étape) ; un
+onefile garde la passe de PyInstaller, son archive ne pouvant être retouchée après coup.
+Avec le benchmark (build hors matrice), le démarrage est mesuré avant réduction pour comparer
+gain de taille et coût au démarrage (étape report_shrink_tradeoff).
+L'étape réécrit les sorties : elle est désactivée par défaut, et les PE signés (Authenticode,
+ex. DLL Qt/PySide6) ne sont jamais modifiés, leur signature ne serait plus valide.
+"""
+import fnmatch
+import hashlib
+import os
+import platform
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .artifact_analysis import locate_artifacts
+from .benchmark import benchmark_executable
+from .build_history import load_history, update_record
+from .dedup import file_digest
+
+DEFAULT_SETTINGS = {
+    "enabled": False,  # réécrit les sorties : activé explicitement par l'utilisateur
+    "strip": True,
+    "strip_args": ["--strip-debug"],
+    "upx": False,
+    "upx_args": ["-q"],
+    "upx_exclude": [],
+    "workers": 0,  # 0 = un par cœur, moins celui de l'interface
+    "cache_mb": 2048,
+}
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".pycompiler", "shrink_cache")
+SHARED_SUFFIXES = (".so", ".pyd", ".dll", ".dylib")
+# Bibliothèques que UPX corrompt ou que Windows refuse compressées (liste de PyInstaller)
+UPX_EXCLUDE = ["vcruntime*.dll", "msvcp*.dll", "ucrtbase.dll", "api-ms-win-*.dll", "concrt*.dll"]
+MAGICS = (b"\x7fELF", b"MZ", b"\xcf\xfa\xed\xfe", b"\xca\xfe\xba\xbe")
+SAME = ".same"  # marqueur de cache : l'outil n'a rien changé au binaire
+MB = 1024 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def shrink_settings(self):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(getattr(self, "binary_shrink", None) or {})
+    return settings
+
+
+def takes_over_upx(self, options=None):
+    """Vrai si cette étape remplace la passe UPX de PyInstaller (build onedir, UPX activé)."""
+    options = options or {}
+    settings = shrink_settings(self)
+    onefile = options.get("onefile", self.opt_onefile.isChecked())
+    return settings["enabled"] and settings["upx"] and not onefile and bool(shutil.which("upx"))
+
+
+def _is_shared_object(path, name):
+    lower = name.lower()
+    if not (lower.endswith(SHARED_SUFFIXES) or ".so." in lower):
+        return False
+    try:
+        with open(path, "rb") as f:
+            return f.read(4).startswith(MAGICS)
+    except OSError:
+        return False
+
+
+def _is_signed_pe(path):
+    """Vrai pour un PE (DLL, .pyd, .exe) portant une signature Authenticode (répertoire de sécurité non vide)."""
+    try:
+        with open(path, "rb") as f:
+            if f.read(2) != b"MZ":
+                return False
+            f.seek(0x3C)
+            pe = int.from_bytes(f.read(4), "little")
+            f.seek(pe)
+            if f.read(4) != b"PE\0\0":
+                return False
+            f.seek(pe + 24)
+            magic = int.from_bytes(f.read(2), "little")
+            # Répertoire de données n° 4 (sécurité) : après 96 (PE32) ou 112 (PE32+) octets d'en-tête optionnel
+            f.seek(pe + 24 + (112 if magic == 0x20B else 96) + 4 * 8 + 4)
+            return int.from_bytes(f.read(4), "little") > 0
+    except OSError:
+        return False
+
+
+def find_binaries(folder, extra=()):
+    """Binaires à réduire ; les PE signés (Qt/PySide6 sous Windows...) sont laissés intacts."""
+    binaries = [p for p in extra if os.path.isfile(p) and not _is_signed_pe(p)]
+    for root, _dirs, files in os.walk(folder):
+        for name in files:
+            path = os.path.join(root, name)
+            if (
+                path not in binaries and not os.path.islink(path)
+                and _is_shared_object(path, name) and not _is_signed_pe(path)
+            ):
+                binaries.append(path)
+    return binaries
+
+
+def _upx_allowed(path, settings):
+    name = os.path.basename(path).lower()
+    patterns = UPX_EXCLUDE + list(settings.get("upx_exclude") or [])
+    if any(fnmatch.fnmatch(name, p.lower()) for p in patterns):
+        return False
+    # Les plugins Qt compressés échouent à la vérification de leurs métadonnées sous Windows
+    return not (platform.system() == "Windows" and f"{os.sep}plugins{os.sep}" in path)
+
+
+def _recipe(tools, settings, upx):
+    parts = []
+    if tools.get("strip"):
+        parts.append("strip " + " ".join(settings["strip_args"]))
+    if upx:
+        parts.append("upx " + " ".join(settings["upx_args"]))
+    return " | ".join(parts)
+
+
+def _cache_path(digest, recipe):
+    key = hashlib.sha256(f"{digest}\0{recipe}".encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, key[:2], key)
+
+
+def _install(src, path, mode):
+    tmp = path + ".shrink"
+    shutil.copyfile(src, tmp)
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+
+
+def _store(src, cached):
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    tmp = f"{cached}.{os.getpid()}-{threading.get_ident()}.tmp"
+    if src is None:
+        open(tmp, "wb").close()
+        cached += SAME
+    else:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, cached)
+
+
+def shrink_file(path, tools, settings):
+    """Réduit un binaire (cache d'abord) ; retourne {before, after, stripped, compressed, cached}."""
+    st = os.stat(path)
+    upx = tools.get("upx") if _upx_allowed(path, settings) else None
+    recipe = _recipe(tools, settings, upx)
+    result = {"before": st.st_size, "after": st.st_size, "stripped": False, "compressed": False, "cached": False}
+    if not recipe:
+        return result
+    cached = _cache_path(file_digest(path), recipe)
+    for hit in (cached, cached + SAME):
+        if os.path.exists(hit):
+            os.utime(hit)
+            if hit == cached:
+                _install(cached, path, st.st_mode & 0o7777)
+            result.update(cached=True, after=os.path.getsize(path))
+            return result
+    tmp = path + ".shrink"
+    shutil.copyfile(path, tmp)
+    try:
+        if tools.get("strip"):
+            proc = _run_tool([tools["strip"]] + settings["strip_args"] + [tmp], tools.get("policy"))
+            result["stripped"] = proc.returncode == 0
+        if upx:
+            before_upx = os.path.getsize(tmp)
+            # UPX refuse certains binaires (NotCompressible, .so sans point d'entrée) : on garde le strip
+            proc = _run_tool([upx] + settings["upx_args"] + [tmp], tools.get("policy"))
+            result["compressed"] = proc.returncode == 0 and os.path.getsize(tmp) < before_upx
+        size = os.path.getsize(tmp)
+        if size >= st.st_size:
+            _store(None, cached)
+            return result
+        _store(tmp, cached)
+        os.chmod(tmp, st.st_mode & 0o7777)
+        os.replace(tmp, path)
+        result["after"] = size
+        return result
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def prune_cache(limit_mb):
+    """Limite la taille du cache en supprimant les entrées les moins récemment utilisées."""
+    entries = []
+    for root, _dirs, files in os.walk(CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _m, size, _p in entries)
+    for _mtime, size, path in sorted(entries):
+        if total <= limit_mb * MB:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            continue
+
+
+def _workers(settings):
+    if settings.get("workers"):
+        return int(settings["workers"])
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _shared_executor(settings):
+    """Pool de threads commun à toutes les étapes post-build (créé au premier usage)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_workers(settings), thread_name_prefix="shrink")
+        return _executor
+
+
+def _priority_prefix(policy):
+    """Préfixe de commande (nice/ionice) appliquant la priorité réduite de la politique de ressources."""
+    if platform.system() == "Windows":
+        return []
+    prefix = []
+    nice = (policy or {}).get("nice")
+    if nice and shutil.which("nice"):
+        prefix += ["nice", "-n", str(int(nice))]
+    io = (policy or {}).get("ionice")
+    if io and shutil.which("ionice"):
+        prefix += ["ionice", "-c", "3"] if io == "idle" else ["ionice", "-c", "2", "-n", "7"]
+    return prefix
+
+
+def _run_tool(cmd, policy):
+    flags = 0
+    nice = (policy or {}).get("nice")
+    if platform.system() == "Windows" and nice:
+        flags = subprocess.BELOW_NORMAL_PRIORITY_CLASS if nice < 15 else subprocess.IDLE_PRIORITY_CLASS
+    return subprocess.run(_priority_prefix(policy) + cmd, capture_output=True, creationflags=flags)
+
+
+def shrink_binaries(context, emit):
+    """Étape post-build : strip et UPX en parallèle des bibliothèques d'un dossier onedir/.dist."""
+    settings = context.get("settings", {})
+    shrink = dict(DEFAULT_SETTINGS, **settings.get("shrink", {}))
+    build = context["build"]
+    if not shrink["enabled"] or build["mode"] not in ("onedir", "standalone"):
+        return
+    if platform.system() == "Darwin":
+        return  # strip et UPX invalideraient la signature de code des bibliothèques
+    exe, folder = locate_artifacts(build)
+    if not folder or not os.path.isdir(folder):
+        return
+    tools = {"strip": shutil.which("strip") if shrink["strip"] else None}
+    # Le noupx du job (matrice, case de PyInstaller) désactive aussi la compression de cette étape
+    if shrink["upx"] and not build.get("noupx"):
+        tools["upx"] = shutil.which("upx")
+        if not tools["upx"]:
+            emit("ℹ️ Réduction des binaires : upx introuvable dans le PATH, compression ignorée.")
+    if not any(tools.values()):
+        return
+    tools["policy"] = settings.get("resource_policy")
+    # L'exécutable PyInstaller porte son archive en fin de fichier : seul celui de Nuitka est traité
+    binaries = find_binaries(folder, [exe] if build["compiler"] == "nuitka" else [])
+    if not binaries:
+        return
+    # Mesure avant réduction seulement si le benchmark est demandé pour ce build (jamais en matrice)
+    if settings.get("benchmark_enabled") and not build.get("matrix_run") and os.path.isfile(exe):
+        smoke = settings.get("benchmark_smoke_arg", "")
+        context["startup_unshrunk"] = benchmark_executable(
+            exe, int(settings.get("benchmark_runs", 5)), smoke.split() if smoke else [],
+            float(settings.get("benchmark_timeout", 30)),
+        )
+    start = time.perf_counter()
+    results = list(_shared_executor(shrink).map(lambda p: shrink_file(p, tools, shrink), binaries))
+    stats = {
+        "files": len(results),
+        "cached": sum(r["cached"] for r in results),
+        "stripped": sum(r["stripped"] for r in results),
+        "compressed": sum(r["compressed"] for r in results),
+        "before": sum(r["before"] for r in results),
+        "after": sum(r["after"] for r in results),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+    context["shrink"] = stats
+    prune_cache(shrink["cache_mb"])
+    update_record(context["workspace_dir"], context["record_id"], shrink=stats)
+    saved = stats["before"] - stats["after"]
+    emit(
+        f"🗜️ {context['target']} : {stats['files']} bibliothèque(s) traitées en {stats['seconds']:.1f} s "
+        f"({stats['stripped']} strip, {stats['compressed']} UPX, {stats['cached']} depuis le cache), "
+        f"{saved / MB:.1f} Mo gagnés ({100 * saved / max(stats['before'], 1):.0f} %)."
+    )
+
+
+def report_shrink_tradeoff(context, emit):
+    """Étape post-build (après le benchmark) : gain de taille face au coût au démarrage."""
+    stats = context.get("shrink")
+    before = context.get("startup_unshrunk")
+    if not stats or not before or before.get("warm_ms") is None:
+        return
+    record = next((r for r in load_history(context["workspace_dir"]) if r.get("id") == context["record_id"]), {})
+    after = record.get("startup") or {}
+    if after.get("warm_ms") is None:
+        return
+    saved = stats["before"] - stats["after"]
+    tradeoff = {
+        "saved": saved,
+        "cold_delta_ms": round(after["cold_ms"] - before["cold_ms"], 1),
+        "warm_delta_ms": round(after["warm_ms"] - before["warm_ms"], 1),
+    }
+    update_record(context["workspace_dir"], context["record_id"], shrink=dict(stats, tradeoff=tradeoff))
+    emit(
+        f"⚖️ {context['target']} : -{saved / MB:.1f} Mo pour un démarrage à froid {tradeoff['cold_delta_ms']:+.0f} ms "
+        f"({before['cold_ms']:.0f} → {after['cold_ms']:.0f} ms), à chaud {tradeoff['warm_delta_ms']:+.0f} ms "
+        f"({before['warm_ms']:.0f} → {after['warm_ms']:.0f} ms)."
+    )
@@ -0,0 +1,287 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Agent de compilation pour PyCompiler Pro++ (bibliothèque standard uniquement).
+Un agent tourne sur une machine du réseau (ou en local, en boucle locale) et exécute les
+compilations envoyées par l'interface : une connexion TCP par job, messages JSON d'une ligne.
+
+    client -> {"type": "hello", "token": ...}
+    agent  -> {"type": "welcome", "slots": N, "platform": ..., "python": ...}
+    client -> {"type": "job", "compiler": ..., "args": [...], "workspace": ..., "archive": b64, "artifacts": [...]}
+    agent  -> {"type": "started"} puis {"type": "output", "channel": ..., "data": b64} ...
+    agent  -> {"type": "exit", "exit_code": N} puis {"type": "artifact", "data": b64} ... {"type": "done", "exit_code": N}
+    client -> {"type": "cancel"} (ou fermeture de la connexion) pour tuer la compilation
+
+Lancement : python utils/build_agent.py --host 0.0.0.0 --port 8765 --python /chemin/venv/bin/python --slots 2 --token <secret>
+(hors boucle locale, un jeton est obligatoire : l'agent exécute les compilations qu'on lui envoie)
+"""
+import argparse
+import base64
+import io
+import ipaddress
+import json
+import os
+import platform
+import re
+import secrets
+import signal
+import socketserver
+import stat
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 8765
+CHUNK_SIZE = 1024 * 1024
+# Jamais envoyés à l'agent : environnements, sorties et métadonnées locales
+ARCHIVE_EXCLUDES = {"venv", ".venv", ".git", "__pycache__", ".pycompiler", "build", "dist"}
+COMPILER_MODULES = {"pyinstaller": "PyInstaller", "nuitka": "nuitka"}
+
+
+def encode_message(message):
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+def iter_workspace_files(workspace_dir, excludes=ARCHIVE_EXCLUDES):
+    """Fichiers sources du workspace (sans venv ni sorties de compilation), dans un ordre stable."""
+    for root, dirs, files in os.walk(workspace_dir):
+        dirs[:] = sorted(d for d in dirs if d not in excludes and not d.endswith((".dist", ".build", ".onefile-build")))
+        for f in sorted(files):
+            yield os.path.join(root, f)
+
+
+def pack_workspace(workspace_dir, excludes=ARCHIVE_EXCLUDES):
+    """Archive tar.gz des sources du workspace."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for full in iter_workspace_files(workspace_dir, excludes):
+            tar.add(full, arcname=os.path.relpath(full, workspace_dir), recursive=False)
+    return buf.getvalue()
+
+
+def pack_paths(base_dir, rel_paths, fileobj=None):
+    """
+    Archive tar.gz des chemins (fichiers ou dossiers) relatifs à base_dir qui existent.
+    Écrit dans fileobj s'il est fourni, sinon retourne les octets.
+    """
+    buf = fileobj if fileobj is not None else io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for rel in rel_paths:
+            full = os.path.join(base_dir, rel)
+            if os.path.exists(full):
+                tar.add(full, arcname=rel)
+    return None if fileobj is not None else buf.getvalue()
+
+
+def _unlink_existing(tar, dest):
+    """
+    Supprime les fichiers de dest que l'archive va remplacer : tarfile les rouvrirait en écriture
+    sur place et écrirait à travers un lien physique (pool de déduplication de dedup.py).
+    """
+    root = os.path.realpath(dest)
+    for member in tar.getmembers():
+        if member.isdir():
+            continue
+        parent = os.path.realpath(os.path.join(dest, os.path.dirname(member.name)))
+        target = os.path.join(parent, os.path.basename(member.name))
+        try:
+            if os.path.commonpath([root, target]) != root or (os.path.isdir(target) and not os.path.islink(target)):
+                continue  # hors de dest : refusé ensuite par le filtre
+        except ValueError:
+            continue
+        try:
+            os.remove(target)
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            if os.name != "nt":
+                raise
+            os.chmod(target, stat.S_IWRITE)  # Windows : fichier en lecture seule
+            os.remove(target)
+
+
+def safe_extract(fileobj, dest):
+    """
+    Extrait une archive en refusant les chemins absolus ou sortant de dest. Les fichiers
+    existants sont supprimés puis recréés, jamais réécrits sur place.
+    """
+    with tarfile.open(fileobj=fileobj, mode="r:*") as tar:
+        _unlink_existing(tar, dest)
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(dest, filter="data")
+            return
+        root = os.path.realpath(dest)
+        for member in tar.getmembers():
+            target = os.path.realpath(os.path.join(dest, member.name))
+            if os.path.commonpath([root, target]) != root or member.issym() or member.islnk():
+                raise ValueError(f"Chemin refusé dans l'archive : {member.name}")
+        tar.extractall(dest)
+
+
+def rewrite_args(args, workspace, job_dir):
+    """Remplace le chemin du workspace côté interface par le dossier du job côté agent."""
+    workspace = workspace.rstrip("/\\")
+    if not workspace:
+        return list(args)
+    # Chemin entier seulement : en début d'argument ou après « = », « : », « ; » ou « , », suivi d'un
+    # séparateur ou de la fin (/ws ne doit pas toucher /ws-old ni /data/ws)
+    pattern = re.compile(r"(?<![^=:;,])" + re.escape(workspace) + r"(?=[/\\:;,]|$)")
+    return [pattern.sub(lambda m: job_dir, a) for a in args]
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _kill_tree(proc):
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)], capture_output=True)
+    except Exception:
+        try:
+            proc.kill()
+        except Exception:
+            pass
+
+
+class AgentHandler(socketserver.StreamRequestHandler):
+    def send(self, message):
+        with self._send_lock:
+            self.wfile.write(encode_message(message))
+            self.wfile.flush()
+
+    def read_message(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        return json.loads(line.decode("utf-8"))
+
+    def handle(self):
+        self._send_lock = threading.Lock()
+        self._proc = None
+        self._cancelled = False
+        try:
+            hello = self.read_message()
+            if not hello or hello.get("type") != "hello":
+                return
+            if self.server.token and not secrets.compare_digest(str(hello.get("token", "")), self.server.token):
+                self.send({"type": "error", "message": "Jeton invalide"})
+                return
+            self.send({
+                "type": "welcome", "version": PROTOCOL_VERSION, "slots": self.server.slots_count,
+                "platform": platform.system(), "python": platform.python_version(),
+            })
+            job = self.read_message()
+            if not job or job.get("type") != "job":
+                return
+            self.run_job(job)
+        except (ConnectionError, OSError, ValueError) as e:
+            self.server.log(f"connexion {self.client_address[0]} : {e}")
+
+    def _watch_client(self):
+        # Une annulation ou une connexion fermée tue la compilation
+        try:
+            while True:
+                message = self.read_message()
+                if message is None or message.get("type") == "cancel":
+                    break
+        except Exception:
+            pass
+        self._cancelled = True
+        if self._proc is not None and self._proc.poll() is None:
+            _kill_tree(self._proc)
+
+    def _pump(self, stream, channel):
+        while True:
+            data = stream.read1(65536) if hasattr(stream, "read1") else stream.read(65536)
+            if not data:
+                break
+            self.send({"type": "output", "channel": channel, "data": base64.b64encode(data).decode("ascii")})
+
+    def run_job(self, job):
+        module = COMPILER_MODULES.get(job.get("compiler"))
+        if module is None:
+            self.send({"type": "error", "message": f"Compilateur inconnu : {job.get('compiler')}"})
+            return
+        with tempfile.TemporaryDirectory(prefix="pycompiler-agent-") as job_dir:
+            safe_extract(io.BytesIO(base64.b64decode(job["archive"])), job_dir)
+            args = rewrite_args(job.get("args", []), job.get("workspace", ""), job_dir)
+            if module == "nuitka" and not any(a.startswith("--jobs=") for a in args):
+                # Cœurs de l'agent répartis entre ses places de compilation
+                args.insert(0, f"--jobs={max(1, (os.cpu_count() or 1) // self.server.slots_count)}")
+            cmd = [self.server.python, "-m", module] + args
+            threading.Thread(target=self._watch_client, daemon=True).start()
+            with self.server.slots:
+                if self._cancelled:
+                    return
+                self.server.log(f"job {job.get('job_id')} ({job.get('compiler')}) depuis {self.client_address[0]}")
+                self._proc = subprocess.Popen(
+                    cmd, cwd=job_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                    start_new_session=(os.name == "posix"),
+                )
+                self.send({"type": "started"})
+                pumps = [
+                    threading.Thread(target=self._pump, args=(self._proc.stdout, "stdout"), daemon=True),
+                    threading.Thread(target=self._pump, args=(self._proc.stderr, "stderr"), daemon=True),
+                ]
+                for t in pumps:
+                    t.start()
+                exit_code = self._proc.wait()
+                for t in pumps:
+                    t.join()
+            self.send({"type": "exit", "exit_code": exit_code})
+            if exit_code == 0 and not self._cancelled:
+                data = pack_paths(job_dir, job.get("artifacts", []))
+                for i in range(0, len(data), CHUNK_SIZE):
+                    self.send({"type": "artifact", "data": base64.b64encode(data[i:i + CHUNK_SIZE]).decode("ascii")})
+            self.send({"type": "done", "exit_code": exit_code})
+
+
+class BuildAgentServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, python, slots=1, token=""):
+        super().__init__(address, AgentHandler)
+        self.python = python
+        self.slots_count = max(1, slots)
+        self.slots = threading.BoundedSemaphore(self.slots_count)
+        self.token = token
+
+    def log(self, message):
+        print(f"[agent] {message}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agent de compilation PyCompiler Pro++")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute (0.0.0.0 pour le réseau local)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--python", default=sys.executable, help="Interpréteur disposant de PyInstaller/Nuitka")
+    parser.add_argument("--slots", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Compilations simultanées")
+    parser.add_argument("--token", default=os.environ.get("PYCOMPILER_AGENT_TOKEN", ""))
+    args = parser.parse_args(argv)
+    if not args.token and not is_loopback(args.host):
+        parser.error(f"--token (ou PYCOMPILER_AGENT_TOKEN) est obligatoire pour écouter sur {args.host}")
+    server = BuildAgentServer((args.host, args.port), args.python, args.slots, args.token)
+    server.log(f"LISTENING {server.server_address[1]} (slots={server.slots_count}, python={args.python})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
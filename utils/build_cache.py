@@ -0,0 +1,272 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Réutilisation des compilations via le cache d'artefacts (artifact_cache.py).
+Au début d'un lot, chaque job reçoit une clé : empreinte des sources du workspace, commande
+du compilateur (chemin du workspace neutralisé, pour que toute l'équipe partage les mêmes
+clés) et verrou du venv (distributions installées et leurs versions). Les jobs trouvés dans
+le cache sont extraits sans lancer de QProcess ; les autres sont compilés puis envoyés
+au cache après une compilation réussie.
+"""
+import hashlib
+import os
+import platform
+import tempfile
+from types import SimpleNamespace
+
+from PySide6.QtCore import QThread, Signal
+from PySide6.QtWidgets import QInputDialog
+
+from .artifact_analysis import artifact_paths, describe_build
+from .artifact_cache import open_cache
+from .build_agent import iter_workspace_files, pack_paths, safe_extract
+from .build_history import append_record
+from .exclusion_analysis import find_site_packages, iter_distributions
+from .job_queue import JOB_DONE
+from .post_build import run_post_build_stages
+from .bytecode_precompile import start_precompile
+from .preflight import start_preflight
+from .remote_build import compiler_args
+from .sys_dependency import ensure_batch_toolchain
+from . import tracing
+from .tracing import begin_batch_trace
+
+WORKSPACE_PLACEHOLDER = "<workspace>"
+# Fichiers produits par les compilateurs, jamais des sources
+OUTPUT_SUFFIXES = (".spec", ".bin", ".exe", ".pyc", ".pyo")
+
+
+def hash_sources(workspace_dir, output_dirs=()):
+    """
+    Empreinte du contenu (chemins relatifs et octets) des sources du workspace. Les sorties de
+    compilation n'en font pas partie (dossiers de sortie configurés, .spec, exécutables Nuitka
+    .bin/.exe écrits à la racine, bytecode) : une compilation ne change pas la clé de la suivante.
+    """
+    root = os.path.abspath(workspace_dir)
+    skipped = {os.path.abspath(d) for d in output_dirs if d and os.path.abspath(d) != root}
+    digest = hashlib.sha256()
+    for full in iter_workspace_files(workspace_dir):
+        if full.endswith(OUTPUT_SUFFIXES):
+            continue
+        if any(os.path.commonpath([os.path.abspath(full), d]) == d for d in skipped):
+            continue
+        rel = os.path.relpath(full, workspace_dir).replace("\\", "/")
+        digest.update(rel.encode("utf-8") + b"\0")
+        try:
+            with open(full, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            continue
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def venv_lock_digest(venv_dir):
+    """Empreinte des distributions installées dans le venv (équivalent d'un pip freeze)."""
+    site_packages = find_site_packages(venv_dir)
+    lines = [f"python=={platform.python_version()}"]
+    cfg = os.path.join(venv_dir, "pyvenv.cfg") if venv_dir else None
+    if cfg and os.path.isfile(cfg):
+        with open(cfg, "r", encoding="utf-8", errors="replace") as f:
+            lines = [line.strip() for line in f if line.strip().startswith("version")]
+    if site_packages:
+        lines += sorted(f"{d['name'].lower()}=={d['version']}" for d in iter_distributions(site_packages))
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def cache_key(sources_digest, compiler, args, workspace_dir, lock_digest):
+    """Clé de cache d'un job ; indépendante de l'emplacement du workspace sur le disque."""
+    root = os.path.abspath(workspace_dir)
+    normalized = [a.replace(root, WORKSPACE_PLACEHOLDER) for a in args]
+    payload = "\n".join([
+        sources_digest, lock_digest, compiler, platform.system(), platform.machine(), "\0".join(normalized),
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheLookupWorker(QThread):
+    """Calcule les clés des jobs et extrait ceux présents dans le cache."""
+
+    message = Signal(str)
+
+    def __init__(self, cache, workspace_dir, venv_dir, specs, output_dirs=(), parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.workspace_dir = workspace_dir
+        self.venv_dir = venv_dir
+        self.specs = specs
+        self.output_dirs = output_dirs
+        self.keys = {}
+        self.hits = set()
+
+    def run(self):
+        with tracing.span("cache.lookup", track="cache", jobs=len(self.specs)) as lookup:
+            self._lookup()
+            lookup.args["hits"] = len(self.hits)
+
+    def _lookup(self):
+        try:
+            with tracing.span("cache.fingerprint", track="cache"):
+                sources = hash_sources(self.workspace_dir, self.output_dirs)
+                lock = venv_lock_digest(self.venv_dir)
+        except Exception as e:
+            self.message.emit(f"⚠️ Cache d'artefacts : empreinte impossible ({e}).")
+            return
+        for spec in self.specs:
+            key = cache_key(sources, spec["compiler"], spec["args"], self.workspace_dir, lock)
+            self.keys[spec["job_id"]] = key
+            try:
+                with tempfile.TemporaryFile() as tmp:
+                    if not self.cache.get(key, tmp):
+                        continue
+                    tmp.seek(0)
+                    safe_extract(tmp, self.workspace_dir)
+                self.hits.add(spec["job_id"])
+            except Exception as e:
+                self.message.emit(f"⚠️ Cache d'artefacts ({self.cache.location}) : {e}")
+
+
+class CacheUploadWorker(QThread):
+    message = Signal(str)
+
+    def __init__(self, cache, key, workspace_dir, paths, label, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.key = key
+        self.workspace_dir = workspace_dir
+        self.paths = paths
+        self.label = label
+
+    def run(self):
+        with tracing.span("cache.upload", track="cache", target=self.label):
+            self._upload()
+
+    def _upload(self):
+        try:
+            with tempfile.NamedTemporaryFile(suffix=".tar.gz", delete=False) as tmp:
+                pack_paths(self.workspace_dir, self.paths, tmp)
+            try:
+                self.cache.put(self.key, tmp.name)
+            finally:
+                os.remove(tmp.name)
+            self.message.emit(f"♻️ {self.label} envoyé au cache d'artefacts.")
+        except Exception as e:
+            self.message.emit(f"⚠️ Envoi de {self.label} au cache impossible : {e}")
+
+
+def get_artifact_cache(self):
+    return open_cache(getattr(self, "artifact_cache", ""), getattr(self, "artifact_cache_token", ""))
+
+
+def _keep_worker(self, worker):
+    if not hasattr(self, "_cache_workers"):
+        self._cache_workers = []
+    self._cache_workers.append(worker)
+    worker.message.connect(self.log.append)
+    worker.finished.connect(lambda w=worker: self._cache_workers.remove(w) if w in self._cache_workers else None)
+
+
+def start_batch(self):
+    """
+    Lance un lot : chaîne C vérifiée une fois, bytecode précompilé et syntaxe vérifiée
+    (bytecode_precompile.py), imports vérifiés (preflight.py), cache consulté (si configuré),
+    puis compilations.
+    """
+    begin_batch_trace(self)
+    ensure_batch_toolchain(
+        self, lambda: start_precompile(self, lambda: start_preflight(self, lambda: _start_cache_lookup(self)))
+    )
+
+
+def _start_cache_lookup(self):
+    cache = get_artifact_cache(self)
+    if cache is None or not self.queue:
+        self.try_start_processes()
+        return
+    specs = []
+    output_dirs = set()
+    for job in self.queue:
+        use_nuitka = self.job_uses_nuitka(job.options)
+        build = describe_build(self, job.file, use_nuitka, job.options)
+        job.cache_build = build
+        output_dirs.update(d for d in (build["output_dir"], build.get("workpath")) if d)
+        specs.append({
+            "job_id": job.id,
+            "compiler": build["compiler"],
+            "args": compiler_args(self, job.file, job.options),
+        })
+    venv_dir = os.path.join(self.venv_path_manuel or self.workspace_dir, "venv")
+    self.log.append(f"♻️ Consultation du cache d'artefacts ({cache.location}) pour {len(specs)} job(s)...")
+    worker = CacheLookupWorker(cache, self.workspace_dir, venv_dir, specs, output_dirs, self)
+    _keep_worker(self, worker)
+    worker.finished.connect(lambda w=worker: _on_lookup_done(self, w))
+    worker.start()
+
+
+def _on_lookup_done(self, worker):
+    for job in list(self.queue):
+        job.cache_key = worker.keys.get(job.id)
+        if job.id not in worker.hits or not self.queue.take(job):
+            continue
+        build = job.cache_build
+        self.queue.mark_finished(job, JOB_DONE)
+        self._batch_done = getattr(self, "_batch_done", 0) + 1
+        self.log.append(f"♻️ {job.label} récupéré depuis le cache d'artefacts (compilation évitée).")
+        record_id = None
+        try:
+            record_id = append_record(self.workspace_dir, {
+                "target": os.path.relpath(job.file, self.workspace_dir),
+                "compiler": build["compiler"],
+                "mode": build["mode"],
+                "duration": None,
+                "exit_code": 0,
+                "label": build.get("label"),
+                "matrix_run": build.get("matrix_run"),
+                "cache_hit": True,
+            })
+        except Exception as e:
+            self.log.append(f"⚠️ Impossible d'enregistrer l'historique de compilation : {e}")
+        post = None
+        if record_id:
+            post = run_post_build_stages(self, SimpleNamespace(file_path=job.file, build_info=build), record_id)
+        if build.get("matrix_run"):
+            if post:
+                post.finished.connect(lambda b=build: self.on_matrix_job_done(b))
+            else:
+                self.on_matrix_job_done(build)
+    self.try_start_processes()
+
+
+def upload_build(self, process):
+    """Après une compilation réussie, envoie ses artefacts au cache (en arrière-plan)."""
+    job = getattr(process, "job", None)
+    key = getattr(job, "cache_key", None) if job is not None else None
+    cache = get_artifact_cache(self) if key else None
+    if cache is None:
+        return
+    paths = artifact_paths(process.build_info, self.workspace_dir)
+    if not paths:
+        return
+    worker = CacheUploadWorker(cache, key, self.workspace_dir, paths, job.label, self)
+    _keep_worker(self, worker)
+    worker.start()
+
+
+def configure_artifact_cache(self):
+    """Choisit le cache : URL du serveur (http://hôte:port), dossier local, ou vide pour désactiver."""
+    text, ok = QInputDialog.getText(
+        self, self.tr("Cache d'artefacts", "Artifact cache"),
+        self.tr(
+            "URL du serveur de cache (http://hôte:8766) ou dossier local. Vide : cache désactivé.",
+            "Cache server URL (http://host:8766) or local folder. Empty: cache disabled.",
+        ),
+        text=getattr(self, "artifact_cache", ""),
+    )
+    if not ok:
+        return
+    self.artifact_cache = text.strip()
+    cache = get_artifact_cache(self)
+    self.log.append(f"♻️ Cache d'artefacts : {cache.location}" if cache else "♻️ Cache d'artefacts désactivé.")
+    self.save_preferences()
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Historique des compilations pour PyCompiler Pro++.
+Chaque compilation terminée est enregistrée dans <workspace>/.pycompiler/build_history.json
+(cible, compilateur, mode, durée, code de sortie) ; les étapes post-build y ajoutent leurs résultats.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+
+HISTORY_DIR = ".pycompiler"
+HISTORY_FILE = "build_history.json"
+MAX_HISTORY = 500
+
+_lock = threading.Lock()
+
+
+def history_dir(workspace_dir):
+    return os.path.join(workspace_dir, HISTORY_DIR)
+
+
+def history_path(workspace_dir):
+    return os.path.join(history_dir(workspace_dir), HISTORY_FILE)
+
+
+def load_history(workspace_dir):
+    try:
+        with open(history_path(workspace_dir), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else []
+    except Exception:
+        return []
+
+
+def _save_history(workspace_dir, records):
+    os.makedirs(history_dir(workspace_dir), exist_ok=True)
+    tmp = history_path(workspace_dir) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(records[-MAX_HISTORY:], f, indent=2)
+    os.replace(tmp, history_path(workspace_dir))
+
+
+def append_record(workspace_dir, record):
+    """Ajoute un enregistrement et retourne son identifiant."""
+    record = dict(record)
+    record.setdefault("id", uuid.uuid4().hex)
+    record.setdefault("timestamp", time.time())
+    with _lock:
+        records = load_history(workspace_dir)
+        records.append(record)
+        _save_history(workspace_dir, records)
+    return record["id"]
+
+
+def update_record(workspace_dir, record_id, **fields):
+    """Complète un enregistrement existant (résultats des étapes post-build)."""
+    with _lock:
+        records = load_history(workspace_dir)
+        for r in records:
+            if r.get("id") == record_id:
+                r.update(fields)
+                _save_history(workspace_dir, records)
+                return True
+    return False
+
+
+def previous_records(workspace_dir, target, compiler=None, mode=None, before_id=None, predicate=None):
+    """
+    Retourne les enregistrements précédents d'une même cible (du plus récent au plus ancien),
+    filtrés sur le compilateur, le mode et un prédicat optionnel.
+    """
+    result = []
+    for r in reversed(load_history(workspace_dir)):
+        if before_id and r.get("id") == before_id:
+            result.clear()
+            continue
+        if r.get("target") != target:
+            continue
+        if compiler and r.get("compiler") != compiler:
+            continue
+        if mode and r.get("mode") != mode:
+            continue
+        if predicate and not predicate(r):
+            continue
+        result.append(r)
+    return result
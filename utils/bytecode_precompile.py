@@ -0,0 +1,273 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Précompilation du bytecode pour PyCompiler Pro++ (étape avant compilation).
+Au début d'un lot, tous les fichiers .py du workspace sont compilés en parallèle par
+l'interpréteur du venv (un processus par cœur), au niveau d'optimisation de chaque job
+(0, 1 = -O, 2 = -OO), et éventuellement le site-packages du venv. Les .pyc de __pycache__
+sont réutilisés par PyInstaller et accélèrent les imports ; les erreurs de syntaxe de tout
+le workspace sont connues en quelques secondes : un job dont le graphe d'imports contient un
+fichier invalide échoue sans occuper de place de compilation. Un fichier dont le .pyc est à jour
+(même horodatage et même taille de source, comme compileall) n'est pas recompilé.
+Le niveau est aussi transmis aux compilateurs : --optimize pour PyInstaller (≥ 6.0, version lue
+dans le site-packages du venv ; ignoré avec un avertissement sinon), --python-flag=no_asserts /
+no_docstrings pour Nuitka.
+"""
+import glob
+import json
+import os
+import re
+import subprocess
+import tempfile
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from .job_queue import JOB_FAILED
+from .preflight import import_graph, venv_python
+from . import tracing
+
+DEFAULT_SETTINGS = {"enabled": True, "optimize": 0, "venv": False, "workers": 0}
+EXCLUDED_DIRS = {"venv", ".venv", ".git", "__pycache__", ".pycompiler", ".temp_obfuscated", "build", "dist", "node_modules"}
+EXCLUDED_SUFFIXES = (".dist", ".build", ".onefile-build")
+PRECOMPILE_TIMEOUT = 600
+# Exécuté par l'interpréteur du venv (fichier temporaire : les processus fils doivent pouvoir réimporter le script)
+PRECOMPILE_SCRIPT = '''\
+import compileall, importlib.util, json, os, py_compile, sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+def up_to_date(path, level):
+    # En-tête .pyc (PEP 552, horodatage) identique à celui qu'écrirait py_compile : rien à faire
+    try:
+        st = os.stat(path)
+        with open(importlib.util.cache_from_source(path, optimization=level or ""), "rb") as f:
+            header = f.read(16)
+    except OSError:
+        return False
+    expected = importlib.util.MAGIC_NUMBER + (0).to_bytes(4, "little")
+    expected += (int(st.st_mtime) & 0xFFFFFFFF).to_bytes(4, "little") + (st.st_size & 0xFFFFFFFF).to_bytes(4, "little")
+    return header == expected
+
+
+def compile_one(args):
+    path, levels = args
+    compiled = 0
+    for level in levels:
+        if up_to_date(path, level):
+            continue  # déjà compilé sans erreur : aucune erreur de syntaxe possible
+        try:
+            py_compile.compile(path, doraise=True, optimize=level)
+        except py_compile.PyCompileError as e:
+            exc = e.exc_value
+            if isinstance(exc, SyntaxError):
+                return path, f"ligne {exc.lineno} : {exc.msg}", compiled
+            return path, f"{type(exc).__name__} : {exc}", compiled
+        except OSError:
+            return path, None, compiled  # __pycache__ non inscriptible : rien à signaler
+        compiled += 1
+    return path, None, compiled
+
+
+if __name__ == "__main__":
+    data = json.load(sys.stdin)
+    errors = {}
+    compiled = 0
+    with ProcessPoolExecutor(max_workers=data["workers"]) as pool:
+        jobs = [(path, data["levels"]) for path in data["files"]]
+        for path, error, count in pool.map(compile_one, jobs, chunksize=16):
+            compiled += count
+            if error:
+                errors[path] = error
+    for folder in data["dirs"]:
+        compileall.compile_dir(folder, quiet=2, workers=data["workers"], optimize=data["levels"])
+    print(json.dumps({"errors": errors, "compiled": compiled}))
+'''
+# Premier PyInstaller acceptant --optimize
+PYINSTALLER_OPTIMIZE_MIN = (6, 0)
+
+
+def precompile_settings(self):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(getattr(self, "bytecode_precompile", None) or {})
+    return settings
+
+
+def optimize_level(self, options=None):
+    """Niveau d'optimisation du job (option « optimize » prioritaire sur la préférence)."""
+    options = options or {}
+    level = options.get("optimize", precompile_settings(self)["optimize"])
+    return min(max(int(level or 0), 0), 2)
+
+
+def optimize_args(compiler, level):
+    """Arguments du compilateur correspondant au niveau d'optimisation."""
+    if not level:
+        return []
+    if compiler == "pyinstaller":
+        return ["--optimize", str(level)]
+    args = ["--python-flag=no_asserts"]
+    if level >= 2:
+        args.append("--python-flag=no_docstrings")
+    return args
+
+
+def pyinstaller_version(python):
+    """Version de PyInstaller installée dans le venv de python (tuple), d'après son dist-info, ou None."""
+    from .exclusion_analysis import find_site_packages  # import différé : module d'analyse non requis au démarrage
+    site_packages = find_site_packages(os.path.dirname(os.path.dirname(python)))
+    if not site_packages:
+        return None
+    try:
+        names = os.listdir(site_packages)
+    except OSError:
+        return None
+    for name in names:
+        m = re.match(r"pyinstaller-(\d+(?:\.\d+)*)[^-]*\.dist-info$", name, re.IGNORECASE)
+        if m:
+            return tuple(int(part) for part in m.group(1).split("."))
+    return None
+
+
+def pyinstaller_optimize_args(self, level):
+    """optimize_args pour PyInstaller, sans --optimize si le PyInstaller du venv est antérieur à 6.0."""
+    if not level:
+        return []
+    version = pyinstaller_version(venv_python(self))
+    if version is None or version >= PYINSTALLER_OPTIMIZE_MIN:
+        return optimize_args("pyinstaller", level)
+    if getattr(self, "_optimize_warned", None) != version:
+        # Un avertissement par version détectée, pas un par job
+        self._optimize_warned = version
+        self.log.append(
+            f"⚠️ PyInstaller {'.'.join(map(str, version))} ne connaît pas --optimize (6.0 requis) : "
+            f"niveau d'optimisation {level} appliqué à la seule précompilation. Mettez PyInstaller à jour dans le venv."
+        )
+    return []
+
+
+def workspace_sources(workspace_dir):
+    """Fichiers .py du workspace, hors venv, sorties de compilation et dossiers techniques."""
+    sources = []
+    for root, dirs, files in os.walk(os.path.abspath(workspace_dir)):
+        dirs[:] = [
+            d for d in dirs
+            if d not in EXCLUDED_DIRS and not d.endswith(EXCLUDED_SUFFIXES)
+            and not os.path.isfile(os.path.join(root, d, "pyvenv.cfg"))
+        ]
+        sources += [os.path.join(root, f) for f in files if f.endswith(".py")]
+    return sources
+
+
+def venv_site_packages(python):
+    venv_dir = os.path.dirname(os.path.dirname(python))
+    return glob.glob(os.path.join(venv_dir, "lib", "python*", "site-packages")) + glob.glob(
+        os.path.join(venv_dir, "Lib", "site-packages")
+    )
+
+
+class PrecompileWorker(QThread):
+    """Compile les sources en un seul appel à l'interpréteur du venv, puis attribue les erreurs aux jobs."""
+
+    message = Signal(str)
+
+    def __init__(self, python, workspace_dir, entries, levels, dirs, workers, parent=None):
+        super().__init__(parent)
+        self.python = python
+        self.workspace_dir = workspace_dir
+        self.entries = entries  # job_id -> fichier
+        self.levels = levels
+        self.dirs = dirs
+        self.workers = workers
+        self.errors = {}  # fichier -> message
+        self.broken = {}  # job_id -> [fichiers invalides de son graphe d'imports]
+        self.files = 0
+        self.compiled = 0  # fichiers x niveaux réellement compilés (les autres .pyc étaient à jour)
+        self.seconds = 0.0
+
+    def run(self):
+        with tracing.span("precompile", track="precompile", levels=self.levels) as span:
+            start = time.perf_counter()
+            self._compile()
+            self.seconds = time.perf_counter() - start
+            span.args.update(files=self.files, compiled=self.compiled, errors=len(self.errors))
+
+    def _compile(self):
+        files = workspace_sources(self.workspace_dir)
+        self.files = len(files)
+        if not files:
+            return
+        fd, script = tempfile.mkstemp(prefix="pycompiler_precompile_", suffix=".py")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(PRECOMPILE_SCRIPT)
+            payload = {"files": files, "levels": self.levels, "dirs": self.dirs, "workers": min(self.workers, len(files))}
+            result = subprocess.run(
+                [self.python, script], input=json.dumps(payload),
+                capture_output=True, text=True, cwd=self.workspace_dir, timeout=PRECOMPILE_TIMEOUT,
+            )
+            output = json.loads(result.stdout.strip().splitlines()[-1])
+            self.errors, self.compiled = output["errors"], output["compiled"]
+        except (OSError, subprocess.SubprocessError, ValueError, IndexError, KeyError, TypeError) as e:
+            self.message.emit(f"⚠️ Précompilation du bytecode impossible ({e}) : compilations lancées sans vérification.")
+            return
+        finally:
+            os.remove(script)
+        if not self.errors:
+            return
+        for job_id, entry in self.entries.items():
+            _external, local, _lazy = import_graph(entry, self.workspace_dir)
+            broken = sorted(path for path in local if path in self.errors)
+            if broken:
+                self.broken[job_id] = broken
+
+
+def start_precompile(self, on_done):
+    """Précompile le bytecode du workspace puis appelle on_done() ; les jobs au code invalide sont retirés."""
+    settings = precompile_settings(self)
+    python = venv_python(self)
+    entries = {job.id: os.path.abspath(job.file) for job in self.queue}
+    if not settings["enabled"] or not entries or not os.path.isfile(python):
+        on_done()
+        return
+    levels = sorted({optimize_level(self, job.options) for job in self.queue})
+    dirs = venv_site_packages(python) if settings["venv"] else []
+    workers = int(settings["workers"]) or max(1, (os.cpu_count() or 2) - 1)
+    self.log.append(
+        f"🧱 Précompilation du bytecode (niveau(x) {', '.join(map(str, levels))}"
+        f"{', venv compris' if dirs else ''}, {workers} processus)..."
+    )
+    worker = PrecompileWorker(python, self.workspace_dir, entries, levels, dirs, workers, self)
+    self._precompile_worker = worker
+    worker.message.connect(self.log.append)
+    worker.finished.connect(lambda w=worker: _on_precompile_done(self, w, on_done))
+    worker.start()
+
+
+def _on_precompile_done(self, worker, on_done):
+    self._precompile_worker = None
+    for job in list(self.queue):
+        broken = worker.broken.get(job.id)
+        if not broken or not self.queue.take(job):
+            continue
+        self.queue.mark_finished(job, JOB_FAILED)
+        self._batch_done = getattr(self, "_batch_done", 0) + 1
+        details = "<br>".join(
+            f"- {os.path.relpath(path, self.workspace_dir)}, {worker.errors[path]}" for path in broken
+        )
+        self.log.append(f"⛔ {job.label} : erreur(s) de syntaxe, compilation évitée :<br>{details}")
+        if job.options and job.options.get("matrix_run"):
+            self.on_matrix_job_done(job.options)
+    unused = sorted(set(worker.errors) - {path for paths in worker.broken.values() for path in paths})
+    if unused:
+        self.log.append(
+            f"⚠️ Erreur(s) de syntaxe hors des cibles compilées : "
+            f"{', '.join(os.path.relpath(p, self.workspace_dir) for p in unused[:5])}{'...' if len(unused) > 5 else ''}"
+        )
+    if worker.files:
+        self.log.append(
+            f"🧱 {worker.files} fichier(s) vérifié(s) en {worker.seconds:.1f} s "
+            f"({worker.compiled} compilation(s), les autres .pyc étaient à jour)."
+        )
+    on_done()
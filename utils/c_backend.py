@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Gestion du backend C de Nuitka pour PyCompiler Pro++.
+Répartit les cœurs de la machine entre les compilations Nuitka simultanées (--jobs=N par
+processus, borné par la mémoire disponible) au lieu de laisser chaque processus lancer un
+job C par cœur. Permet aussi de mesurer gcc/clang et LTO oui/non sur une cible : chaque
+combinaison est compilée seule et sans ccache, la plus rapide est retenue dans
+<workspace>/.pycompiler/c_backend.json et réutilisée pour les compilations suivantes.
+"""
+import json
+import os
+import platform
+
+import psutil
+from PySide6.QtWidgets import QMessageBox
+
+from .build_history import history_dir, load_history
+from .matrix_build import queue_matrix
+from .preferences import MAX_PARALLEL
+from .resource_policy import compiler_cpus, policy_for
+from .toolchain import has_tool
+
+TUNING_FILE = "c_backend.json"
+# Mémoire réservée par job C (cc1 sur un gros module Nuitka)
+MEMORY_PER_C_JOB = 768 * 1024 * 1024
+# Valeur de l'option "c_jobs" : calcul automatique ; None = laisser Nuitka (ou l'agent) décider
+AUTO = "auto"
+
+
+def is_exclusive(job):
+    return bool(job is not None and job.options and job.options.get("exclusive"))
+
+
+def _tuning_path(workspace_dir):
+    return os.path.join(history_dir(workspace_dir), TUNING_FILE)
+
+
+def load_tuning(workspace_dir):
+    try:
+        with open(_tuning_path(workspace_dir), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def save_tuning(workspace_dir, target, choice):
+    data = load_tuning(workspace_dir)
+    data[target] = choice
+    os.makedirs(history_dir(workspace_dir), exist_ok=True)
+    with open(_tuning_path(workspace_dir), "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def c_jobs_for_next(self, file, options=None):
+    """
+    Nombre de jobs C pour la compilation Nuitka qui va démarrer : cœurs logiques (un laissé à
+    l'interface) divisés par le nombre de compilations Nuitka locales attendues en même temps.
+    Avec l'affinité de resource_policy.py, seuls les cœurs autorisés aux compilateurs comptent.
+    """
+    allowed = compiler_cpus(policy_for(self, options))
+    cores = len(allowed) if allowed else psutil.cpu_count(logical=True) or os.cpu_count() or 1
+    if options and options.get("exclusive"):
+        concurrent = 1
+    else:
+        local = [p for p in self.processes if not getattr(p, "remote", False)]
+        running = sum(1 for p in local if getattr(p, "build_info", {}).get("compiler") == "nuitka")
+        free_slots = max(0, MAX_PARALLEL - len(local) - 1)
+        queued = sum(1 for j in self.queue if not j.paused and self.job_uses_nuitka(j.options))
+        concurrent = min(MAX_PARALLEL, running + 1 + min(queued, free_slots))
+    # Le cœur de l'interface est déjà exclu de l'affinité
+    usable = cores if allowed or cores <= 2 else cores - 1
+    jobs = max(1, usable // concurrent)
+    try:
+        by_memory = psutil.virtual_memory().available // (MEMORY_PER_C_JOB * concurrent)
+        jobs = max(1, min(jobs, by_memory))
+    except Exception:
+        pass
+    return jobs
+
+
+def c_backend_args(self, file, options=None):
+    """Arguments Nuitka du backend C : --jobs, puis compilateur et LTO (job > réglage mesuré)."""
+    options = options or {}
+    args = []
+    c_jobs = options.get("c_jobs", AUTO)
+    if c_jobs == AUTO:
+        c_jobs = c_jobs_for_next(self, file, options)
+    if c_jobs:
+        args.append(f"--jobs={c_jobs}")
+    tuned = {}
+    if self.workspace_dir:
+        tuned = load_tuning(self.workspace_dir).get(os.path.relpath(file, self.workspace_dir), {})
+    c_compiler = options.get("c_compiler", tuned.get("c_compiler"))
+    toolchain = getattr(self, "toolchain", None)
+    # clang retenu mais désinstallé depuis : retour au compilateur par défaut
+    if c_compiler == "clang" and (toolchain is None or has_tool(toolchain, "clang")):
+        args.append("--clang")
+    lto = options.get("lto", tuned.get("lto"))
+    if lto in ("yes", "no"):
+        args.append(f"--lto={lto}")
+    return args
+
+
+def c_backend_environment(options=None):
+    """
+    Variables d'environnement du processus Nuitka. Les jobs exclusifs (mesure gcc/clang x LTO,
+    matrice) compilent sans ccache : sinon les variantes suivantes profiteraient du cache des premières.
+    """
+    if options and options.get("exclusive"):
+        return {"NUITKA_CCACHE_BINARY": "NONE"}
+    return {}
+
+
+def benchmark_configs(self):
+    """Combinaisons à mesurer : compilateur par défaut (et clang s'il est installé) x LTO oui/non."""
+    toolchain = getattr(self, "toolchain", None) or {}
+    compilers = ["default"]
+    if has_tool(toolchain, "clang"):
+        compilers.append("clang")
+    configs = []
+    for c_compiler in compilers:
+        for lto in ("no", "yes"):
+            configs.append({
+                "label": f"c-{c_compiler}-lto-{lto}",
+                "compiler": "nuitka", "standalone": True, "onefile": False,
+                "c_compiler": c_compiler, "lto": lto, "exclusive": True,
+            })
+    return configs
+
+
+def benchmark_c_backend(self, file):
+    """Compile la cible avec chaque combinaison gcc/clang x LTO, une à la fois, et retient la plus rapide."""
+    if self.processes or self.queue:
+        QMessageBox.warning(self, self.tr("Attention", "Warning"), self.tr("Des compilations sont déjà en cours.", "Builds are already running."))
+        return
+    if not self.workspace_dir:
+        self.log.append("❌ Aucun workspace sélectionné.")
+        return
+    configs = benchmark_configs(self)
+    if getattr(self, "toolchain", None) is None:
+        self.log.append("ℹ️ Sonde de la chaîne C en cours : clang ne sera pas mesuré.")
+    elif platform.system() != "Windows" and len(configs) == 2:
+        self.log.append("ℹ️ clang introuvable : seules les variantes LTO du compilateur par défaut sont mesurées.")
+    queue_matrix(self, file, configs, on_complete=lambda run: _on_benchmark_done(self, run), title="Mesure du backend C", benchmark=False)
+
+
+def _on_benchmark_done(self, run):
+    records = [
+        r for r in load_history(self.workspace_dir)
+        if r.get("matrix_run") == run["id"] and r.get("exit_code") == 0 and r.get("duration")
+    ]
+    if not records:
+        self.log.append("⚠️ Mesure du backend C : aucune combinaison n'a compilé, réglage inchangé.\n")
+        return
+    best = min(records, key=lambda r: r["duration"])
+    choice = {
+        "c_compiler": "clang" if "-clang-" in best["label"] else "default",
+        "lto": "yes" if best["label"].endswith("lto-yes") else "no",
+        "duration": round(best["duration"], 2),
+        "run": run["id"],
+    }
+    try:
+        save_tuning(self.workspace_dir, run["target"], choice)
+    except Exception as e:
+        self.log.append(f"⚠️ Impossible d'enregistrer le réglage du backend C : {e}")
+        return
+    self.log.append(
+        f"⚙️ Backend C retenu pour {run['target']} : {best['label']} ({best['duration']:.1f} s), "
+        "appliqué aux prochaines compilations Nuitka.\n"
+    )
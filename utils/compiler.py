@@ -5,24 +5,53 @@
 Logique de compilation pour PyCompiler Pro++.
 Inclut la construction des commandes PyInstaller/Nuitka et la gestion des processus de compilation.
 """
+import html
 import os
 import platform
 import subprocess
 import re
+import time
 from PySide6.QtWidgets import (
     QMessageBox
 )
-from PySide6.QtCore import QProcess
+from PySide6.QtCore import QProcess, QProcessEnvironment
 from .preferences import MAX_PARALLEL
 from .pyarmor_api import PyArmorAPI
-from .sys_dependency import SysDependencyManager
+from .exclusion_analysis import get_auto_exclusions
+from .artifact_analysis import describe_build
+from .build_history import append_record
+from .post_build import run_post_build_stages
+from .build_cache import upload_build
+from .artifact_store import start_artifact_gc
+from .binary_shrink import takes_over_upx
+from .bytecode_precompile import optimize_args, optimize_level, pyinstaller_optimize_args
+from .c_backend import c_backend_args, c_backend_environment, is_exclusive
+from . import tracing
+from .tracing import end_batch_trace
+from .progress_tracking import begin_batch_progress, init_build_progress, update_build_progress, finish_build_progress
+from .output_stream import OutputStream, lines_to_html
+from .process_supervisor import kill_tree_now, supervise, terminate_tree
+from .resource_policy import apply_resource_policy
+from .tmpfs_workdir import discard_scratch, fallback_to_disk, finalize_scratch, prepare_scratch
+from .watchdog import ensure_watchdog, note_output, retry_stalled
+from .failure_classifier import (
+    FailureClassifier, cancel_remediation, classify_exit, classify_output, describe_failure, remediate_failure,
+    remediation_pending,
+)
+from .remote_build import free_build_agent, remote_compatible
+from .job_queue import (
+    BuildJob, JOB_CANCELLED, JOB_DONE, JOB_FAILED, JOB_PREEMPTED, JOB_QUEUED, resume_if_paused
+)
 
 
 def compile_all(self):
     import os
     # Protection du code par PyArmor avant compilation
     pyarmor_api = PyArmorAPI(parent_widget=self)
-    if not pyarmor_api.pre_compilation_obfuscation(self.workspace_dir):
+    # (dialogues compris ; les étapes PyArmor non interactives ont leurs propres spans)
+    with tracing.span("pyarmor.pre_obfuscation", interactive=True):
+        protected = pyarmor_api.pre_compilation_obfuscation(self.workspace_dir)
+    if not protected:
         self.log.append("⛔ Compilation annulée : PyArmor requis pour la protection du code.\n")
         return
     if self.processes:
@@ -52,6 +81,7 @@ def compile_all(self):
             self.log.append(f"⏩ Ignoré (erreur lecture) : {path} ({e})")
             return False
 
+    entry_points_span = tracing.span("entry_points")
     # Détection du compilateur actif
     use_nuitka = False
     if hasattr(self, 'compiler_tabs') and self.compiler_tabs:
@@ -66,72 +96,106 @@ def compile_all(self):
             files_ok = [f for f in self.selected_files if is_executable_script(f)]
         else:
             files_ok = [f for f in self.python_files if is_executable_script(f)]
-        self.queue = [(f, True) for f in files_ok]
+        self.queue.reset(BuildJob(f) for f in files_ok)
         total_files = len(files_ok)
     else:
         # PyInstaller : applique la logique main.py/app.py uniquement si l'option est cochée
         if self.selected_files:
             files_ok = [f for f in self.selected_files if is_executable_script(f)]
-            self.queue = [(f, True) for f in files_ok]
+            self.queue.reset(BuildJob(f) for f in files_ok)
             total_files = len(files_ok)
         elif self.opt_main_only.isChecked():
             files = [f for f in self.python_files if os.path.basename(f) in ("main.py", "app.py")]
             files_ok = [f for f in files if is_executable_script(f)]
-            self.queue = [(f, True) for f in files_ok]
+            self.queue.reset(BuildJob(f) for f in files_ok)
             total_files = len(files_ok)
             if not files_ok:
                 self.log.append("⚠️ Aucun main.py ou app.py exécutable trouvé dans le workspace.\n")
                 return
         else:
             files_ok = [f for f in self.python_files if is_executable_script(f)]
-            self.queue = [(f, True) for f in files_ok]
+            self.queue.reset(BuildJob(f) for f in files_ok)
             total_files = len(files_ok)
 
+    entry_points_span.end(candidates=len(self.selected_files or self.python_files), targets=total_files)
     self.current_compiling.clear()
     self.processes.clear()
-    self.progress.setRange(0, 0)  # Mode indéterminé pendant toute la compilation
+    begin_batch_progress(self, len(self.queue))  # Barre globale déterminée (voir progress_tracking.py)
     self.log.append("🔨 Compilation parallèle démarrée...\n")
 
     self.set_controls_enabled(False)
-    self.try_start_processes()
+    self.start_batch()  # Cache d'artefacts d'abord (voir build_cache.py)
 
 # Nouvelle version de try_start_processes pour gérer les fichiers ignorés dynamiquement
 
 def try_start_processes(self):
     from PySide6.QtWidgets import QApplication
-    while len(self.processes) < MAX_PARALLEL and self.queue:
-        file, to_compile = self.queue.pop(0)
-        if to_compile:
-            self.start_compilation_process(file)
-        # Si le fichier est ignoré (to_compile == False), on ne touche pas à la barre de progression
-        # et on passe simplement au suivant
-    if not self.processes and not self.queue:
+    # Les jobs en cours mis en pause restent dans self.processes et gardent leur place.
+    # Places locales d'abord, puis agents de compilation distants (remote_build.py).
+    while self.queue.has_runnable():
+        # Un job exclusif (mesure du backend C) tourne seul, en local, pour des temps comparables
+        if self.processes and (is_exclusive(self.queue.peek_next()) or any(is_exclusive(getattr(p, "job", None)) for p in self.processes)):
+            break
+        local_running = sum(1 for p in self.processes if not getattr(p, "remote", False))
+        agent = None if local_running < MAX_PARALLEL else free_build_agent(self)
+        if local_running >= MAX_PARALLEL and agent is None:
+            break
+        job = self.queue.peek_next()
+        if agent is not None and not remote_compatible(self, job.file, job.options):
+            # Dossier de sortie hors du workspace : l'agent ne pourrait pas renvoyer les artefacts,
+            # le job attend une place locale
+            if not getattr(job, "remote_refused", False):
+                job.remote_refused = True
+                self.log.append(f"ℹ️ {job.label} : dossier de sortie hors du workspace, compilation locale uniquement (en attente d'une place).")
+            break
+        job = self.queue.pop_next()
+        if agent is not None:
+            process = self.start_remote_compilation(agent, job.file, job.options)
+        else:
+            process = self.start_compilation_process(job.file, job.options)
+        if process is None:
+            self.queue.mark_finished(job, JOB_FAILED)
+            self._batch_done = getattr(self, "_batch_done", 0) + 1
+            continue
+        process.job = job
+        process.trace_span = tracing.span("compile", track=job.label, remote=getattr(process, "remote", False), attempt=job.attempts)
+        note_output(process)
+        self.queue.mark_running(job, process)
+    ensure_watchdog(self)
+    if not self.processes and self.queue and not self.queue.has_runnable():
+        self.log.append(f"⏸️ {len(self.queue)} compilation(s) en pause dans la file.")
+    if not self.processes and not self.queue and not remediation_pending(self):
         # Toutes les compilations sont terminées : mettre la barre à 100%
         self.progress.setRange(0, 1)
         self.progress.setValue(1)
         from PySide6.QtWidgets import QApplication
         QApplication.processEvents()
         self.log.append("✔️ Toutes les compilations sont terminées.\n")
+        end_batch_trace(self)
+        start_artifact_gc(self)  # Quotas et rétention des sorties (artifact_store.py)
         if hasattr(self, 'compiler_tabs') and self.compiler_tabs:
             self.compiler_tabs.setEnabled(True)  # Réactive les onglets à la toute fin
         self.set_controls_enabled(True)
         self.save_preferences()
 
-def start_compilation_process(self, file):
+def job_uses_nuitka(self, options=None):
+    # Choix du compilateur selon les options du job, sinon selon l'onglet actif
+    if options and options.get("compiler"):
+        return options["compiler"] == "nuitka"
+    if hasattr(self, 'compiler_tabs') and self.compiler_tabs:
+        return self.compiler_tabs.currentIndex() == 1  # 0 = PyInstaller, 1 = Nuitka
+    return False
+
+def start_compilation_process(self, file, options=None):
     import time
     file_basename = os.path.basename(file)
-    # Choix du compilateur selon l'onglet actif
-    use_nuitka = False
-    if hasattr(self, 'compiler_tabs') and self.compiler_tabs:
-        if self.compiler_tabs.currentIndex() == 1:  # 0 = PyInstaller, 1 = Nuitka
-            use_nuitka = True
+    use_nuitka = self.job_uses_nuitka(options)
+    # Intermédiaires en mémoire si l'option tmpfs est active (tmpfs_workdir.py)
+    options, scratch = prepare_scratch(self, file, options, use_nuitka)
     if use_nuitka:
-        # Vérification et installation des dépendances système pour Nuitka
-        sysdep = SysDependencyManager(parent_widget=self)
-        if not sysdep.install_gcc_and_p7zip():
-            self.log.append("⛔ Compilation Nuitka annulée : dépendances système manquantes ou installation refusée.\n")
-            return
-        cmd = self.build_nuitka_command(file)
+        # Les dépendances système (gcc, patchelf, 7z) sont vérifiées une fois par lot (ensure_batch_toolchain)
+        with tracing.span("command", track=file_basename, compiler="nuitka"):
+            cmd = self.build_nuitka_command(file, options)
         # Nuitka s'exécute avec python -m nuitka dans le venv
         if self.venv_path_manuel:
             venv_bin = os.path.join(self.venv_path_manuel, "venv", "Scripts" if platform.system() == "Windows" else "bin")
@@ -141,26 +205,45 @@ def start_compilation_process(self, file):
         if not os.path.isfile(python_path):
             self.log.append(f"❌ python non trouvé dans le venv : {python_path}")
             self.show_error_dialog(file_basename)
-            return
+            discard_scratch(self, scratch)
+            if options and options.get("matrix_run"):
+                self.on_matrix_job_done(options)
+            return None
         self.log.append(f"▶️ Lancement compilation Nuitka : {file_basename}\nCommande : {' '.join(cmd)}\n")
         process = QProcess(self)
         process.setProgram(python_path)
         process.setArguments(cmd[1:])
         process.setWorkingDirectory(self.workspace_dir)
+        env_overrides = c_backend_environment(options)
+        if env_overrides:
+            env = QProcessEnvironment.systemEnvironment()
+            for name, value in env_overrides.items():
+                env.insert(name, value)
+            process.setProcessEnvironment(env)
         process.file_path = file
         process.file_basename = file_basename
+        process.build_info = describe_build(self, file, use_nuitka, options)
+        process.scratch = scratch
+        process.used_tmpfs = scratch is not None
         process._start_time = time.time()
-        process.readyReadStandardOutput.connect(lambda p=process: self.handle_stdout(p))
-        process.readyReadStandardError.connect(lambda p=process: self.handle_stderr(p))
+        process.output_stream = OutputStream(process)
+        process.failure_classifier = FailureClassifier("nuitka")
+        process.output_stream.lines.connect(lambda channel, lines, p=process: self.handle_output(p, channel, lines))
         process.finished.connect(lambda ec, es, p=process: self.handle_finished(p, ec, es))
         self.processes.append(process)
         self.current_compiling.add(file)
+        init_build_progress(self, process)
         # Suppression de la désactivation ici (déjà fait dans compile_all)
         if hasattr(self, 'update_compiler_options_enabled'):
                 self.update_compiler_options_enabled()
-        process.start()
+        supervise(process)
+        process.started.connect(lambda p=process, o=options: apply_resource_policy(self, p, o))
+        with tracing.span("launch", track=file_basename):
+            process.start()
+        return process
     else:
-        cmd = self.build_pyinstaller_command(file_basename)
+        with tracing.span("command", track=file_basename, compiler="pyinstaller"):
+            cmd = self.build_pyinstaller_command(file_basename, options)
         if self.venv_path_manuel:
             venv_bin = os.path.join(self.venv_path_manuel, "venv", "Scripts" if platform.system() == "Windows" else "bin")
         else:
@@ -169,70 +252,138 @@ def start_compilation_process(self, file):
         if not os.path.isfile(pyinstaller_path):
             self.log.append(f"❌ pyinstaller non trouvé dans le venv : {pyinstaller_path}")
             self.show_error_dialog(file_basename)
-            return
+            discard_scratch(self, scratch)
+            if options and options.get("matrix_run"):
+                self.on_matrix_job_done(options)
+            return None
         self.log.append(f"▶️ Lancement compilation : {file_basename}\nCommande : {' '.join([pyinstaller_path] + cmd[1:])}\n")
-        # Met la barre en mode indéterminé pendant la compilation du fichier pour PyInstaller ET Nuitka
-        self.progress.setRange(0, 0)
-        from PySide6.QtWidgets import QApplication
-        QApplication.processEvents()
         process = QProcess(self)
         process.setProgram(pyinstaller_path)
         process.setArguments(cmd[1:])
         process.setWorkingDirectory(self.workspace_dir)
         process.file_path = file
         process.file_basename = file_basename
+        process.build_info = describe_build(self, file, use_nuitka, options)
+        process.scratch = scratch
+        process.used_tmpfs = scratch is not None
         process._start_time = time.time()
-        process.readyReadStandardOutput.connect(lambda p=process: self.handle_stdout(p))
-        process.readyReadStandardError.connect(lambda p=process: self.handle_stderr(p))
+        process.output_stream = OutputStream(process)
+        process.failure_classifier = FailureClassifier("pyinstaller")
+        process.output_stream.lines.connect(lambda channel, lines, p=process: self.handle_output(p, channel, lines))
         process.finished.connect(lambda ec, es, p=process: self.handle_finished(p, ec, es))
         self.processes.append(process)
         self.current_compiling.add(file)
+        init_build_progress(self, process)
         # Suppression de la désactivation ici (déjà fait dans compile_all)
-        process.start()
-
-    # Ajout pour Nuitka : barre ind��terminée aussi
-    if use_nuitka:
-        self.progress.setRange(0, 0)
-        from PySide6.QtWidgets import QApplication
-        QApplication.processEvents()
-
-def handle_stdout(self, process):
-    data = process.readAllStandardOutput().data().decode()
-    self.log.append(data)
-
-    # Détection de la fin Nuitka dans le log
-    if "Successfully created" in data or "Nuitka: Successfully created" in data:
-        # Forcer la barre à 100% et sortir du mode animation
-        self.progress.setRange(0, 1)
-        self.progress.setValue(1)
-        # S'assurer que le message est à la fin du log
-        lines = data.strip().splitlines()
-        for line in lines:
-            if "Nuitka: Successfully created" in line or "Successfully created" in line:
-                self.log.append(f"<b style='color:green'>{line}</b>")
+        supervise(process)
+        process.started.connect(lambda p=process, o=options: apply_resource_policy(self, p, o))
+        with tracing.span("launch", track=file_basename):
+            process.start()
+        return process
+
+def handle_output(self, process, channel, lines):
+    """Aiguille les lignes de process.output_stream et cumule le temps passé à les traiter."""
+    start = time.perf_counter()
+    if channel == "stdout":
+        self.handle_stdout(process, lines)
+    else:
+        self.handle_stderr(process, lines)
+    classify_output(self, process, lines)
+    note_output(process)
+    process.output_seconds = getattr(process, "output_seconds", 0.0) + time.perf_counter() - start
+    process.output_lines = getattr(process, "output_lines", 0) + len(lines)
+
+def handle_stdout(self, process, lines):
+    """Lignes stdout décodées par process.output_stream."""
+    self.log.append(lines_to_html(lines))
+
+    parser = getattr(process, "output_parser", None)
+    if parser is None:
+        return
+    was_finished = parser.finished
+    parser.feed_lines(lines)
+    update_build_progress(self, process)
+    _check_nuitka_finished(self, process, parser, was_finished)
+
+def _check_nuitka_finished(self, process, parser, was_finished):
+    """Détection de la fin Nuitka dans le log (stdout ou stderr, après feed_lines)."""
+    build_info = getattr(process, "build_info", {}) or {}
+    # (pas pour un agent distant : il doit encore renvoyer les artefacts)
+    if parser.finished and not was_finished and build_info.get("compiler") == "nuitka" and not getattr(process, "remote", False):
+        self.log.append(f"<b style='color:green'>{html.escape(parser.finished_line)}</b>")
         # Forcer la terminaison du process si besoin
         if process.state() != QProcess.NotRunning:
-            self.log.append("<span style='color:orange;'>ℹ️ Nuitka a signalé la fin de compilation dans le log, mais le process n'est pas terminé. Forçage du kill immédiat et nettoyage UI...</span>")
-            process.kill()
-            process.waitForFinished(2000)
-            # Nettoyage manuel si le signal finished ne se déclenche pas
-            if process in self.processes:
-                self.handle_finished(process, 0, QProcess.NormalExit)
-    # --- Progression Nuitka (--show-progress) ---
-    # Désormais, la barre reste indéterminée pendant toute la compilation
-    # (aucune mise à jour de valeur ici)
-
-def handle_stderr(self, process):
-    data = process.readAllStandardError().data().decode()
-    self.log.append(f"<span style='color:red;'>{data}</span>")
+            self.log.append("<span style='color:orange;'>ℹ️ Nuitka a signalé la fin de compilation dans le log, mais le process n'est pas terminé. Arrêt de son arbre de processus et nettoyage UI...</span>")
+            # La compilation a réussi, mais l'arbre écrit peut-être encore dans le dossier de sortie
+            # (tmpfs compris) : finalisée une fois tout l'arbre arrêté, le code de sortie du kill est ignoré
+            process.finished_in_log = True
+            terminator = terminate_tree(self, process)
+            if terminator is not None:
+                terminator.done.connect(lambda *_args, p=process: self.handle_finished(p, 0, QProcess.NormalExit))
+
+def handle_stderr(self, process, lines):
+    """Lignes stderr décodées par process.output_stream."""
+    self.log.append(lines_to_html(lines, "red"))
+    # PyInstaller écrit sa progression sur stderr
+    parser = getattr(process, "output_parser", None)
+    if parser is not None:
+        was_finished = parser.finished
+        parser.feed_lines(lines)
+        update_build_progress(self, process)
+        _check_nuitka_finished(self, process, parser, was_finished)
 
 def handle_finished(self, process, exit_code, exit_status):
+    # Le kill forcé de handle_stdout appelle handle_finished à la fin de l'arrêt de l'arbre
+    if getattr(process, "_finished_handled", False):
+        return
+    if getattr(process, "finished_in_log", False):
+        if getattr(process, "terminator", None) is not None:
+            return  # descendants encore vivants : finalisé par terminator.done
+        exit_code, exit_status = 0, QProcess.NormalExit
+    process._finished_handled = True
+    track = getattr(getattr(process, "job", None), "label", None) or getattr(process, "file_basename", None)
+    compile_span = getattr(process, "trace_span", None)
+    if compile_span is not None:
+        compile_span.end(
+            exit_code=exit_code,
+            output_ms=round(getattr(process, "output_seconds", 0.0) * 1000, 1),
+            output_lines=getattr(process, "output_lines", 0),
+        )
+    with tracing.span("finish", track=track):
+        _handle_finished(self, process, exit_code, exit_status)
+
+def _handle_finished(self, process, exit_code, exit_status):
     # Suppression de la réactivation ici (gérée à la toute fin dans try_start_processes)
     import traceback
     import time
     import psutil
+    stream = getattr(process, "output_stream", None)
+    if stream is not None:
+        # Émet les dernières lignes incomplètes avant le bilan
+        stream.flush()
     file = process.file_path
     file_basename = process.file_basename
+    job = getattr(process, "job", None)
+    succeeded = exit_code == 0 and not getattr(process, "failure", None) and not getattr(process, "stalled", False)
+    finalize_scratch(self, process, succeeded and not (job is not None and job.state in (JOB_CANCELLED, JOB_PREEMPTED)))
+
+    # Préemption par une cible prioritaire : le job repart en tête de file avec ses options
+    if job is not None and job.state == JOB_PREEMPTED:
+        if process in self.processes:
+            self.processes.remove(process)
+        self.current_compiling.discard(file)
+        finish_build_progress(self, process, counted=False)
+        self.queue.requeue_front(job)
+        self.try_start_processes()
+        return
+    cancelled = job is not None and job.state == JOB_CANCELLED
+    failure = getattr(process, "failure", None)
+    if failure is None and exit_code and not cancelled and stream is not None:
+        # Module manquant : seulement s'il termine le processus (traceback final)
+        failure = process.failure = classify_exit(stream.tail("stderr", 20).splitlines())
+    if (failure is not None or getattr(process, "stalled", False)) and not exit_code:
+        # Arrêtée par le classifieur d'échecs ou le watchdog : jamais un succès, même si le signal donne le code 0
+        exit_code = 1
 
     # Mesure du temps de compilation
     elapsed = None
@@ -250,7 +401,43 @@ def handle_finished(self, process, exit_code, exit_status):
     except Exception:
         mem_info = None
 
-    if exit_code == 0:
+    # Enregistrement dans l'historique des compilations du workspace
+    record_id = None
+    build_info = getattr(process, "build_info", None)
+    if build_info and self.workspace_dir:
+        try:
+            record_id = append_record(self.workspace_dir, {
+                "target": os.path.relpath(file, self.workspace_dir),
+                "compiler": build_info["compiler"],
+                "mode": build_info["mode"],
+                "duration": elapsed,
+                "exit_code": exit_code,
+                "label": build_info.get("label"),
+                "matrix_run": build_info.get("matrix_run"),
+                "attempt": job.attempts if job is not None else 1,
+                "cancelled": cancelled,
+                "stalled": getattr(process, "stalled_after", None),
+            })
+        except Exception as e:
+            self.log.append(f"⚠️ Impossible d'enregistrer l'historique de compilation : {e}")
+
+    is_matrix = bool(build_info and build_info.get("matrix_run"))
+    # Bloquée puis arrêtée par le watchdog : relancée tant qu'il reste des tentatives
+    if getattr(process, "stalled", False) and not cancelled and retry_stalled(self, process):
+        if process in self.processes:
+            self.processes.remove(process)
+        self.current_compiling.discard(file)
+        finish_build_progress(self, process, counted=False)
+        self.try_start_processes()
+        return
+    if job is not None:
+        self.queue.mark_finished(job, JOB_CANCELLED if cancelled else JOB_DONE if exit_code == 0 else JOB_FAILED)
+
+    if cancelled:
+        self.log.append(f"⛔ Compilation de {file_basename} annulée.\n")
+        if is_matrix:
+            self.on_matrix_job_done(build_info)
+    elif exit_code == 0:
         msg = f"✅ {file_basename} compilé avec succès."
         if elapsed:
             msg += f" Temps de compilation : {elapsed:.2f} secondes."
@@ -259,34 +446,55 @@ def handle_finished(self, process, exit_code, exit_status):
         # Suppression de la vérification stricte du dossier/fichier de sortie
         self.log.append(msg + "\n")
         self.log.append("<span style='color:#7faaff;'>ℹ️ Certains messages d’erreur ou de warning peuvent apparaître dans les logs, mais si l’exécutable fonctionne, ils ne sont pas bloquants.</span>\n")
+        # Analyse post-build (taille des artefacts, régressions)
+        worker = run_post_build_stages(self, process, record_id) if record_id else None
+        # Partage des artefacts avec l'équipe (cache d'artefacts), une fois strip/UPX et dédup terminés
+        if worker:
+            worker.finished.connect(lambda p=process: upload_build(self, p))
+        else:
+            upload_build(self, process)
+        if is_matrix:
+            # Le rapport de la matrice attend la fin des étapes post-build
+            if worker:
+                worker.finished.connect(lambda b=build_info: self.on_matrix_job_done(b))
+            else:
+                self.on_matrix_job_done(build_info)
         # Ouvre le dossier Nuitka si la compilation a été faite avec Nuitka
-        if hasattr(self, 'compiler_tabs') and self.compiler_tabs.currentIndex() == 1 and hasattr(self, 'open_nuitka_dist_folder'):
+        elif hasattr(self, 'compiler_tabs') and self.compiler_tabs.currentIndex() == 1 and hasattr(self, 'open_nuitka_dist_folder'):
             try:
                 self.open_nuitka_dist_folder(file)
             except Exception as e:
                 self.log.append(f"⚠️ Impossible d'ouvrir le dossier Nuitka automatiquement : {e}")
         # Ouvre le dossier dist si la compilation a été faite avec PyInstaller
-        if hasattr(self, 'compiler_tabs') and self.compiler_tabs.currentIndex() == 0 and hasattr(self, 'open_dist_folder'):
+        if not is_matrix and hasattr(self, 'compiler_tabs') and self.compiler_tabs.currentIndex() == 0 and hasattr(self, 'open_dist_folder'):
             try:
                 self.open_dist_folder()
             except Exception as e:
                 self.log.append(f"⚠️ Impossible d'ouvrir le dossier dist automatiquement : {e}")
     else:
         # Ajout d'un affichage détaillé pour les erreurs inattendues
-        error_details = process.readAllStandardError().data().decode()
+        error_details = stream.tail("stderr", 60) if stream is not None else ""
         self.log.append(f"<span style='color:red;'>❌ La compilation de {file_basename} ({file}) a échoué (code {exit_code}).</span>\n")
         if error_details:
-            self.log.append(f"<span style='color:red;'>Détails de l'erreur :<br><pre>{error_details}</pre></span>")
-        self.show_error_dialog(file_basename, file, exit_code, error_details)
-
+            self.log.append(f"<span style='color:red;'>Détails de l'erreur :<br><pre>{html.escape(error_details)}</pre></span>")
+        if failure is not None:
+            self.log.append(f"<span style='color:red;'>Cause : {html.escape(describe_failure(failure))}.</span>")
+        # Tmpfs plein : relance sur disque ; module manquant détecté en direct : installation groupée puis relance
+        remediating = failure is not None and (fallback_to_disk(self, process, failure) or remediate_failure(self, process))
+        if not remediating:
+            self.show_error_dialog(file_basename, file, exit_code, error_details)
         # Auto-install modules manquants si activé
-        if self.opt_auto_install.isChecked():
+        if not remediating and self.opt_auto_install.isChecked():
             self.try_install_missing_modules(process)
+        # Un job remis en file après installation des modules reste attendu par la matrice
+        if is_matrix and not remediating and not (job is not None and job.state == JOB_QUEUED):
+            self.on_matrix_job_done(build_info)
 
     if process in self.processes:
         self.processes.remove(process)
     if file in self.current_compiling:
         self.current_compiling.remove(file)
+    finish_build_progress(self, process)
 
     # Ne pas toucher à la barre ici : elle sera gérée dans try_start_processes
 
@@ -304,7 +512,8 @@ def handle_finished(self, process, exit_code, exit_status):
     self.try_start_processes()
 
 def try_install_missing_modules(self, process):
-    output = process.readAllStandardError().data().decode()
+    stream = getattr(process, "output_stream", None)
+    output = stream.tail("stderr") if stream is not None else ""
     missing_modules = re.findall(r"No module named '([\w\d_]+)'", output)
     if not hasattr(self, '_already_tried_modules'):
         self._already_tried_modules = set()
@@ -345,7 +554,9 @@ def try_install_missing_modules(self, process):
             )
             if reply == QMessageBox.Yes:
                 self.log.append("🔁 Relance de la compilation après installation des modules manquants...")
-                self.queue.insert(0, process.file_path)
+                job = getattr(process, "job", None) or BuildJob(process.file_path)
+                self.queue.requeue_front(job)
+                self._batch_total = getattr(self, "_batch_total", 0) + 1
                 self.try_start_processes()
             else:
                 self.log.append("⏹️ Compilation non relancée après installation des modules. Rapport final :")
@@ -388,35 +599,48 @@ def show_error_dialog(self, filename, filepath=None, exit_code=None, error_detai
     dlg.exec()
 
 def cancel_all_compilations(self):
+    """
+    Annule la file et arrête chaque compilation sans bloquer l'interface : TERM puis KILL de
+    tout l'arbre (process_supervisor.py). handle_finished libère chaque place à l'arrêt effectif.
+    """
     errors = []
+    stopping = 0
+    self.queue.clear()
+    closing = getattr(self, "_closing", False)
+    cancel_remediation(self)
     for process in self.processes[:]:
         try:
             if process.state() != QProcess.NotRunning:
-                process.kill()
-                if not process.waitForFinished(3000):  # Attendre 3s max
-                    errors.append(process.file_path if hasattr(process, 'file_path') else str(process))
-                    self.log.append(f"⚠️ Impossible de tuer le process {getattr(process, 'file_path', process)}")
+                if getattr(process, "job", None) is not None:
+                    process.job.state = JOB_CANCELLED
+                resume_if_paused(process)
+                if closing:
+                    # Fermeture : plus de boucle d'événements pour l'escalade TERM → KILL
+                    kill_tree_now(process)
                 else:
-                    self.log.append(f"✅ Process tué : {getattr(process, 'file_path', process)}")
+                    terminate_tree(self, process)
+                stopping += 1
             else:
                 self.log.append(f"ℹ️ Process déjà arrêté : {getattr(process, 'file_path', process)}")
+                self.processes.remove(process)
         except Exception as e:
             errors.append(str(e))
             self.log.append(f"❌ Erreur lors de l'arrêt d'un process : {e}")
-        self.processes.remove(process)
-    self.queue.clear()
-    self.current_compiling.clear()
     self.progress.setRange(0, 1)
     self.progress.setValue(0)
     self.set_controls_enabled(True)
     if errors:
         self.log.append(f"❌ Certains processus n'ont pas pu être arrêtés : {errors}")
+    elif stopping:
+        self.log.append(f"⛔ Annulation : arrêt de {stopping} compilation(s) et de leurs processus enfants...\n")
     else:
         self.log.append("⛔ Toutes les compilations ont été annulées.\n")
 
-def build_pyinstaller_command(self, file):
+def build_pyinstaller_command(self, file, options=None):
+    # options : surcharges propres au job (mode matrice) prioritaires sur les widgets
+    options = options or {}
     cmd = ["pyinstaller"]
-    if self.opt_onefile.isChecked():
+    if options.get("onefile", self.opt_onefile.isChecked()):
         cmd.append("--onefile")
     if self.opt_windowed.isChecked():
         cmd.append("--windowed")
@@ -424,16 +648,21 @@ def build_pyinstaller_command(self, file):
         cmd.append("--noconfirm")
     if self.opt_clean.isChecked():
         cmd.append("--clean")
-    if self.opt_noupx.isChecked():
+    if options.get("noupx", self.opt_noupx.isChecked()) or takes_over_upx(self, options):
+        # UPX activé dans binary_shrink.py : la compression parallèle remplace celle de PyInstaller
         cmd.append("--noupx")
     if self.opt_debug.isChecked():
         cmd.append("--debug")
+    cmd += pyinstaller_optimize_args(self, optimize_level(self, options))
     if self.icon_path:
         cmd.append(f"--icon={self.icon_path}")
     # Ajout des fichiers/dossiers de données PyInstaller
     if hasattr(self, 'pyinstaller_data'):
         for src, dest in self.pyinstaller_data:
             cmd.append(f"--add-data={src}:{dest}")
+    # Exclusions issues de l'analyse d'usage (analyze_exclusions)
+    for module in get_auto_exclusions(self, file):
+        cmd.append(f"--exclude-module={module}")
     cmd.append(file)
     
     custom_name = self.output_name_input.text().strip()
@@ -445,17 +674,24 @@ def build_pyinstaller_command(self, file):
     cmd += ["--name", output_name]
 
     # Dossier de sortie
-    output_dir = self.output_dir_input.text().strip()
+    output_dir = options.get("distpath") or self.output_dir_input.text().strip()
     if output_dir:
         cmd += ["--distpath", output_dir]
+    # Dossiers de travail isolés (mode matrice)
+    if options.get("workpath"):
+        cmd += ["--workpath", options["workpath"]]
+    if options.get("specpath"):
+        cmd += ["--specpath", options["specpath"]]
 
     return cmd
 
-def build_nuitka_command(self, file):
+def build_nuitka_command(self, file, options=None):
+    # options : surcharges propres au job (mode matrice) prioritaires sur les widgets
+    options = options or {}
     cmd = ["python3", "-m", "nuitka"]
-    if self.nuitka_onefile and self.nuitka_onefile.isChecked():
+    if options.get("onefile", bool(self.nuitka_onefile and self.nuitka_onefile.isChecked())):
         cmd.append("--onefile")
-    if self.nuitka_standalone and self.nuitka_standalone.isChecked():
+    if options.get("standalone", bool(self.nuitka_standalone and self.nuitka_standalone.isChecked())):
         cmd.append("--standalone")
     import platform
     if self.nuitka_disable_console and self.nuitka_disable_console.isChecked() and platform.system() == "Windows":
@@ -501,7 +737,9 @@ def build_nuitka_command(self, file):
             cmd.append(f"--windows-icon-from-ico={self.nuitka_icon_path}")
         elif self.icon_path:
             cmd.append(f"--windows-icon-from-ico={self.icon_path}")
-    if self.nuitka_output_dir and self.nuitka_output_dir.text().strip():
+    if options.get("output_dir"):
+        cmd.append(f"--output-dir={options['output_dir']}")
+    elif self.nuitka_output_dir and self.nuitka_output_dir.text().strip():
         cmd.append(f"--output-dir={self.nuitka_output_dir.text().strip()}")
     # Ajout des fichiers de données Nuitka
     if hasattr(self, 'nuitka_data_files'):
@@ -510,6 +748,12 @@ def build_nuitka_command(self, file):
     if hasattr(self, 'nuitka_data_dirs'):
         for src, dest in self.nuitka_data_dirs:
             cmd.append(f"--include-data-dir={src}={dest}")
+    # Exclusions issues de l'analyse d'usage (analyze_exclusions)
+    for module in get_auto_exclusions(self, file):
+        cmd.append(f"--nofollow-import-to={module}")
+    # Backend C : cœurs répartis entre compilations simultanées, compilateur/LTO mesurés (c_backend.py)
+    cmd += c_backend_args(self, file, options)
+    cmd += optimize_args("nuitka", optimize_level(self, options))
     cmd.append(file)
     return cmd
 
@@ -0,0 +1,180 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Déduplication des sorties de compilation pour PyCompiler Pro++ (étape post-build).
+Les bibliothèques d'un dossier onedir/.dist (libpython, Qt, .so de numpy...) sont indexées par
+SHA-256 dans un pool adressé par contenu : <pool>/<2 premiers caractères>/<empreinte>.
+Une bibliothèque déjà présente dans le pool est remplacée par un reflink (copie à la demande,
+btrfs/XFS) ou, à défaut, par un lien physique vers l'exemplaire du pool ; une nouvelle y est
+ajoutée par lien physique. Les doublons entre cibles et entre compilations successives n'occupent
+ainsi le disque qu'une fois. Seules les bibliothèques partagées (immuables) sont mises en commun,
+jamais les données qu'une application peut réécrire (sqlite, JSON...), et les inodes du pool sont
+en lecture seule. Une sortie liée au pool ne doit jamais être réécrite sur place (root passe
+outre la lecture seule) : les écritures de l'application dans les dossiers de sortie (extraction
+du cache d'artefacts ou d'un agent distant, safe_extract ; déplacement depuis le tmpfs) suppriment
+le fichier avant de le recréer, et PyInstaller/Nuitka vident leur dossier de sortie avant de le
+reconstruire. Le pool doit être sur le même système de fichiers que le workspace.
+"""
+import errno
+import hashlib
+import os
+import stat
+
+from .artifact_analysis import locate_artifacts
+from .build_history import history_dir, update_record
+
+POOL_DIR = "dedup_pool"
+GLOBAL_POOL = os.path.join(os.path.expanduser("~"), ".pycompiler", POOL_DIR)
+MIN_SIZE = 64 * 1024
+SHARED_SUFFIXES = (".so", ".pyd", ".dll", ".dylib")
+WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+FICLONE = 0x40049409  # ioctl Linux : reflink d'un fichier entier
+MB = 1024 * 1024
+
+
+def _same_device(a, b):
+    try:
+        return os.stat(a).st_dev == os.stat(b).st_dev
+    except OSError:
+        return False
+
+
+def pool_root(workspace_dir, configured=None):
+    """Pool configuré, sinon global (~/.pycompiler) s'il est sur le disque du workspace, sinon dans le workspace."""
+    if configured:
+        return configured
+    home = os.path.dirname(os.path.dirname(GLOBAL_POOL))
+    if _same_device(home, workspace_dir):
+        return GLOBAL_POOL
+    return os.path.join(history_dir(workspace_dir), POOL_DIR)
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_shared_library(name):
+    """Bibliothèque partagée (libpython3.x.so.1.0, _ssl.pyd, Qt6Core.dll...) : contenu immuable."""
+    lower = name.lower()
+    return lower.endswith(SHARED_SUFFIXES) or ".so." in lower
+
+
+def _reflink(src, dest):
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as s, open(dest, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        if os.path.exists(dest):
+            os.remove(dest)
+        return False
+
+
+def _replace_with(pooled, path, mode):
+    """
+    Remplace path par un reflink ou un lien physique vers pooled ; retourne la méthode utilisée.
+    Un lien physique partage l'inode du pool, donc ses droits (lecture seule).
+    """
+    tmp = path + ".dedup"
+    method = "reflink" if _reflink(pooled, tmp) else None
+    if method is None:
+        os.link(pooled, tmp)
+        method = "hardlink"
+    else:
+        os.chmod(tmp, mode)
+    os.replace(tmp, path)
+    return method
+
+
+def dedup_tree(folder, pool):
+    """Déduplique les bibliothèques de folder avec le pool ; retourne les statistiques."""
+    stats = {"files": 0, "linked": 0, "reflinked": 0, "reclaimed": 0}
+    os.makedirs(pool, exist_ok=True)
+    for root, _dirs, files in os.walk(folder):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode) or st.st_size < MIN_SIZE or not is_shared_library(name):
+                continue
+            stats["files"] += 1
+            digest = file_digest(path)
+            pooled = os.path.join(pool, digest[:2], digest)
+            try:
+                pst = os.stat(pooled)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(pooled), exist_ok=True)
+                try:
+                    os.link(path, pooled)  # EXDEV si le pool n'est pas sur le même disque
+                    os.chmod(pooled, stat.S_IMODE(st.st_mode) & ~WRITE_BITS)
+                    continue
+                except FileExistsError:
+                    # Ajouté entre-temps par une autre étape post-build : on s'y lie
+                    pst = os.stat(pooled)
+            # Droits comparés hors écriture : l'exemplaire du pool est en lecture seule
+            same_mode = stat.S_IMODE(pst.st_mode) | WRITE_BITS == stat.S_IMODE(st.st_mode) | WRITE_BITS
+            if pst.st_ino == st.st_ino or pst.st_size != st.st_size or not same_mode:
+                continue
+            try:
+                method = _replace_with(pooled, path, stat.S_IMODE(st.st_mode))
+            except FileNotFoundError:
+                continue  # retiré du pool entre-temps (nettoyage concurrent)
+            stats["reflinked" if method == "reflink" else "linked"] += 1
+            if st.st_nlink == 1:
+                stats["reclaimed"] += st.st_size
+    return stats
+
+
+def prune_pool(pool):
+    """Supprime du pool les fichiers que plus aucune sortie ne référence (un seul lien)."""
+    freed = 0
+    if not os.path.isdir(pool):
+        return freed
+    for root, _dirs, files in os.walk(pool):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+                if st.st_nlink == 1:
+                    os.chmod(path, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)  # Windows : pas de suppression en lecture seule
+                    os.remove(path)
+                    freed += st.st_size
+            except OSError:
+                continue
+    return freed
+
+
+def dedup_outputs(context, emit):
+    """Étape post-build : déduplique le dossier onedir/.dist de la compilation."""
+    settings = context.get("settings", {})
+    if not settings.get("dedup_enabled", True):
+        return
+    _exe, folder = locate_artifacts(context["build"])
+    if not folder or not os.path.isdir(folder):
+        return  # onefile : un seul fichier, rien à dédupliquer
+    pool = pool_root(context["workspace_dir"], settings.get("dedup_pool"))
+    try:
+        stats = dedup_tree(folder, pool)
+    except OSError as e:
+        if e.errno == errno.EXDEV:
+            emit(f"⚠️ Déduplication impossible : le pool {pool} n'est pas sur le disque de {folder}.")
+            return
+        raise
+    prune_pool(pool)
+    update_record(context["workspace_dir"], context["record_id"], dedup=stats)
+    if stats["linked"] or stats["reflinked"]:
+        emit(
+            f"🔗 {context['target']} : {stats['linked'] + stats['reflinked']}/{stats['files']} fichiers partagés "
+            f"({stats['reflinked']} reflinks, {stats['linked']} liens physiques), {stats['reclaimed'] / MB:.1f} Mo récupérés."
+        )
@@ -16,6 +16,8 @@ import subprocess
 import re
 
 from .dialogs import ProgressDialog
+from .output_stream import OutputStream
+from . import tracing
 
 # Liste explicite de modules de la bibliothèque standard à exclure
 EXCLUDED_STDLIB = {
@@ -91,6 +93,7 @@ def suggest_missing_dependencies(self):
         and not any(part.startswith('.') or part == '__pycache__' for part in f.split(os.sep))
     ]
     # Analyse chaque fichier Python pour détecter les imports
+    scan_span = tracing.span("deps.scan", files=len(filtered_files))
     for file in filtered_files:
         try:
             with open(file, 'r', encoding='utf-8') as f:
@@ -111,6 +114,7 @@ def suggest_missing_dependencies(self):
             modules.update([mod.split('.')[0] for mod in importlib_imports])
         except Exception as e:
             self.log.append(f"⚠️ Erreur analyse dépendances dans {file} : {e}")
+    scan_span.end(modules=len(modules))
     # Exclure les modules standards Python (stdlib)
     import sys
     import sysconfig
@@ -163,7 +167,8 @@ def suggest_missing_dependencies(self):
     not_installed = []
     for module in suggestions:
         try:
-            result = subprocess.run([pip_exe, "show", module], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            with tracing.span("deps.pip_show", track="pip", module=module):
+                result = subprocess.run([pip_exe, "show", module], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             if result.returncode != 0:
                 not_installed.append(module)
         except Exception as e:
@@ -206,23 +211,22 @@ def _install_next_dependency(self):
     process = QProcess(self)
     process.setProgram(self._dep_pip_exe)
     process.setArguments(["install", module])
-    process.readyReadStandardOutput.connect(lambda: self._on_dep_pip_output(process))
-    process.readyReadStandardError.connect(lambda: self._on_dep_pip_output(process, error=True))
+    process.trace_span = tracing.span("deps.pip_install", track="pip", module=module)
+    OutputStream(process).lines.connect(lambda channel, lines: self._on_dep_pip_output(lines, error=channel == "stderr"))
     process.finished.connect(lambda code, status: self._on_dep_pip_finished(process, code, status))
     process.start()
 
 # Affiche la sortie de pip dans la ProgressDialog et les logs
-def _on_dep_pip_output(self, process, error=False):
-    data = process.readAllStandardError().data().decode() if error else process.readAllStandardOutput().data().decode()
+def _on_dep_pip_output(self, lines, error=False):
     if hasattr(self, 'dep_progress_dialog') and self.dep_progress_dialog:
-        lines = data.strip().splitlines()
         if lines:
             self.dep_progress_dialog.set_message(lines[-1])
-    self.log.append(data)
+    self.log.append("\n".join(lines))
 
 # Callback après l'installation d'un module (pip)
 def _on_dep_pip_finished(self, process, code, status):
     module = self._dep_install_list[self._dep_install_index]
+    process.trace_span.end(exit_code=code)
     if code == 0:
         self.log.append(f"✅ {module} installé.")
     else:
@@ -0,0 +1,349 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Analyse des exclusions pour PyCompiler Pro++.
+Parcourt le graphe d'imports du workspace depuis chaque point d'entrée et les
+distributions installées dans le venv, puis propose d'exclure (--exclude-module
+pour PyInstaller, --nofollow-import-to pour Nuitka) les paquets inatteignables.
+"""
+import ast
+import glob
+import os
+import re
+import sys
+
+from PySide6.QtWidgets import QMessageBox
+
+from .dependency_analysis import _is_stdlib_module
+from .venv_fingerprint import compute_fingerprint
+
+# Modules de la bibliothèque standard souvent embarqués pour rien (tests, IDE, Tk)
+STDLIB_EXCLUSION_CANDIDATES = (
+    "tkinter", "test", "idlelib", "lib2to3", "pydoc_data", "turtle", "turtledemo",
+)
+
+# Outils de build présents dans le venv mais jamais importés par le programme
+BUILD_TOOLS = {
+    "pip", "setuptools", "wheel", "pkg-resources", "pyinstaller", "pyinstaller-hooks-contrib",
+    "nuitka", "altgraph", "macholib", "pefile", "ordered-set", "zstandard", "pyarmor",
+    "pyarmor-cli-core", "distlib", "packaging",
+}
+
+# Estimation grossière du temps de build par module Python embarqué (secondes)
+SECONDS_PER_MODULE = {"pyinstaller": 0.01, "nuitka": 0.25}
+
+
+def normalize_dist_name(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def find_site_packages(venv_dir):
+    """Retourne le dossier site-packages d'un venv (Linux/macOS ou Windows), ou None."""
+    if not venv_dir:
+        return None
+    candidates = glob.glob(os.path.join(venv_dir, "lib", "python*", "site-packages"))
+    candidates.append(os.path.join(venv_dir, "Lib", "site-packages"))
+    for c in candidates:
+        if os.path.isdir(c):
+            return c
+    return None
+
+
+def iter_distributions(site_packages):
+    """
+    Liste les distributions installées dans un site-packages.
+    Chaque entrée : {name, version, top_level, requires, size, modules}.
+    """
+    dists = []
+    for info_dir in sorted(glob.glob(os.path.join(site_packages, "*.dist-info"))):
+        meta_path = os.path.join(info_dir, "METADATA")
+        name, version, requires = None, "", []
+        try:
+            with open(meta_path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if not line.strip():
+                        break  # fin des en-têtes
+                    if line.startswith("Name:"):
+                        name = line.split(":", 1)[1].strip()
+                    elif line.startswith("Version:"):
+                        version = line.split(":", 1)[1].strip()
+                    elif line.startswith("Requires-Dist:"):
+                        req = line.split(":", 1)[1].strip()
+                        # Les dépendances optionnelles (extras) ne sont pas atteignables par défaut
+                        if ";" in req and "extra" in req.split(";", 1)[1]:
+                            continue
+                        m = re.match(r"([A-Za-z0-9][A-Za-z0-9._-]*)", req)
+                        if m:
+                            requires.append(normalize_dist_name(m.group(1)))
+        except Exception:
+            continue
+        if not name:
+            continue
+        top_level, size, modules = set(), 0, 0
+        try:
+            with open(os.path.join(info_dir, "RECORD"), "r", encoding="utf-8", errors="replace") as f:
+                for row in f:
+                    parts = row.rstrip("\n").rsplit(",", 2)
+                    if len(parts) != 3:
+                        continue
+                    path, _, fsize = parts
+                    if fsize.isdigit():
+                        size += int(fsize)
+                    if path.endswith(".py"):
+                        modules += 1
+                    first = path.replace("\\", "/").split("/", 1)[0]
+                    if first.endswith((".dist-info", ".data")) or first in ("..", "__pycache__"):
+                        continue
+                    if "/" in path.replace("\\", "/"):
+                        top_level.add(first)
+                    elif first.endswith(".py"):
+                        top_level.add(first[:-3])
+                    elif first.endswith((".so", ".pyd")):
+                        top_level.add(first.split(".", 1)[0])
+        except Exception:
+            pass
+        try:
+            with open(os.path.join(info_dir, "top_level.txt"), "r", encoding="utf-8") as f:
+                top_level.update(line.strip() for line in f if line.strip())
+        except Exception:
+            pass
+        dists.append({
+            "name": normalize_dist_name(name),
+            "version": version,
+            "top_level": sorted(t for t in top_level if t.isidentifier()),
+            "requires": requires,
+            "size": size,
+            "modules": modules,
+        })
+    return dists
+
+
+def _resolve_local_module(module, search_dirs):
+    """Retourne le chemin du fichier local correspondant à un module, ou None."""
+    rel = module.replace(".", os.sep)
+    for base in search_dirs:
+        for candidate in (os.path.join(base, rel + ".py"), os.path.join(base, rel, "__init__.py")):
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+def collect_external_imports(entry_file, workspace_dir):
+    """
+    Parcourt récursivement les modules locaux atteignables depuis entry_file et
+    retourne l'ensemble des noms de premier niveau importés hors du workspace.
+    """
+    external = set()
+    seen = set()
+    stack = [os.path.abspath(entry_file)]
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read(), filename=path)
+        except Exception:
+            continue
+        search_dirs = [os.path.dirname(path)]
+        if workspace_dir:
+            search_dirs.append(workspace_dir)
+        for node in ast.walk(tree):
+            names = []
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    # Import relatif : toujours local
+                    base = os.path.dirname(path)
+                    for _ in range(node.level - 1):
+                        base = os.path.dirname(base)
+                    target = (node.module or "").split(".") if node.module else []
+                    targets = [".".join(target + [a.name]) for a in node.names] + ([".".join(target)] if target else [])
+                    for t in targets:
+                        local = _resolve_local_module(t, [base])
+                        if local:
+                            stack.append(local)
+                    continue
+                if node.module:
+                    names = [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+            for name in names:
+                local = _resolve_local_module(name, search_dirs)
+                if local:
+                    stack.append(local)
+                elif _resolve_local_module(name.split(".")[0], search_dirs) is None:
+                    external.add(name.split(".")[0])
+    return external
+
+
+def _is_stdlib(name):
+    stdlib_names = getattr(sys, "stdlib_module_names", None)
+    if stdlib_names is not None:
+        return name in stdlib_names
+    return _is_stdlib_module(name)
+
+
+def _stdlib_module_size(name):
+    import sysconfig
+    stdlib = sysconfig.get_path("stdlib") or ""
+    total, modules = 0, 0
+    pkg = os.path.join(stdlib, name)
+    if os.path.isdir(pkg):
+        for root, _, files in os.walk(pkg):
+            for f in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, f))
+                except OSError:
+                    pass
+                if f.endswith(".py"):
+                    modules += 1
+    elif os.path.isfile(pkg + ".py"):
+        total, modules = os.path.getsize(pkg + ".py"), 1
+    return total, modules
+
+
+def propose_exclusions(entry_file, workspace_dir, venv_dir):
+    """
+    Calcule les exclusions proposées pour un point d'entrée.
+    Retourne une liste de dicts {module, size, modules, origin} triée par taille décroissante.
+    """
+    imported = collect_external_imports(entry_file, workspace_dir)
+    site_packages = find_site_packages(venv_dir)
+    dists = iter_distributions(site_packages) if site_packages else []
+    by_name = {d["name"]: d for d in dists}
+    owner = {}
+    for d in dists:
+        for top in d["top_level"]:
+            owner.setdefault(top, d["name"])
+
+    # Fermeture transitive des distributions atteignables (Requires-Dist hors extras)
+    reachable = set()
+    pending = [owner[m] for m in imported if m in owner]
+    while pending:
+        name = pending.pop()
+        if name in reachable or name not in by_name:
+            continue
+        reachable.add(name)
+        pending.extend(by_name[name]["requires"])
+
+    proposals = []
+    reachable_tops = {t for n in reachable for t in by_name[n]["top_level"]}
+    for d in dists:
+        if d["name"] in reachable or d["name"] in BUILD_TOOLS:
+            continue
+        for top in d["top_level"]:
+            if top in reachable_tops or top in imported or top.startswith("_"):
+                continue
+            proposals.append({
+                "module": top,
+                "size": d["size"] // max(1, len(d["top_level"])),
+                "modules": d["modules"] // max(1, len(d["top_level"])),
+                "origin": f"{d['name']} {d['version']}".strip(),
+            })
+    for mod in STDLIB_EXCLUSION_CANDIDATES:
+        if mod in imported or not _is_stdlib(mod):
+            continue
+        size, modules = _stdlib_module_size(mod)
+        proposals.append({"module": mod, "size": size, "modules": modules, "origin": "stdlib"})
+    proposals.sort(key=lambda p: p["size"], reverse=True)
+    return proposals
+
+
+def estimated_seconds(proposal, compiler):
+    return proposal["modules"] * SECONDS_PER_MODULE.get(compiler, 0.0)
+
+
+def reset_auto_exclusions(self, reason):
+    """Oublie les exclusions appliquées (changement de workspace ou de venv) : elles ne valent que pour l'analyse."""
+    if getattr(self, "auto_exclusions", None):
+        self.log.append(f"ℹ️ Exclusions automatiques retirées ({reason}) : relancez l'analyse des exclusions si besoin.")
+    self.auto_exclusions = {}
+    self._auto_exclusions_venv = None
+
+
+def get_auto_exclusions(self, file):
+    """Retourne la liste des modules exclus pour un fichier (chemin absolu ou relatif au workspace)."""
+    exclusions = getattr(self, "auto_exclusions", None) or {}
+    stamp = getattr(self, "_auto_exclusions_venv", None)
+    if exclusions and stamp and compute_fingerprint(stamp[0], self.workspace_dir) != stamp[1]:
+        # Paquets installés ou requirements.txt modifiés : un paquet exclu est peut-être devenu atteignable
+        reset_auto_exclusions(self, "venv modifié depuis l'analyse")
+        return []
+    if file in exclusions:
+        return exclusions[file]
+    if self.workspace_dir:
+        return exclusions.get(os.path.abspath(os.path.join(self.workspace_dir, file)), [])
+    return []
+
+
+def analyze_exclusions(self):
+    """
+    Analyse les points d'entrée à compiler, affiche les exclusions proposées
+    avec les gains estimés, et les applique aux commandes si l'utilisateur accepte.
+    """
+    if not self.workspace_dir:
+        self.log.append("❌ Aucun workspace sélectionné. Veuillez d'abord sélectionner un dossier workspace.")
+        return
+    if self.venv_path_manuel:
+        venv_dir = os.path.abspath(self.venv_path_manuel)
+    else:
+        venv_dir = os.path.abspath(os.path.join(self.workspace_dir, "venv"))
+    files = self.selected_files if self.selected_files else self.python_files
+    entries = []
+    for f in files:
+        if os.path.commonpath([os.path.abspath(f), venv_dir]) == venv_dir:
+            continue
+        try:
+            with open(f, "r", encoding="utf-8") as fh:
+                content = fh.read()
+            if "if __name__ == '__main__'" in content or 'if __name__ == "__main__"' in content:
+                entries.append(os.path.abspath(f))
+        except Exception:
+            continue
+    if not entries:
+        self.log.append("⚠️ Aucun point d'entrée à analyser.")
+        return
+
+    self.log.append("🔬 Analyse des exclusions en cours...")
+    results = {}
+    for entry in entries:
+        try:
+            results[entry] = propose_exclusions(entry, self.workspace_dir, venv_dir)
+        except Exception as e:
+            self.log.append(f"⚠️ Erreur analyse exclusions pour {entry} : {e}")
+    total_size = 0
+    lines = []
+    for entry, proposals in results.items():
+        rel = os.path.relpath(entry, self.workspace_dir)
+        if not proposals:
+            self.log.append(f"✅ {rel} : aucune exclusion proposée.")
+            continue
+        self.log.append(f"<b>{rel}</b> : {len(proposals)} exclusion(s) proposée(s)")
+        for p in proposals:
+            total_size += p["size"]
+            self.log.append(
+                f"- {p['module']} ({p['origin']}) : {p['size'] / (1024*1024):.1f} Mo, "
+                f"~{estimated_seconds(p, 'pyinstaller'):.1f} s PyInstaller / "
+                f"~{estimated_seconds(p, 'nuitka'):.1f} s Nuitka"
+            )
+        lines.append(f"{rel} : {', '.join(p['module'] for p in proposals)}")
+    if not lines:
+        return
+    reply = QMessageBox.question(
+        self,
+        self.tr("Appliquer les exclusions", "Apply exclusions"),
+        self.tr(
+            "Gain estimé : {size:.1f} Mo (estimation).\n\n{details}\n\nAppliquer ces exclusions aux prochaines compilations ?",
+            "Estimated savings: {size:.1f} MB (estimate).\n\n{details}\n\nApply these exclusions to the next builds?"
+        ).format(size=total_size / (1024*1024), details="\n".join(lines)),
+        QMessageBox.Yes | QMessageBox.No
+    )
+    if reply == QMessageBox.Yes:
+        self.auto_exclusions = {entry: [p["module"] for p in proposals] for entry, proposals in results.items() if proposals}
+        self._auto_exclusions_venv = (venv_dir, compute_fingerprint(venv_dir, self.workspace_dir))
+        self.log.append("✅ Exclusions appliquées (--exclude-module / --nofollow-import-to).")
+        self.update_command_preview()
+    else:
+        self.log.append("⏹️ Exclusions non appliquées.")
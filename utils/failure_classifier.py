@@ -0,0 +1,226 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Détection des échecs fatals pendant la compilation pour PyCompiler Pro++.
+Les lignes stdout/stderr de chaque compilation locale passent par un classifieur incrémental
+(table de motifs PyInstaller/Nuitka : module manquant, compilateur C introuvable, disque plein,
+limite de récursion). Au premier motif fatal, l'arbre de processus est arrêté : la place de
+compilation est libérée sans attendre la fin d'une compilation vouée à l'échec.
+Un « ModuleNotFoundError » n'est fatal que s'il termine le processus (dernière ligne d'erreur,
+classify_exit) : PyInstaller affiche ces tracebacks dans ses avertissements de hooks sans échouer.
+Pour un module manquant (option d'installation automatique cochée), les modules de toutes les
+compilations arrêtées sont installés en un seul « pip install », puis les jobs sont remis en tête de file.
+"""
+import html
+import os
+import platform
+import re
+from collections import namedtuple
+
+from PySide6.QtCore import QProcess, QTimer
+
+from .job_queue import JOB_CANCELLED, JOB_FAILED
+from .output_stream import OutputStream
+from .process_supervisor import terminate_tree
+from . import tracing
+
+FAILURE_MISSING_MODULE = "missing_module"
+FAILURE_NO_COMPILER = "no_compiler"
+FAILURE_DISK_FULL = "disk_full"
+FAILURE_RECURSION = "recursion_limit"
+
+Failure = namedtuple("Failure", "kind detail line")
+
+# (compilateur ou None pour tous, motif, type) ; le groupe 1 éventuel donne le détail (ex. module)
+FATAL_PATTERNS = [
+    ("nuitka", re.compile(r"FATAL:.*(?:failed to locate|cannot find) module '([\w.]+)'", re.IGNORECASE), FAILURE_MISSING_MODULE),
+    ("nuitka", re.compile(r"FATAL:.*(?:cannot locate suitable C compiler|no suitable C compiler)", re.IGNORECASE), FAILURE_NO_COMPILER),
+    (None, re.compile(r"\b(gcc|g\+\+|clang|cc|cl\.exe|ld)\b: (?:command )?not found"), FAILURE_NO_COMPILER),
+    (None, re.compile(r"No space left on device|\[Errno 28\]|There is not enough space on the disk", re.IGNORECASE), FAILURE_DISK_FULL),
+    (None, re.compile(r"RecursionError: maximum recursion depth exceeded"), FAILURE_RECURSION),
+]
+
+# Motifs reconnus après la fin du processus, sur sa dernière ligne d'erreur (traceback final)
+EXIT_PATTERNS = [
+    (re.compile(r"^(?:ModuleNotFoundError|ImportError): No module named '([\w.]+)'"), FAILURE_MISSING_MODULE),
+]
+
+FAILURE_HINTS = {
+    FAILURE_MISSING_MODULE: "module {detail} absent du venv",
+    FAILURE_NO_COMPILER: "compilateur C introuvable ; installez gcc/clang ou MinGW-w64",
+    FAILURE_DISK_FULL: "disque plein ; libérez de l'espace (dossiers build/, dist/, caches)",
+    FAILURE_RECURSION: "limite de récursion Python atteinte pendant l'analyse des imports ; augmentez sys.setrecursionlimit dans le fichier .spec",
+}
+
+# Modules dont le nom de distribution pip diffère
+PIP_NAMES = {
+    "yaml": "PyYAML", "cv2": "opencv-python", "PIL": "Pillow", "sklearn": "scikit-learn",
+    "bs4": "beautifulsoup4", "dateutil": "python-dateutil", "serial": "pyserial", "win32api": "pywin32",
+    "win32con": "pywin32", "Crypto": "pycryptodome", "dotenv": "python-dotenv", "jwt": "PyJWT", "magic": "python-magic",
+}
+
+INSTALL_DEBOUNCE_MS = 1500
+MAX_LINE = 2000
+
+
+class FailureClassifier:
+    """Examine les lignes au fil de l'eau ; s'arrête au premier échec fatal reconnu."""
+
+    def __init__(self, compiler):
+        self.patterns = [(p, kind) for c, p, kind in FATAL_PATTERNS if c is None or c == compiler]
+        self.failure = None
+
+    def feed_lines(self, lines):
+        """Retourne le Failure détecté dans ces lignes (une seule fois), sinon None."""
+        if self.failure is not None:
+            return None
+        for line in lines:
+            line = line[:MAX_LINE]
+            for pattern, kind in self.patterns:
+                match = pattern.search(line)
+                if match:
+                    detail = match.group(1) if match.groups() else ""
+                    self.failure = Failure(kind, detail, line.strip())
+                    return self.failure
+        return None
+
+
+def classify_exit(stderr_tail):
+    """Failure d'une compilation terminée en erreur, d'après la dernière ligne non vide de stderr."""
+    lines = [line.strip() for line in stderr_tail if line.strip()]
+    if not lines:
+        return None
+    for pattern, kind in EXIT_PATTERNS:
+        match = pattern.search(lines[-1][:MAX_LINE])
+        if match:
+            return Failure(kind, match.group(1), lines[-1])
+    return None
+
+
+def describe_failure(failure):
+    return FAILURE_HINTS[failure.kind].format(detail=failure.detail or "?")
+
+
+def classify_output(self, process, lines):
+    """Appelé par handle_output : arrête la compilation dès qu'un échec fatal est reconnu."""
+    classifier = getattr(process, "failure_classifier", None)
+    if classifier is None:
+        return
+    failure = classifier.feed_lines(lines)
+    if failure is None:
+        return
+    process.failure = failure
+    tracing.instant("failure.detected", track=getattr(process, "file_basename", None), kind=failure.kind, detail=failure.detail)
+    self.log.append(
+        f"<span style='color:red;'>⛔ {html.escape(process.file_basename)} : échec fatal détecté "
+        f"({html.escape(describe_failure(failure))}). Arrêt immédiat de la compilation.</span>"
+    )
+    terminate_tree(self, process)
+
+
+def remediate_failure(self, process):
+    """
+    Appelé par handle_finished pour une compilation arrêtée par le classifieur. Retourne True si
+    une remédiation est en cours (le job sera remis en file), False sinon.
+    """
+    failure = getattr(process, "failure", None)
+    job = getattr(process, "job", None)
+    if failure is None or job is None or failure.kind != FAILURE_MISSING_MODULE or not failure.detail:
+        return False
+    if not (hasattr(self, "opt_auto_install") and self.opt_auto_install.isChecked()):
+        return False
+    module = failure.detail.split(".")[0]
+    tried = job.__dict__.setdefault("installed_modules", set())
+    if module in tried:
+        self.log.append(f"❌ {job.label} : {module} toujours introuvable après installation ; job non relancé.")
+        return False
+    tried.add(module)
+    job.awaiting_install = True
+    pending = _remediation(self)
+    pending["modules"].add(module)
+    pending["jobs"].append(job)
+    self.log.append(f"📦 {job.label} : {module} sera installé puis la compilation relancée.")
+    if pending["process"] is None and not pending["scheduled"]:
+        # Les compilations qui échouent presque en même temps partagent le même pip install
+        pending["scheduled"] = True
+        QTimer.singleShot(INSTALL_DEBOUNCE_MS, lambda: _run_batched_install(self))
+    return True
+
+
+def _remediation(self):
+    if getattr(self, "_remediation", None) is None:
+        self._remediation = {"modules": set(), "jobs": [], "installing": [], "process": None, "scheduled": False}
+    return self._remediation
+
+
+def remediation_pending(self):
+    pending = getattr(self, "_remediation", None)
+    return bool(pending and (pending["jobs"] or pending["process"] is not None))
+
+
+def _run_batched_install(self):
+    pending = _remediation(self)
+    pending["scheduled"] = False
+    if pending["process"] is not None or not pending["jobs"]:
+        return
+    modules = sorted(pending["modules"])
+    jobs = list(pending["jobs"])
+    pending["modules"].clear()
+    pending["jobs"].clear()
+    venv_bin = os.path.join(self.venv_path_manuel or self.workspace_dir, "venv", "Scripts" if platform.system() == "Windows" else "bin")
+    pip_exe = os.path.join(venv_bin, "pip.exe" if platform.system() == "Windows" else "pip")
+    packages = [PIP_NAMES.get(m, m) for m in modules]
+    self.log.append(f"📦 Installation groupée : pip install {' '.join(packages)} ({len(jobs)} compilation(s) en attente)")
+    process = QProcess(self)
+    process.setProgram(pip_exe)
+    process.setArguments(["install"] + packages)
+    process.trace_span = tracing.span("remediation.pip_install", track="pip", packages=" ".join(packages), jobs=len(jobs))
+    OutputStream(process).lines.connect(lambda channel, lines: self.log.append("\n".join(lines)))
+    process.finished.connect(lambda code, status: _on_batched_install_finished(self, process, jobs, code))
+    process.errorOccurred.connect(lambda error: _on_batched_install_finished(self, process, jobs, -1) if error == QProcess.FailedToStart else None)
+    pending["process"] = process
+    pending["installing"] = jobs
+    process.start()
+
+
+def _on_batched_install_finished(self, process, jobs, code):
+    pending = _remediation(self)
+    if pending["process"] is not process:
+        return
+    pending["process"] = None
+    pending["installing"] = []
+    process.trace_span.end(exit_code=code)
+    for job in jobs:
+        job.awaiting_install = False
+    live = [job for job in jobs if job.state == JOB_FAILED]
+    if code == 0:
+        for job in live:
+            self.queue.requeue_front(job)
+            self._batch_total = getattr(self, "_batch_total", 0) + 1
+        self.log.append(f"🔁 Modules installés : {len(live)} compilation(s) relancée(s) en tête de file.")
+    else:
+        self.log.append(f"❌ Installation groupée échouée (code {code}) ; compilations non relancées.")
+        for job in live:
+            if job.options and job.options.get("matrix_run"):
+                self.on_matrix_job_done(job.options)
+    if pending["jobs"]:
+        _run_batched_install(self)
+    self.try_start_processes()
+
+
+def cancel_remediation(self):
+    """Annulation globale : les jobs en attente d'installation ne seront pas relancés."""
+    pending = getattr(self, "_remediation", None)
+    if not pending:
+        return
+    for job in pending["jobs"] + pending["installing"]:
+        job.awaiting_install = False
+        job.state = JOB_CANCELLED
+    pending["jobs"].clear()
+    pending["installing"] = []
+    pending["modules"].clear()
+    if pending["process"] is not None:
+        process = pending["process"]
+        pending["process"] = None
+        terminate_tree(self, process)
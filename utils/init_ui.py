@@ -1,27 +1,25 @@
 # SPDX-License-Identifier: GPL-3.0-only
 # Copyright (C) 2025 Samuel Amen Ague
 
-from PySide6.QtCore import QFile, Qt
-from PySide6.QtUiTools import QUiLoader
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QCheckBox, QLabel, QLineEdit, QListWidget, QProgressBar, QPushButton, QTextEdit, QVBoxLayout
 
 
 import os
 import sys
 
+from .ui_cache import load_ui
+
 
 def init_ui(self):
-        loader = QUiLoader()
-        ui_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ui", "ui_design.ui")
-        ui_file = QFile(os.path.abspath(ui_path))
-        ui_file.open(QFile.ReadOnly)
-        self.ui = loader.load(ui_file, self)
-        ui_file.close()
+        # Module précompilé par pyside6-uic si à jour (ui_cache.py), sinon QUiLoader
+        self.ui, precompiled = load_ui(self)
 
         # Supprimer tous les styles inline du .ui pour laisser le style global s'appliquer
+        # (déjà retirés du module précompilé)
         try:
             from PySide6.QtWidgets import QWidget
-            widgets = [self.ui] + self.ui.findChildren(QWidget)
+            widgets = [] if precompiled else [self.ui] + self.ui.findChildren(QWidget)
             for w in widgets:
                 if hasattr(w, 'styleSheet') and w.styleSheet():
                     w.setStyleSheet("")
@@ -63,6 +61,10 @@ def init_ui(self):
         self.label_files_section = self.ui.findChild(QLabel, "label_files_section")
         self.label_logs_section = self.ui.findChild(QLabel, "label_logs_section")
         self.file_list = self.ui.findChild(QListWidget, "file_list")
+        if self.file_list:
+            # Clic droit : priorité, pause, annulation et relance par cible
+            self.file_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+            self.file_list.customContextMenuRequested.connect(lambda pos: self.show_queue_context_menu(pos))
         # Afficher le logo dans la sidebar (chemin absolu depuis le dossier projet)
         from PySide6.QtGui import QPixmap
         project_dir = os.path.abspath(os.path.dirname(sys.argv[0]))
@@ -119,6 +121,9 @@ def init_ui(self):
         self.opt_debug = self.ui.findChild(QCheckBox, "opt_debug")
         self.opt_auto_install = self.ui.findChild(QCheckBox, "opt_auto_install")
         self.opt_silent_errors = self.ui.findChild(QCheckBox, "opt_silent_errors")
+        self.opt_benchmark = self.ui.findChild(QCheckBox, "opt_benchmark")
+        if self.opt_benchmark:
+            self.opt_benchmark.setToolTip("Après chaque compilation réussie, lancer l'exécutable plusieurs fois dans un dossier temporaire et mesurer le démarrage (froid/chaud, mémoire, extraction onefile).")
         # Onglets compilateur (correction robuste)
         from PySide6.QtWidgets import QTabWidget, QWidget
         self.compiler_tabs = self.ui.findChild(QTabWidget, "compiler_tabs")
@@ -179,6 +184,9 @@ def init_ui(self):
         self.btn_build_all = self.ui.findChild(QPushButton, "btn_build_all")
         self.btn_cancel_all = self.ui.findChild(QPushButton, "btn_cancel_all")
         self.progress = self.ui.findChild(QProgressBar, "progress")
+        # Barres de progression par cible (créées/retirées par progress_tracking.py)
+        self.target_progress_container = self.ui.findChild(QWidget, "target_progress_container")
+        self.target_progress_layout = self.target_progress_container.layout() if self.target_progress_container else None
         self.log = self.ui.findChild(QTextEdit, "log")
         self.pyinstaller_add_data = self.tab_pyinstaller.findChild(QPushButton, "pyinstaller_add_data") if self.tab_pyinstaller else None
         self.pyinstaller_data = []  # Liste des tuples (source, dest)
@@ -218,8 +226,20 @@ def init_ui(self):
         self.btn_remove_file.clicked.connect(self.remove_selected_file)
         self.opt_main_only.stateChanged.connect(self.on_main_only_changed)
         self.btn_select_icon.clicked.connect(self.select_icon)
-        self.btn_build_all.clicked.connect(self.compile_all)
-        self.btn_cancel_all.clicked.connect(self.cancel_all_compilations)
+        self.btn_build_all.clicked.connect(lambda: self.compile_all())
+        self.btn_matrix_build = self.ui.findChild(QPushButton, "btn_matrix_build")
+        if self.btn_matrix_build:
+            self.btn_matrix_build.setToolTip("Compiler une même cible avec plusieurs configurations PyInstaller/Nuitka en parallèle et comparer temps de build, taille et démarrage.")
+            self.btn_matrix_build.clicked.connect(lambda: self.start_matrix_build())
+        self.btn_build_agents = self.ui.findChild(QPushButton, "btn_build_agents")
+        if self.btn_build_agents:
+            self.btn_build_agents.setToolTip("Répartir les compilations sur des agents (build_agent.py) du réseau local ou sur un agent local.")
+            self.btn_build_agents.clicked.connect(lambda: self.configure_build_agents())
+        self.btn_artifact_cache = self.ui.findChild(QPushButton, "btn_artifact_cache")
+        if self.btn_artifact_cache:
+            self.btn_artifact_cache.setToolTip("Partager les compilations via un cache d'artefacts (serveur HTTP de l'équipe ou dossier local) : une cible déjà compilée avec les mêmes sources, commande et venv n'est pas recompilée.")
+            self.btn_artifact_cache.clicked.connect(lambda: self.configure_artifact_cache())
+        self.btn_cancel_all.clicked.connect(lambda: self.cancel_all_compilations())
         self.btn_export_config.clicked.connect(self.export_config)
         self.btn_import_config.clicked.connect(self.import_config)
         if self.btn_help:
@@ -294,7 +314,11 @@ def init_ui(self):
 
         self.btn_suggest_deps = self.ui.findChild(QPushButton, "btn_suggest_deps")
         if self.btn_suggest_deps:
-            self.btn_suggest_deps.clicked.connect(self.suggest_missing_dependencies)
+            self.btn_suggest_deps.clicked.connect(lambda: self.suggest_missing_dependencies())
+        self.btn_analyze_exclusions = self.ui.findChild(QPushButton, "btn_analyze_exclusions")
+        if self.btn_analyze_exclusions:
+            self.btn_analyze_exclusions.setToolTip("Proposer des exclusions (--exclude-module / --nofollow-import-to) pour les paquets inatteignables depuis les points d'entrée.")
+            self.btn_analyze_exclusions.clicked.connect(lambda: self.analyze_exclusions())
 
         # Mode silencieux actif par défaut
         self.opt_silent_errors.setChecked(True)
@@ -0,0 +1,365 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+File de compilation pour PyCompiler Pro++.
+BuildJob décrit une compilation (cible, options propres au job, priorité, état) et JobQueue
+remplace l'ancienne liste FIFO : ordre par priorité puis par ordre d'arrivée, annulation,
+pause et relance par cible, remise en tête sans perdre les options du job. Une cible
+critique peut préempter la compilation la moins prioritaire en cours.
+"""
+import itertools
+import os
+from collections import deque
+
+import psutil
+from PySide6.QtCore import QProcess
+from PySide6.QtWidgets import QMenu, QMessageBox
+
+from .preferences import MAX_PARALLEL
+from .progress_tracking import begin_batch_progress
+from .process_supervisor import terminate_tree
+
+PRIORITY_LOW = -10
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 10
+PRIORITY_CRITICAL = 100
+
+JOB_QUEUED = "queued"
+JOB_PAUSED = "paused"
+JOB_RUNNING = "running"
+JOB_PREEMPTED = "preempted"
+JOB_CANCELLED = "cancelled"
+JOB_FAILED = "failed"
+JOB_DONE = "done"
+
+_job_ids = itertools.count(1)
+
+
+class BuildJob:
+    def __init__(self, file, options=None, priority=PRIORITY_NORMAL):
+        self.id = next(_job_ids)
+        self.file = file
+        self.options = options
+        self.priority = priority
+        self.state = JOB_QUEUED
+        self.attempts = 1
+        self.process = None
+        self.paused = False
+        self._order = 0
+
+    @property
+    def label(self):
+        label = os.path.basename(self.file)
+        if self.options and self.options.get("label"):
+            label += f" [{self.options['label']}]"
+        return label
+
+
+class JobQueue:
+    """File triée par (priorité décroissante, ordre d'arrivée) ; les jobs en pause gardent leur place."""
+
+    def __init__(self, jobs=()):
+        self._jobs = []
+        self._order = itertools.count(1)
+        self._front = itertools.count(-1, -1)
+        self.running = {}
+        self.finished = deque(maxlen=200)
+        for job in jobs:
+            self.push(job)
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __bool__(self):
+        return bool(self._jobs)
+
+    def __iter__(self):
+        return iter(list(self._jobs))
+
+    def _sort(self):
+        self._jobs.sort(key=lambda j: (-j.priority, j._order))
+
+    def push(self, job):
+        job.state = JOB_PAUSED if job.paused else JOB_QUEUED
+        job._order = next(self._order)
+        self._jobs.append(job)
+        self._sort()
+        return job
+
+    def requeue_front(self, job):
+        """Remet un job en tête (options et priorité conservées), ex. après préemption ou installation de modules."""
+        self.running.pop(job.id, None)
+        if job.state in (JOB_FAILED, JOB_CANCELLED, JOB_DONE):
+            job.attempts += 1
+        job.process = None
+        job.state = JOB_PAUSED if job.paused else JOB_QUEUED
+        job._order = next(self._front)
+        if job not in self._jobs:
+            self._jobs.append(job)
+        self._sort()
+        return job
+
+    def reset(self, jobs=()):
+        self._jobs.clear()
+        for job in jobs:
+            self.push(job)
+
+    def clear(self):
+        for job in self._jobs:
+            job.state = JOB_CANCELLED
+        self._jobs.clear()
+
+    def has_runnable(self):
+        return any(not j.paused for j in self._jobs)
+
+    def peek_next(self):
+        for job in self._jobs:
+            if not job.paused:
+                return job
+        return None
+
+    def pop_next(self):
+        job = self.peek_next()
+        if job is not None:
+            self._jobs.remove(job)
+        return job
+
+    def mark_running(self, job, process):
+        job.state = JOB_RUNNING
+        job.process = process
+        self.running[job.id] = job
+
+    def mark_finished(self, job, state):
+        self.running.pop(job.id, None)
+        job.state = state
+        job.process = None
+        self.finished.append(job)
+
+    def take(self, job):
+        """Retire un job de la file sans changer son état ; False s'il n'y est plus."""
+        if job in self._jobs:
+            self._jobs.remove(job)
+            return True
+        return False
+
+    def remove(self, job):
+        if job in self._jobs:
+            self._jobs.remove(job)
+            job.state = JOB_CANCELLED
+            self.finished.append(job)
+            return True
+        return False
+
+    def set_priority(self, job, priority):
+        job.priority = priority
+        self._sort()
+
+    def find(self, file):
+        """Job le plus pertinent pour une cible : en file, en cours, sinon le dernier terminé."""
+        for job in self._jobs:
+            if job.file == file:
+                return job
+        for job in self.running.values():
+            if job.file == file:
+                return job
+        for job in reversed(self.finished):
+            if job.file == file:
+                return job
+        return None
+
+
+def _process_tree(process):
+    try:
+        root = psutil.Process(int(process.processId()))
+        return [root] + root.children(recursive=True)
+    except Exception:
+        return []
+
+
+def _target_at(self, pos):
+    item = self.file_list.itemAt(pos)
+    if item is None:
+        return None
+    rel_path = item.text()
+    return os.path.join(self.workspace_dir, rel_path) if self.workspace_dir else rel_path
+
+
+def submit_jobs(self, jobs, front=False):
+    """Ajoute des jobs à la file (démarre un lot si rien ne tourne) et préempte si nécessaire."""
+    idle = not self.processes and not self.queue
+    if idle:
+        self.current_compiling.clear()
+        begin_batch_progress(self, len(jobs))
+        if hasattr(self, 'compiler_tabs') and self.compiler_tabs:
+            self.compiler_tabs.setEnabled(False)
+        self.set_controls_enabled(False)
+    else:
+        self._batch_total = getattr(self, "_batch_total", 0) + len(jobs)
+    for job in jobs:
+        if front:
+            self.queue.requeue_front(job)
+        else:
+            self.queue.push(job)
+        preempt_for(self, job)
+    if idle:
+        self.start_batch()
+    else:
+        self.try_start_processes()
+
+
+def preempt_for(self, job):
+    """Si toutes les places sont prises, interrompt la compilation moins prioritaire la plus récente."""
+    if job.priority < PRIORITY_CRITICAL:
+        return False
+    from .remote_build import free_build_agent  # QtNetwork : chargé seulement au premier lot
+    if sum(1 for p in self.processes if not getattr(p, "remote", False)) < MAX_PARALLEL or free_build_agent(self):
+        return False
+    candidates = [
+        p for p in self.processes
+        if getattr(p, "job", None) and p.job.priority < job.priority and p.job.state == JOB_RUNNING
+    ]
+    if not candidates:
+        return False
+    victim = max(candidates, key=lambda p: getattr(p, "_start_time", 0))
+    victim.job.state = JOB_PREEMPTED
+    self.log.append(f"⏭️ {victim.job.label} interrompu pour laisser passer {job.label} (priorité critique).")
+    terminate_tree(self, victim)
+    return True
+
+
+def prioritize_target(self, file, priority=PRIORITY_CRITICAL):
+    """Passe une cible en tête de file (ou la met en file) avec la priorité donnée."""
+    job = self.queue.find(file)
+    if job is not None and job in self.queue:
+        self.queue.set_priority(job, priority)
+        self.queue.requeue_front(job)
+        self.log.append(f"⏫ {job.label} passe en tête de file.")
+        preempt_for(self, job)
+        self.try_start_processes()
+        return
+    if job is not None and job.state == JOB_RUNNING:
+        self.log.append(f"ℹ️ {job.label} est déjà en cours de compilation.")
+        return
+    if not self.processes and not self.queue:
+        from .pyarmor_api import PyArmorAPI
+        if not PyArmorAPI(parent_widget=self).pre_compilation_obfuscation(self.workspace_dir):
+            self.log.append("⛔ Compilation annulée : PyArmor requis pour la protection du code.\n")
+            return
+    new_job = BuildJob(file, dict(job.options) if job is not None and job.options else None, priority)
+    self.log.append(f"⏫ {new_job.label} ajouté en tête de file (priorité {priority}).")
+    submit_jobs(self, [new_job], front=True)
+
+
+def cancel_target(self, file):
+    """Annule uniquement la compilation (en file ou en cours) d'une cible."""
+    job = self.queue.find(file)
+    if job is None or job.state not in (JOB_QUEUED, JOB_PAUSED, JOB_RUNNING):
+        self.log.append(f"ℹ️ Aucune compilation active pour {os.path.basename(file)}.")
+        return
+    if job in self.queue:
+        self.queue.remove(job)
+        self._batch_done = getattr(self, "_batch_done", 0) + 1
+        self.log.append(f"⛔ {job.label} retiré de la file.")
+        self.try_start_processes()
+        return
+    job.state = JOB_CANCELLED
+    if job.paused:
+        for proc in _process_tree(job.process):
+            try:
+                proc.resume()
+            except Exception:
+                pass
+    self.log.append(f"⛔ Annulation de {job.label}...")
+    terminate_tree(self, job.process)
+
+
+def retry_target(self, file):
+    """Relance une cible échouée ou annulée avec les mêmes options."""
+    job = self.queue.find(file)
+    if job is None or job.state not in (JOB_FAILED, JOB_CANCELLED):
+        self.log.append(f"ℹ️ Rien à relancer pour {os.path.basename(file)}.")
+        return
+    job.paused = False
+    self.log.append(f"🔁 Relance de {job.label} (tentative {job.attempts + 1}).")
+    submit_jobs(self, [job], front=True)
+
+
+def _is_remote(job):
+    return job.state == JOB_RUNNING and getattr(job.process, "remote", False)
+
+
+def toggle_pause_target(self, file):
+    """
+    Met en pause / reprend une cible. En file, le job garde sa place ; en cours, le processus
+    (et ses enfants) est suspendu et conserve sa place parmi les compilations parallèles.
+    Une compilation en cours sur un agent distant ne peut pas être suspendue.
+    """
+    job = self.queue.find(file)
+    if job is None or job.state not in (JOB_QUEUED, JOB_PAUSED, JOB_RUNNING):
+        return
+    if _is_remote(job):
+        self.log.append(f"ℹ️ {job.label} est compilé sur un agent distant : pause impossible (annulation possible).")
+        return
+    job.paused = not job.paused
+    if job.state == JOB_RUNNING:
+        for proc in _process_tree(job.process):
+            try:
+                proc.suspend() if job.paused else proc.resume()
+            except Exception:
+                pass
+    else:
+        job.state = JOB_PAUSED if job.paused else JOB_QUEUED
+    self.log.append(f"{'⏸️' if job.paused else '▶️'} {job.label} {'en pause' if job.paused else 'repris'}.")
+    if not job.paused:
+        self.try_start_processes()
+
+
+def show_queue_context_menu(self, pos):
+    """Menu contextuel de la liste des fichiers : priorité, pause, annulation, relance par cible."""
+    file = _target_at(self, pos)
+    if file is None:
+        return
+    job = self.queue.find(file)
+    state = job.state if job is not None else None
+    menu = QMenu(self)
+    act_first = menu.addAction(self.tr("Compiler en priorité", "Build first"))
+    act_pause = act_cancel = act_retry = None
+    if state in (JOB_QUEUED, JOB_PAUSED, JOB_RUNNING):
+        act_pause = menu.addAction(self.tr("Reprendre", "Resume") if job.paused else self.tr("Mettre en pause", "Pause"))
+        # Agent distant : aucun processus local à suspendre (le protocole n'a pas de pause)
+        act_pause.setEnabled(not _is_remote(job))
+        act_cancel = menu.addAction(self.tr("Annuler cette cible", "Cancel this target"))
+    if state in (JOB_FAILED, JOB_CANCELLED):
+        act_retry = menu.addAction(self.tr("Relancer", "Retry"))
+    menu.addSeparator()
+    act_c_backend = menu.addAction(self.tr("Mesurer le backend C (Nuitka)", "Benchmark the C backend (Nuitka)"))
+    act_c_backend.setEnabled(not self.processes and not self.queue)
+    chosen = menu.exec(self.file_list.mapToGlobal(pos))
+    if chosen is None:
+        return
+    if chosen == act_first:
+        if not self.workspace_dir:
+            QMessageBox.warning(self, self.tr("Attention", "Warning"), self.tr("Aucun workspace sélectionné.", "No workspace selected."))
+            return
+        prioritize_target(self, file)
+    elif chosen == act_pause:
+        toggle_pause_target(self, file)
+    elif chosen == act_cancel:
+        cancel_target(self, file)
+    elif chosen == act_retry:
+        retry_target(self, file)
+    elif chosen == act_c_backend:
+        self.benchmark_c_backend(file)
+
+
+def resume_if_paused(process):
+    """Reprend un processus suspendu avant de l'arrêter (annulation globale, fermeture)."""
+    job = getattr(process, "job", None)
+    if job is not None and job.paused and process.state() != QProcess.NotRunning:
+        for proc in _process_tree(process):
+            try:
+                proc.resume()
+            except Exception:
+                pass
+        job.paused = False
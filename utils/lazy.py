@@ -0,0 +1,33 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Import différé des sous-systèmes de PyCompiler Pro++.
+Les méthodes de PyInstallerWorkspaceGUI définies dans d'autres modules (compilation, cache,
+agents, analyse...) ne sont importées qu'au premier accès : le démarrage ne charge que
+l'interface et les préférences.
+"""
+import importlib
+
+
+class LazyMethod:
+    """Attribut de classe qui importe module.name au premier accès puis se remplace par la fonction."""
+
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+
+    def resolve(self):
+        return getattr(importlib.import_module(self.module, __package__), self.name)
+
+    def __get__(self, obj, owner):
+        func = self.resolve()
+        setattr(owner, self.name, func)
+        return func if obj is None else func.__get__(obj, owner)
+
+
+def install_lazy_methods(cls, table):
+    """table : {".module": ("methode", ...)} ; chaque méthode devient un LazyMethod sur cls."""
+    for module, names in table.items():
+        for name in names:
+            setattr(cls, name, LazyMethod(module, name))
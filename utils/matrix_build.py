@@ -0,0 +1,200 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Mode matrice pour PyCompiler Pro++.
+Compile une même cible avec plusieurs configurations (PyInstaller onefile/onedir avec ou sans
+UPX, Nuitka standalone/onefile, ...), chacune dans ses propres dossiers de sortie, puis produit
+un tableau comparatif : temps de build, taille des artefacts, démarrage.
+Pour que les mesures soient comparables, les configurations sont compilées une à une (option
+« exclusive », comme la mesure du backend C) et les démarrages ne sont mesurés qu'une fois la
+dernière compilation et ses étapes post-build terminées, l'un après l'autre.
+"""
+import os
+import time
+
+from PySide6.QtCore import QThread, Signal
+from PySide6.QtWidgets import QInputDialog, QMessageBox
+
+from .artifact_analysis import locate_artifacts
+from .benchmark import benchmark_executable
+from .build_history import history_dir, load_history, update_record
+from .job_queue import BuildJob
+from .progress_tracking import begin_batch_progress
+
+# Configurations par défaut (surchargeables via la préférence "matrix_configs")
+DEFAULT_MATRIX = [
+    {"label": "pyinstaller-onefile", "compiler": "pyinstaller", "onefile": True, "noupx": False},
+    {"label": "pyinstaller-onefile-noupx", "compiler": "pyinstaller", "onefile": True, "noupx": True},
+    {"label": "pyinstaller-onedir", "compiler": "pyinstaller", "onefile": False, "noupx": False},
+    {"label": "pyinstaller-onedir-noupx", "compiler": "pyinstaller", "onefile": False, "noupx": True},
+    {"label": "nuitka-standalone", "compiler": "nuitka", "standalone": True, "onefile": False},
+    {"label": "nuitka-onefile", "compiler": "nuitka", "onefile": True, "standalone": False},
+]
+
+
+def matrix_job_options(run_dir, config, run_id):
+    """Options d'un job de la matrice, avec des dossiers de sortie isolés par configuration."""
+    options = dict(config)
+    base = os.path.join(run_dir, config["label"])
+    if config["compiler"] == "nuitka":
+        options["output_dir"] = base
+    else:
+        options["distpath"] = os.path.join(base, "dist")
+        options["workpath"] = os.path.join(base, "build")
+        options["specpath"] = base
+    options["matrix_run"] = run_id
+    # Seule en cours : temps de build non faussés par les autres configurations
+    options["exclusive"] = True
+    return options
+
+
+def start_matrix_build(self):
+    """Demande la cible puis met en file toutes les configurations de la matrice."""
+    if self.processes:
+        QMessageBox.warning(self, self.tr("Attention", "Warning"), self.tr("Des compilations sont déjà en cours.", "Builds are already running."))
+        return
+    if not self.workspace_dir:
+        self.log.append("❌ Aucun workspace sélectionné.")
+        return
+    candidates = self.selected_files or self.python_files
+    if not candidates:
+        self.log.append("❌ Aucun fichier à compiler.\n")
+        return
+    if len(candidates) == 1:
+        target = candidates[0]
+    else:
+        rel = [os.path.relpath(f, self.workspace_dir) for f in candidates]
+        choice, ok = QInputDialog.getItem(
+            self, self.tr("Cible de la matrice", "Matrix target"),
+            self.tr("Script à compiler avec toutes les configurations :", "Script to build with every configuration:"),
+            rel, 0, False,
+        )
+        if not ok:
+            return
+        target = candidates[rel.index(choice)]
+    queue_matrix(self, target, getattr(self, "matrix_configs", None) or DEFAULT_MATRIX)
+
+
+def queue_matrix(self, target, configs, on_complete=None, title="Matrice de compilation", benchmark=True):
+    """
+    Met en file une configuration par job pour target ; on_complete(run) est appelé après le rapport.
+    benchmark : mesurer le démarrage de chaque configuration une fois toutes compilées.
+    """
+    run_id = time.strftime("%Y%m%d-%H%M%S")
+    run_dir = os.path.join(history_dir(self.workspace_dir), "matrix", run_id)
+    self._matrix_run = {
+        "id": run_id,
+        "dir": run_dir,
+        "target": os.path.relpath(target, self.workspace_dir),
+        "labels": [c["label"] for c in configs],
+        "pending": {c["label"] for c in configs},
+        "on_complete": on_complete,
+        "benchmark": benchmark,
+        "builds": {},  # label -> description du build (describe_build)
+    }
+    self.queue.reset(BuildJob(target, matrix_job_options(run_dir, c, run_id)) for c in configs)
+    self.current_compiling.clear()
+    self.processes.clear()
+    begin_batch_progress(self, len(self.queue))
+    self.log.append(f"🧪 {title} démarrée pour {self._matrix_run['target']} ({len(configs)} configurations)...\n")
+    if hasattr(self, 'compiler_tabs') and self.compiler_tabs:
+        self.compiler_tabs.setEnabled(False)
+    self.set_controls_enabled(False)
+    self.start_batch()
+
+
+def on_matrix_job_done(self, build_info):
+    """Appelé quand un job de la matrice est terminé (post-build compris)."""
+    run = getattr(self, "_matrix_run", None)
+    if not run or build_info.get("matrix_run") != run["id"]:
+        return
+    run["pending"].discard(build_info.get("label"))
+    if build_info.get("name"):
+        run["builds"][build_info.get("label")] = build_info
+    if run["pending"]:
+        return
+    if not run["benchmark"] or not run["builds"]:
+        _finish_matrix(self, run)
+        return
+    from .post_build import post_build_settings
+    worker = MatrixBenchmarkWorker(self.workspace_dir, run, post_build_settings(self), self)
+    self._matrix_benchmark_worker = worker
+    worker.message.connect(self.log.append)
+    worker.finished.connect(lambda: _finish_matrix(self, run))
+    worker.start()
+
+
+def _finish_matrix(self, run):
+    self._matrix_benchmark_worker = None
+    self.log.append(matrix_report(self.workspace_dir, run))
+    self._matrix_run = None
+    if run.get("on_complete"):
+        run["on_complete"](run)
+
+
+class MatrixBenchmarkWorker(QThread):
+    """Mesure le démarrage de chaque configuration compilée avec succès, l'une après l'autre."""
+
+    message = Signal(str)
+
+    def __init__(self, workspace_dir, run, settings, parent=None):
+        super().__init__(parent)
+        self.workspace_dir = workspace_dir
+        self.run_info = run
+        self.settings = settings
+
+    def run(self):
+        records = {
+            r.get("label"): r for r in load_history(self.workspace_dir)
+            if r.get("matrix_run") == self.run_info["id"] and r.get("exit_code") == 0
+        }
+        runs = int(self.settings.get("benchmark_runs", 5))
+        smoke = self.settings.get("benchmark_smoke_arg", "")
+        timeout = float(self.settings.get("benchmark_timeout", 30))
+        for label in self.run_info["labels"]:
+            build, record = self.run_info["builds"].get(label), records.get(label)
+            if not build or not record:
+                continue
+            exe, _ = locate_artifacts(build)
+            if not os.path.isfile(exe):
+                continue
+            self.message.emit(f"⏱️ Matrice : démarrage de {label} ({runs} lancements)...")
+            try:
+                result = benchmark_executable(exe, runs, smoke.split() if smoke else [], timeout)
+                update_record(self.workspace_dir, record["id"], startup=result)
+            except Exception as e:
+                self.message.emit(f"⚠️ Benchmark de {label} en échec : {e}")
+
+
+def matrix_report(workspace_dir, run):
+    """Construit le tableau comparatif (HTML pour les logs, Markdown sur disque)."""
+    records = {r.get("label"): r for r in load_history(workspace_dir) if r.get("matrix_run") == run["id"]}
+    header = ["Configuration", "Build (s)", "Taille (Mo)", "Démarrage froid (ms)", "Démarrage chaud (ms)", "RSS (Mo)"]
+    rows = []
+    for label in run["labels"]:
+        r = records.get(label, {})
+        size = r.get("size", {}).get("total")
+        startup = r.get("startup", {})
+        failed = r.get("exit_code") not in (0, None)
+        rows.append([
+            label + (" (échec)" if failed else ""),
+            f"{r['duration']:.1f}" if r.get("duration") else "-",
+            f"{size / 1048576:.1f}" if size else "-",
+            f"{startup['cold_ms']:.0f}" if startup.get("cold_ms") is not None else "-",
+            f"{startup['warm_ms']:.0f}" if startup.get("warm_ms") is not None else "-",
+            f"{startup['peak_rss_mb']:.1f}" if startup.get("peak_rss_mb") else "-",
+        ])
+    md = [f"# Matrice {run['id']} — {run['target']}", "", "| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    md += ["| " + " | ".join(row) + " |" for row in rows]
+    try:
+        os.makedirs(run["dir"], exist_ok=True)
+        with open(os.path.join(run["dir"], "report.md"), "w", encoding="utf-8") as f:
+            f.write("\n".join(md) + "\n")
+    except Exception:
+        pass
+    html = "<b>🧪 Comparaison de la matrice :</b><table border='1' cellpadding='3'>"
+    html += "<tr>" + "".join(f"<th>{h}</th>" for h in header) + "</tr>"
+    html += "".join("<tr>" + "".join(f"<td>{c}</td>" for c in row) + "</tr>" for row in rows)
+    html += f"</table>Rapport : {os.path.join(run['dir'], 'report.md')}\n"
+    return html
@@ -0,0 +1,139 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Analyse incrémentale de la sortie des compilateurs pour PyCompiler Pro++.
+Les parseurs reçoivent les lignes déjà découpées par OutputStream (output_stream.py) et en
+déduisent la phase en cours, le nombre de modules traités, l'avancement de la compilation C
+et une fraction globale.
+"""
+import re
+
+
+class CompilerOutputParser:
+    """Base commune : état de progression."""
+
+    # (motif, phase, fraction globale atteinte au début de la phase)
+    PHASES = []
+
+    def __init__(self):
+        self.phase = None
+        self.fraction = 0.0
+        self.done_count = None
+        self.total_count = None
+        self.finished = False
+        self.finished_line = None
+
+    def feed_lines(self, lines):
+        """Traite des lignes déjà découpées (OutputStream)."""
+        for line in lines:
+            if line.strip():
+                self.feed_line(line)
+
+    def feed_line(self, line):
+        for pattern, phase, fraction in self.PHASES:
+            if pattern.search(line):
+                self._enter_phase(phase, fraction)
+                break
+        self.parse_counts(line)
+
+    def _enter_phase(self, phase, fraction):
+        if phase != self.phase:
+            self.phase = phase
+            self.done_count = self.total_count = None
+        self.fraction = max(self.fraction, fraction)
+
+    def parse_counts(self, line):
+        pass
+
+    def mark_finished(self, line):
+        self.finished = True
+        self.finished_line = line
+        self.phase = "done"
+        self.fraction = 1.0
+
+
+class NuitkaOutputParser(CompilerOutputParser):
+    PHASES = [
+        (re.compile(r"Starting Python compilation"), "python", 0.02),
+        (re.compile(r"Completed Python level compilation"), "codegen", 0.45),
+        (re.compile(r"Generating source code for C backend"), "codegen", 0.45),
+        (re.compile(r"Running data composer"), "codegen", 0.48),
+        (re.compile(r"Running C compilation via Scons"), "c_compile", 0.50),
+        (re.compile(r"Backend C linking"), "link", 0.88),
+        (re.compile(r"Nuitka-Postprocessing|Copying .*(DLL|dependenc)|Including .* extension module"), "postprocess", 0.90),
+        (re.compile(r"Nuitka-Onefile|Creating single file"), "onefile", 0.94),
+    ]
+    # Bornes de fraction globale couvertes par les compteurs de chaque phase
+    RANGES = {"python": (0.02, 0.45), "c_compile": (0.50, 0.88)}
+    PASS_RE = re.compile(r"PASS (\d+):.*?(\d+)/(\d+)")
+    C_RE = re.compile(r"Backend C compilation.*?(\d+)/(\d+)")
+    DONE_RE = re.compile(r"Successfully created")
+
+    def feed_line(self, line):
+        if self.DONE_RE.search(line):
+            self.mark_finished(line)
+            return
+        super().feed_line(line)
+
+    def parse_counts(self, line):
+        m = self.PASS_RE.search(line)
+        if m:
+            self._enter_phase("python", self.RANGES["python"][0])
+            self._set_counts("python", int(m.group(2)), int(m.group(3)))
+            return
+        m = self.C_RE.search(line)
+        if m:
+            self._enter_phase("c_compile", self.RANGES["c_compile"][0])
+            self._set_counts("c_compile", int(m.group(1)), int(m.group(2)))
+
+    def _set_counts(self, phase, done, total):
+        self.done_count, self.total_count = done, total
+        if total:
+            lo, hi = self.RANGES[phase]
+            self.fraction = max(self.fraction, lo + (hi - lo) * min(1.0, done / total))
+
+
+class PyInstallerOutputParser(CompilerOutputParser):
+    PHASES = [
+        (re.compile(r"INFO: PyInstaller:"), "start", 0.02),
+        (re.compile(r"INFO: (Analyzing|Initializing module dependency graph)"), "analysis", 0.05),
+        (re.compile(r"INFO: (Processing module hooks|Loading module hook)"), "hooks", 0.30),
+        (re.compile(r"INFO: (Analyzing run-time hooks|Looking for ctypes DLLs)"), "runtime_hooks", 0.45),
+        (re.compile(r"INFO: Looking for dynamic libraries"), "binaries", 0.55),
+        (re.compile(r"INFO: Building PYZ"), "pyz", 0.70),
+        (re.compile(r"INFO: Building PKG"), "pkg", 0.80),
+        (re.compile(r"INFO: Building EXE"), "exe", 0.88),
+        (re.compile(r"INFO: Building COLLECT"), "collect", 0.93),
+    ]
+    DONE_RE = re.compile(r"Build complete!")
+    HOOK_RE = re.compile(r"INFO: Loading module hook")
+
+    def feed_line(self, line):
+        if self.DONE_RE.search(line):
+            self.mark_finished(line)
+            return
+        super().feed_line(line)
+
+    def parse_counts(self, line):
+        # PyInstaller n'annonce pas de total : on compte les hooks chargés
+        if self.HOOK_RE.search(line):
+            self.done_count = (self.done_count or 0) + 1
+
+
+def create_parser(compiler):
+    return NuitkaOutputParser() if compiler == "nuitka" else PyInstallerOutputParser()
+
+
+def estimate_eta(elapsed, fraction, historical=None):
+    """
+    Temps restant estimé (secondes) : extrapolation de l'avancement, pondérée par la durée
+    moyenne des compilations précédentes de la même cible tant que l'avancement est faible.
+    """
+    by_progress = elapsed * (1 - fraction) / fraction if fraction >= 0.05 else None
+    by_history = max(0.0, historical - elapsed) if historical else None
+    if by_progress is None:
+        return by_history
+    if by_history is None:
+        return by_progress
+    return fraction * by_progress + (1 - fraction) * by_history
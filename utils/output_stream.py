@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Flux de sortie des processus pour PyCompiler Pro++.
+OutputStream lit stdout/stderr d'un QProcess (ou des octets fournis via feed), découpe en
+lignes au niveau des octets puis décode incrémentalement en UTF-8 : un caractère multi-octets
+coupé entre deux lectures n'est plus une erreur. Chaque lecture produit un seul événement
+`lines(canal, [lignes])` consommé par les logs, le parseur de progression et la détection
+d'erreurs ; les dernières lignes de chaque canal restent disponibles via tail().
+"""
+import codecs
+import html
+import re
+from collections import deque
+
+from PySide6.QtCore import QObject, Signal
+
+LINE_SPLIT_RE = re.compile(r"\r\n|\r|\n")
+CHANNELS = ("stdout", "stderr")
+
+
+class OutputStream(QObject):
+    lines = Signal(str, list)
+
+    def __init__(self, process=None, parent=None, tail_size=400):
+        super().__init__(parent if parent is not None else process)
+        self._buffers = {c: bytearray() for c in CHANNELS}
+        self._decoders = {c: codecs.getincrementaldecoder("utf-8")(errors="replace") for c in CHANNELS}
+        self._tails = {c: deque(maxlen=tail_size) for c in CHANNELS}
+        self._pending_cr = {c: False for c in CHANNELS}
+        self.process = process
+        if process is not None:
+            process.readyReadStandardOutput.connect(lambda: self.feed("stdout", process.readAllStandardOutput().data()))
+            process.readyReadStandardError.connect(lambda: self.feed("stderr", process.readAllStandardError().data()))
+            # Connecté avant les gestionnaires de fin de l'appelant : la dernière ligne sans saut
+            # de ligne (pip, venv) est émise avant eux ; un flush explicite ensuite est sans effet
+            process.finished.connect(lambda *args: self.flush())
+
+    def feed(self, channel, data):
+        """Ajoute des octets bruts et émet les lignes complètes."""
+        if not data:
+            return
+        buf = self._buffers[channel]
+        buf += data
+        # Les octets '\n' et '\r' n'apparaissent jamais dans une séquence UTF-8 multi-octets :
+        # on peut couper au dernier saut de ligne avant de décoder.
+        cut = max(buf.rfind(b"\n"), buf.rfind(b"\r"))
+        if cut < 0:
+            return
+        with memoryview(buf) as view:
+            text = self._decoders[channel].decode(view[:cut + 1])
+        del buf[:cut + 1]
+        self._emit(channel, text)
+
+    def flush(self):
+        """Émet les lignes incomplètes restantes (fin du processus)."""
+        if self.process is not None:
+            self.feed("stdout", self.process.readAllStandardOutput().data())
+            self.feed("stderr", self.process.readAllStandardError().data())
+        for channel in CHANNELS:
+            buf = self._buffers[channel]
+            text = self._decoders[channel].decode(bytes(buf), final=True)
+            buf.clear()
+            if text:
+                self._emit(channel, text + "\n")
+
+    def _emit(self, channel, text):
+        # '\r\n' coupé entre deux lectures : ignorer la ligne vide fantôme
+        if self._pending_cr[channel] and text.startswith("\n"):
+            text = text[1:]
+        self._pending_cr[channel] = text.endswith("\r")
+        lines = LINE_SPLIT_RE.split(text)
+        lines.pop()  # le texte se termine par un saut de ligne
+        if not lines:
+            return
+        self._tails[channel].extend(lines)
+        self.lines.emit(channel, lines)
+
+    def tail(self, channel="stderr", count=None):
+        """Dernières lignes reçues sur un canal, jointes par des sauts de ligne."""
+        lines = list(self._tails[channel])
+        if count:
+            lines = lines[-count:]
+        return "\n".join(lines)
+
+
+def lines_to_html(lines, color=None):
+    """Convertit des lignes en un seul bloc HTML échappé pour QTextEdit.append."""
+    body = "<br>".join(html.escape(line) for line in lines)
+    if color:
+        return f"<span style='color:{color};'>{body}</span>"
+    return body
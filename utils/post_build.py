@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Étapes post-build pour PyCompiler Pro++.
+Après une compilation réussie, les étapes enregistrées dans POST_BUILD_STAGES sont
+exécutées dans l'ordre, dans un thread séparé pour ne pas bloquer l'interface.
+Chaque étape reçoit un contexte (workspace, cible, description du build, id d'historique)
+et une fonction emit(message) pour écrire dans les logs.
+"""
+import os
+
+from PySide6.QtCore import QThread, Signal
+
+from .artifact_analysis import analyze_artifact_sizes
+from .artifact_store import record_artifacts, start_artifact_gc
+from .binary_shrink import report_shrink_tradeoff, shrink_binaries, shrink_settings
+from .dedup import dedup_outputs
+from .resource_policy import policy_for
+from .benchmark import benchmark_startup
+from . import tracing
+
+# Étapes exécutées dans l'ordre après chaque compilation réussie
+POST_BUILD_STAGES = [
+    shrink_binaries,
+    analyze_artifact_sizes,
+    benchmark_startup,
+    report_shrink_tradeoff,
+    dedup_outputs,
+    record_artifacts,
+]
+
+
+class PostBuildWorker(QThread):
+    message = Signal(str)
+
+    def __init__(self, context, stages, parent=None):
+        super().__init__(parent)
+        self.context = context
+        self.stages = list(stages)
+
+    def run(self):
+        track = self.context["build"].get("label") or self.context["target"]
+        for stage in self.stages:
+            try:
+                with tracing.span(f"post_build.{stage.__name__}", track=track):
+                    stage(self.context, self.message.emit)
+            except Exception as e:
+                self.message.emit(f"⚠️ Étape post-build {stage.__name__} en échec : {e}")
+
+
+def post_build_settings(self):
+    """Réglages des étapes post-build, lus depuis l'interface et les préférences."""
+    opt_benchmark = getattr(self, "opt_benchmark", None)
+    return {
+        "benchmark_enabled": bool(opt_benchmark and opt_benchmark.isChecked()),
+        "benchmark_runs": getattr(self, "benchmark_runs", 5),
+        "benchmark_smoke_arg": getattr(self, "benchmark_smoke_arg", ""),
+        "benchmark_timeout": getattr(self, "benchmark_timeout", 30),
+        "dedup_enabled": getattr(self, "dedup_enabled", True),
+        "dedup_pool": getattr(self, "dedup_pool", ""),
+        "shrink": shrink_settings(self),
+        "resource_policy": policy_for(self),
+    }
+
+
+def run_post_build_stages(self, process, record_id):
+    """Lance les étapes post-build pour un process de compilation terminé avec succès."""
+    build = getattr(process, "build_info", None)
+    if not build or not self.workspace_dir:
+        return None
+    context = {
+        "workspace_dir": self.workspace_dir,
+        "target": os.path.relpath(process.file_path, self.workspace_dir),
+        "file": process.file_path,
+        "build": build,
+        "record_id": record_id,
+        "settings": post_build_settings(self),
+    }
+    if build.get("matrix_run"):
+        # Démarrages mesurés par matrix_build.py après la dernière configuration, hors charge
+        context["settings"]["benchmark_enabled"] = False
+    worker = PostBuildWorker(context, POST_BUILD_STAGES, self)
+    worker.message.connect(self.log.append)
+    if not hasattr(self, "_post_build_workers"):
+        self._post_build_workers = []
+    self._post_build_workers.append(worker)
+    worker.finished.connect(lambda w=worker: _on_post_build_finished(self, w))
+    worker.start()
+    return worker
+
+
+def _on_post_build_finished(self, worker):
+    if worker in self._post_build_workers:
+        self._post_build_workers.remove(worker)
+    if not self._post_build_workers and getattr(self, "_artifact_gc_pending", False):
+        start_artifact_gc(self)
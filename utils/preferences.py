@@ -29,6 +29,35 @@ def load_preferences(self):
         # self.custom_args_text supprimé (widget supprimé)
         self.output_dir = prefs.get("output_dir", "")
         self.language = prefs.get("language", "English")
+        # Benchmark de démarrage (post-build)
+        self.opt_benchmark_state = prefs.get("benchmark_enabled", False)
+        self.benchmark_runs = prefs.get("benchmark_runs", 5)
+        self.benchmark_smoke_arg = prefs.get("benchmark_smoke_arg", "")
+        self.benchmark_timeout = prefs.get("benchmark_timeout", 30)
+        # Mode matrice : liste de configurations (None = configurations par défaut)
+        self.matrix_configs = prefs.get("matrix_configs", None)
+        # Compilation distribuée : "hôte:port [places]" ou "loopback [places]"
+        self.build_agents = prefs.get("build_agents", [])
+        self.build_agent_token = prefs.get("build_agent_token", "")
+        # Cache d'artefacts : URL du serveur ou dossier ("" = désactivé)
+        self.artifact_cache = prefs.get("artifact_cache", "")
+        self.artifact_cache_token = prefs.get("artifact_cache_token", "")
+        # Watchdog : délai d'inactivité (s, 0 = désactivé) et relances d'une compilation bloquée
+        self.watchdog_timeout = prefs.get("watchdog_timeout", 600)
+        self.watchdog_retries = prefs.get("watchdog_retries", 1)
+        # Politique de ressources des compilations (resource_policy.py) : surcharges de DEFAULT_POLICY
+        self.resource_policy = prefs.get("resource_policy", {})
+        # Intermédiaires en mémoire (tmpfs_workdir.py) : {"enabled", "root", "budget_mb"}
+        self.tmpfs_workdir = prefs.get("tmpfs_workdir", {})
+        # Rétention des sorties (artifact_store.py) : {"workspace_quota_mb", "global_quota_mb", "keep_last"}
+        self.artifact_store = prefs.get("artifact_store", {})
+        # Déduplication des sorties (dedup.py) ; pool vide = emplacement automatique
+        self.dedup_enabled = prefs.get("dedup_enabled", True)
+        self.dedup_pool = prefs.get("dedup_pool", "")
+        # Réduction des binaires (binary_shrink.py) : {"enabled", "strip", "upx", "upx_args", "workers", ...}
+        self.binary_shrink = prefs.get("binary_shrink", {})
+        # Précompilation du bytecode (bytecode_precompile.py) : {"enabled", "optimize", "venv", "workers"}
+        self.bytecode_precompile = prefs.get("bytecode_precompile", {})
     except Exception:
         self.icon_path = None
         self.opt_onefile_state = False
@@ -41,6 +70,24 @@ def load_preferences(self):
         self.opt_auto_install_state = True
         # self.custom_args_text supprimé (widget supprimé)
         self.output_dir = ""
+        self.opt_benchmark_state = False
+        self.benchmark_runs = 5
+        self.benchmark_smoke_arg = ""
+        self.benchmark_timeout = 30
+        self.matrix_configs = None
+        self.build_agents = []
+        self.build_agent_token = ""
+        self.artifact_cache = ""
+        self.artifact_cache_token = ""
+        self.watchdog_timeout = 600
+        self.watchdog_retries = 1
+        self.resource_policy = {}
+        self.tmpfs_workdir = {}
+        self.artifact_store = {}
+        self.dedup_enabled = True
+        self.dedup_pool = ""
+        self.binary_shrink = {}
+        self.bytecode_precompile = {}
 
 def save_preferences(self):
     prefs = {
@@ -56,6 +103,24 @@ def save_preferences(self):
         # "custom_args" supprimé (widget supprimé)
         "output_dir": self.output_dir_input.text(),
         "language": getattr(self, "current_language", "English"),
+        "benchmark_enabled": bool(self.opt_benchmark and self.opt_benchmark.isChecked()),
+        "benchmark_runs": self.benchmark_runs,
+        "benchmark_smoke_arg": self.benchmark_smoke_arg,
+        "benchmark_timeout": self.benchmark_timeout,
+        "matrix_configs": self.matrix_configs,
+        "build_agents": self.build_agents,
+        "build_agent_token": self.build_agent_token,
+        "artifact_cache": self.artifact_cache,
+        "artifact_cache_token": self.artifact_cache_token,
+        "watchdog_timeout": self.watchdog_timeout,
+        "watchdog_retries": self.watchdog_retries,
+        "resource_policy": self.resource_policy,
+        "tmpfs_workdir": self.tmpfs_workdir,
+        "artifact_store": self.artifact_store,
+        "dedup_enabled": self.dedup_enabled,
+        "dedup_pool": self.dedup_pool,
+        "binary_shrink": self.binary_shrink,
+        "bytecode_precompile": self.bytecode_precompile,
     }
     try:
         with open(PREFS_FILE, "w", encoding="utf-8") as f:
@@ -72,6 +137,8 @@ def update_ui_state(self):
     self.opt_main_only.setChecked(self.opt_main_only_state)
     self.opt_debug.setChecked(self.opt_debug_state)
     self.opt_auto_install.setChecked(self.opt_auto_install_state)
+    if self.opt_benchmark:
+        self.opt_benchmark.setChecked(self.opt_benchmark_state)
     # self.custom_args supprimé (widget supprimé)
     if self.output_dir_input:
         self.output_dir_input.setText(self.output_dir)
@@ -0,0 +1,223 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Vérification préalable des imports pour PyCompiler Pro++.
+Au début d'un lot, le graphe d'imports de chaque point d'entrée est parcouru (modules du
+workspace suivis récursivement) et les modules tiers rencontrés sont recherchés en une seule
+fois par l'interpréteur du venv cible. Un job dont un module est introuvable échoue en
+quelques secondes, sans occuper de place de compilation.
+Les imports protégés (try/except, if hors « if __name__ == "__main__" ») sont considérés
+comme optionnels et ne sont pas vérifiés. Les imports paresseux (dans le corps d'une fonction,
+tolérés par les deux compilateurs) sont vérifiés mais ne donnent lieu qu'à un avertissement.
+"""
+import ast
+import json
+import os
+import platform
+import subprocess
+
+from PySide6.QtCore import QThread, Signal
+
+from .job_queue import JOB_FAILED
+from . import tracing
+
+PROBE_TIMEOUT = 60
+# Exécuté par l'interpréteur du venv : find_spec des modules de premier niveau (sans les importer)
+PROBE_SCRIPT = (
+    "import importlib.util, json, sys\n"
+    "data = json.load(sys.stdin)\n"
+    "sys.path[:0] = data['paths']\n"
+    "found = {}\n"
+    "for name in data['modules']:\n"
+    "    try:\n"
+    "        found[name] = importlib.util.find_spec(name) is not None\n"
+    "    except Exception:\n"
+    "        found[name] = False\n"
+    "print(json.dumps(found))\n"
+)
+
+
+def _is_main_guard(node):
+    test = node.test
+    return (
+        isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) and test.left.id == "__name__"
+    )
+
+
+def iter_imports(tree):
+    """(module, niveau, noms importés, paresseux) des imports non protégés d'un module."""
+    guards = (ast.Try, ast.If) + ((ast.TryStar,) if hasattr(ast, "TryStar") else ())
+    functions = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+    def visit(node, guarded, lazy):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.Import):
+                if not guarded:
+                    for alias in child.names:
+                        yield alias.name, 0, (), lazy
+            elif isinstance(child, ast.ImportFrom):
+                if not guarded:
+                    yield child.module or "", child.level, tuple(a.name for a in child.names), lazy
+            else:
+                is_guard = isinstance(child, guards) and not (isinstance(child, ast.If) and _is_main_guard(child))
+                yield from visit(child, guarded or is_guard, lazy or isinstance(child, functions))
+
+    yield from visit(tree, False, False)
+
+
+def _module_file(base):
+    if os.path.isfile(base + ".py"):
+        return base + ".py"
+    init = os.path.join(base, "__init__.py")
+    return init if os.path.isfile(init) else None
+
+
+def resolve_local(name, search_dirs):
+    """Fichier du workspace correspondant au module name, ou None."""
+    parts = name.split(".")
+    for folder in search_dirs:
+        path = _module_file(os.path.join(folder, *parts))
+        if path:
+            return path
+    return None
+
+
+def third_party_imports(entry, workspace_dir):
+    """Modules tiers (premier niveau) du graphe d'imports de entry -> fichier qui les importe."""
+    return import_graph(entry, workspace_dir)[0]
+
+
+def import_graph(entry, workspace_dir):
+    """
+    (modules tiers -> fichier qui les importe, fichiers du workspace atteints, modules tiers
+    importés seulement dans des fonctions -> fichier) depuis entry.
+    """
+    search_dirs = [os.path.dirname(os.path.abspath(entry)), os.path.abspath(workspace_dir)]
+    external = {}
+    lazy_external = {}
+    seen = set()
+    pending = [os.path.abspath(entry)]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError, ValueError):
+            continue
+        rel = os.path.relpath(path, workspace_dir)
+        for module, level, names, lazy in iter_imports(tree):
+            if level:
+                # Import relatif : toujours local
+                package = os.path.dirname(path)
+                for _ in range(level - 1):
+                    package = os.path.dirname(package)
+                base = os.path.join(package, *module.split(".")) if module else package
+                candidates = [_module_file(base)] + [_module_file(os.path.join(base, n)) for n in names]
+                pending.extend(c for c in candidates if c)
+                continue
+            if not module or module == "__future__":
+                continue
+            top = module.split(".")[0]
+            if resolve_local(top, search_dirs) is None:
+                (lazy_external if lazy else external).setdefault(top, rel)
+                continue
+            candidates = [resolve_local(module, search_dirs)]
+            candidates += [resolve_local(f"{module}.{n}", search_dirs) for n in names]
+            pending.extend(c for c in candidates if c)
+    return external, seen, {name: via for name, via in lazy_external.items() if name not in external}
+
+
+def venv_python(self):
+    venv_bin = os.path.join(self.venv_path_manuel or self.workspace_dir, "venv", "Scripts" if platform.system() == "Windows" else "bin")
+    return os.path.join(venv_bin, "python.exe" if platform.system() == "Windows" else "python")
+
+
+class PreflightWorker(QThread):
+    """Parcourt les graphes d'imports et interroge une seule fois l'interpréteur du venv."""
+
+    message = Signal(str)
+
+    def __init__(self, python, workspace_dir, entries, parent=None):
+        super().__init__(parent)
+        self.python = python
+        self.workspace_dir = workspace_dir
+        self.entries = entries  # job_id -> fichier
+        self.missing = {}  # job_id -> [(module, fichier qui l'importe)]
+        self.lazy_missing = {}  # idem, imports dans des fonctions (avertissement seulement)
+
+    def run(self):
+        with tracing.span("preflight", track="preflight", jobs=len(self.entries)) as check:
+            self._check()
+            check.args["failed"] = len(self.missing)
+
+    def _check(self):
+        graphs = {job_id: import_graph(entry, self.workspace_dir) for job_id, entry in self.entries.items()}
+        imports = {job_id: graph[0] for job_id, graph in graphs.items()}
+        lazy_imports = {job_id: graph[2] for job_id, graph in graphs.items()}
+        modules = sorted({name for found in list(imports.values()) + list(lazy_imports.values()) for name in found})
+        if not modules:
+            return
+        paths = sorted({os.path.dirname(os.path.abspath(e)) for e in self.entries.values()} | {self.workspace_dir})
+        try:
+            with tracing.span("preflight.probe", track="preflight", modules=len(modules)):
+                result = subprocess.run(
+                    [self.python, "-c", PROBE_SCRIPT],
+                    input=json.dumps({"modules": modules, "paths": paths}),
+                    capture_output=True, text=True, cwd=self.workspace_dir, timeout=PROBE_TIMEOUT,
+                )
+            found = json.loads(result.stdout.strip().splitlines()[-1])
+        except (OSError, subprocess.SubprocessError, ValueError, IndexError) as e:
+            self.message.emit(f"⚠️ Vérification préalable des imports impossible ({e}) : compilations lancées sans vérification.")
+            return
+        for job_id, names in imports.items():
+            missing = [(name, via) for name, via in sorted(names.items()) if not found.get(name, True)]
+            if missing:
+                self.missing[job_id] = missing
+        for job_id, names in lazy_imports.items():
+            missing = [(name, via) for name, via in sorted(names.items()) if not found.get(name, True)]
+            if missing:
+                self.lazy_missing[job_id] = missing
+
+
+def start_preflight(self, on_done):
+    """Vérifie les imports des jobs en file puis appelle on_done() ; les jobs voués à l'échec sont retirés."""
+    python = venv_python(self)
+    entries = {job.id: job.file for job in self.queue}
+    if not entries or not os.path.isfile(python):
+        on_done()
+        return
+    self.log.append(f"🔎 Vérification préalable des imports de {len(entries)} cible(s)...")
+    worker = PreflightWorker(python, self.workspace_dir, entries, self)
+    self._preflight_worker = worker
+    worker.message.connect(self.log.append)
+    worker.finished.connect(lambda w=worker: _on_preflight_done(self, w, on_done))
+    worker.start()
+
+
+def _on_preflight_done(self, worker, on_done):
+    self._preflight_worker = None
+    for job in list(self.queue):
+        lazy = worker.lazy_missing.get(job.id)
+        if lazy and job.id not in worker.missing:
+            details = ", ".join(f"{name} ({via})" for name, via in lazy)
+            self.log.append(
+                f"⚠️ {job.label} : module(s) importé(s) dans des fonctions mais introuvable(s) dans le venv : "
+                f"{details}. Compilation lancée ; ces fonctions échoueront à l'exécution."
+            )
+        missing = worker.missing.get(job.id)
+        if not missing or not self.queue.take(job):
+            continue
+        self.queue.mark_finished(job, JOB_FAILED)
+        self._batch_done = getattr(self, "_batch_done", 0) + 1
+        details = ", ".join(f"{name} ({via})" for name, via in missing)
+        self.log.append(
+            f"⛔ {job.label} : module(s) introuvable(s) dans le venv : {details}. Compilation évitée ; "
+            "installez-les (bouton « Analyser les dépendances ») puis relancez."
+        )
+        if job.options and job.options.get("matrix_run"):
+            self.on_matrix_job_done(job.options)
+    on_done()
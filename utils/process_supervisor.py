@@ -0,0 +1,202 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Cycle de vie des processus de compilation pour PyCompiler Pro++.
+Chaque compilation démarre dans sa propre session (groupe de processus) sous Linux/macOS.
+L'arrêt ne bloque jamais l'interface : TERM est envoyé à tout l'arbre (groupe, enfants,
+petits-enfants : gcc, ld, scons...), puis KILL aux survivants après un délai de grâce.
+Enfin, on vérifie que plus aucun processus de l'arbre ne consomme de CPU ; les restants
+sont signalés dans les logs.
+"""
+import os
+import signal
+
+import psutil
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal
+
+TERM_GRACE_MS = 3000
+POLL_MS = 200
+CPU_SETTLE_MS = 500
+
+
+def supervise(process):
+    """À appeler avant process.start() : nouvelle session pour que tout l'arbre partage un groupe."""
+    process.own_session = False
+    if os.name == "posix" and hasattr(process, "setUnixProcessParameters"):
+        try:
+            process.setUnixProcessParameters(QProcess.UnixProcessFlag.CreateNewSession)
+            process.own_session = True
+        except Exception:
+            pass
+
+
+def _root(process):
+    try:
+        pid = process.processId()
+        return psutil.Process(int(pid)) if pid else None
+    except (psutil.Error, TypeError, ValueError):
+        return None
+
+
+def _group_members(pgid):
+    members = []
+    for proc in psutil.process_iter(["pid"]):
+        try:
+            if os.getpgid(proc.pid) == pgid:
+                members.append(proc)
+        except (OSError, psutil.Error):
+            continue
+    return members
+
+
+def _alive(procs):
+    alive = []
+    for proc in procs:
+        try:
+            if proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE:
+                alive.append(proc)
+        except psutil.Error:
+            continue
+    return alive
+
+
+def _cpu_seconds(procs):
+    total = {}
+    for proc in procs:
+        try:
+            times = proc.cpu_times()
+            total[proc.pid] = times.user + times.system
+        except psutil.Error:
+            continue
+    return total
+
+
+class TreeTerminator(QObject):
+    """Arrêt asynchrone d'un arbre de processus : TERM, délai de grâce, KILL, contrôle du CPU."""
+
+    done = Signal(object, list)  # process, pids encore actifs qui consomment du CPU
+
+    def __init__(self, process, grace_ms=TERM_GRACE_MS, parent=None):
+        super().__init__(parent)
+        self.process = process
+        self.grace_ms = grace_ms
+        root = _root(process)
+        self.pgid = root.pid if root is not None and getattr(process, "own_session", False) else None
+        self.known = {}
+        if root is not None:
+            self._collect([root])
+        self._waited = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(POLL_MS)
+        self._timer.timeout.connect(self._poll)
+
+    def _collect(self, procs):
+        """Ajoute les processus et leurs descendants actuels à l'arbre connu."""
+        for proc in procs:
+            self.known.setdefault(proc.pid, proc)
+            try:
+                for child in proc.children(recursive=True):
+                    self.known.setdefault(child.pid, child)
+            except psutil.Error:
+                continue
+        if self.pgid is not None:
+            for proc in _group_members(self.pgid):
+                self.known.setdefault(proc.pid, proc)
+
+    def _signal(self, sig):
+        if self.pgid is not None:
+            try:
+                os.killpg(self.pgid, sig)
+            except OSError:
+                pass
+        for proc in _alive(self.known.values()):
+            try:
+                proc.send_signal(sig) if os.name == "posix" else proc.kill()
+            except psutil.Error:
+                pass
+
+    def start(self):
+        if not self.known:
+            # Processus jamais démarré ou déjà terminé
+            self.process.kill()
+            QTimer.singleShot(0, lambda: self.done.emit(self.process, []))
+            return
+        # Les enfants sont parcourus avant l'envoi du signal : après la mort du parent, ils sont rattachés à init
+        self._collect(list(self.known.values()))
+        self._signal(signal.SIGTERM)
+        self._timer.start()
+
+    def _poll(self):
+        self._waited += POLL_MS
+        self._collect(_alive(self.known.values()))
+        if not _alive(self.known.values()):
+            self._timer.stop()
+            self._confirm()
+        elif self._waited >= self.grace_ms:
+            self._timer.stop()
+            self._signal(signal.SIGKILL if os.name == "posix" else signal.SIGTERM)
+            QTimer.singleShot(POLL_MS, self._confirm)
+
+    def _confirm(self):
+        alive = _alive(self.known.values())
+        if not alive:
+            self.done.emit(self.process, [])
+            return
+        before = _cpu_seconds(alive)
+        QTimer.singleShot(CPU_SETTLE_MS, lambda: self._confirm_cpu(before))
+
+    def _confirm_cpu(self, before):
+        after = _cpu_seconds(_alive(self.known.values()))
+        burning = [pid for pid, cpu in after.items() if cpu > before.get(pid, 0.0)]
+        self.done.emit(self.process, burning)
+
+
+def terminate_tree(self, process, grace_ms=TERM_GRACE_MS):
+    """Arrête process et tous ses descendants sans bloquer ; le signal finished suit normalement."""
+    if getattr(process, "remote", False):
+        process.kill()  # l'agent distant arrête lui-même son arbre
+        return None
+    if getattr(process, "terminator", None) is not None:
+        return process.terminator
+    terminator = TreeTerminator(process, grace_ms, self)
+    process.terminator = terminator
+    terminator.done.connect(lambda p, burning: _on_tree_stopped(self, p, burning))
+    terminator.start()
+    return terminator
+
+
+def _on_tree_stopped(self, process, burning):
+    name = getattr(process, "file_basename", None) or process.program()
+    count = len(process.terminator.known) if process.terminator else 0
+    if burning:
+        self.log.append(f"⚠️ {name} : {len(burning)} processus encore actifs après KILL (pid {', '.join(map(str, burning))}).")
+    elif count > 1:
+        self.log.append(f"✅ {name} : arbre de {count} processus arrêté.")
+    process.terminator = None
+
+
+def kill_tree_now(process):
+    """KILL immédiat de l'arbre (fermeture de l'application, aucune boucle d'événements pour attendre)."""
+    if getattr(process, "remote", False):
+        process.kill()
+        return
+    root = _root(process)
+    procs = []
+    if root is not None:
+        try:
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            procs = [root]
+    if root is not None and getattr(process, "own_session", False):
+        try:
+            os.killpg(root.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    for proc in procs:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
+    if not procs:
+        process.kill()
@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Suivi de progression des compilations pour PyCompiler Pro++.
+Une barre par cible en cours (phase, compteurs, temps restant estimé) et une barre
+globale déterminée, alimentées par les parseurs de sortie (output_parser.py) et par
+les durées historiques (build_history.py).
+"""
+import os
+import time
+
+from PySide6.QtWidgets import QProgressBar
+
+from .build_history import previous_records
+from .output_parser import create_parser, estimate_eta
+
+PROGRESS_SCALE = 1000
+
+PHASE_LABELS = {
+    "start": "démarrage", "analysis": "analyse", "hooks": "hooks", "runtime_hooks": "hooks runtime",
+    "binaries": "binaires", "pyz": "PYZ", "pkg": "PKG", "exe": "EXE", "collect": "COLLECT",
+    "python": "compilation Python", "codegen": "génération C", "c_compile": "compilation C",
+    "link": "édition de liens", "postprocess": "post-traitement", "onefile": "onefile", "done": "terminé",
+}
+
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def begin_batch_progress(self, total):
+    """Initialise la barre globale pour un lot de `total` compilations."""
+    self._batch_total = max(1, total)
+    self._batch_done = 0
+    self.progress.setRange(0, PROGRESS_SCALE)
+    self.progress.setValue(0)
+
+
+def init_build_progress(self, process):
+    """Associe un parseur et une barre de progression à un process de compilation."""
+    build = getattr(process, "build_info", {}) or {}
+    process.output_parser = create_parser(build.get("compiler"))
+    process.historical_duration = None
+    if self.workspace_dir:
+        try:
+            durations = [
+                r["duration"] for r in previous_records(
+                    self.workspace_dir, os.path.relpath(process.file_path, self.workspace_dir),
+                    build.get("compiler"), build.get("mode"),
+                    predicate=lambda r: r.get("exit_code") == 0 and r.get("duration"),
+                )[:5]
+            ]
+            if durations:
+                process.historical_duration = sum(durations) / len(durations)
+        except Exception:
+            pass
+    layout = getattr(self, "target_progress_layout", None)
+    if layout is not None:
+        bar = QProgressBar()
+        bar.setRange(0, PROGRESS_SCALE)
+        bar.setValue(0)
+        bar.setFormat(f"{process.file_basename} — en attente")
+        layout.addWidget(bar)
+        process.progress_bar = bar
+    update_build_progress(self, process)
+
+
+def update_build_progress(self, process):
+    parser = getattr(process, "output_parser", None)
+    if parser is None:
+        return
+    bar = getattr(process, "progress_bar", None)
+    if bar is not None:
+        elapsed = time.time() - getattr(process, "_start_time", time.time())
+        text = f"{process.file_basename} — {PHASE_LABELS.get(parser.phase, parser.phase or 'en attente')}"
+        if parser.done_count is not None:
+            text += f" {parser.done_count}/{parser.total_count}" if parser.total_count else f" ({parser.done_count})"
+        text += f" — %p% — {_format_duration(elapsed)}"
+        eta = estimate_eta(elapsed, parser.fraction, process.historical_duration)
+        if eta is not None and not parser.finished:
+            text += f" (reste ~{_format_duration(eta)})"
+        bar.setValue(int(parser.fraction * PROGRESS_SCALE))
+        bar.setFormat(text)
+    update_overall_progress(self)
+
+
+def finish_build_progress(self, process, counted=True):
+    """Retire la barre de la cible et compte la compilation comme terminée (sauf si elle est remise en file)."""
+    bar = getattr(process, "progress_bar", None)
+    if bar is not None:
+        bar.setParent(None)
+        bar.deleteLater()
+        process.progress_bar = None
+    process.output_parser = None
+    if counted:
+        self._batch_done = getattr(self, "_batch_done", 0) + 1
+    update_overall_progress(self)
+
+
+def update_overall_progress(self):
+    total = getattr(self, "_batch_total", 0)
+    if not total:
+        return
+    running = sum(p.output_parser.fraction for p in self.processes if getattr(p, "output_parser", None))
+    value = (getattr(self, "_batch_done", 0) + running) / total
+    self.progress.setRange(0, PROGRESS_SCALE)
+    self.progress.setValue(int(min(1.0, value) * PROGRESS_SCALE))
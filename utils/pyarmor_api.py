@@ -9,6 +9,8 @@ from pathlib import Path
 from PySide6.QtWidgets import QMessageBox, QProgressDialog
 from PySide6.QtCore import Qt
 
+from . import tracing
+
 class PyArmorAPI:
     def __init__(self, parent_widget=None):
         self.parent_widget = parent_widget
@@ -59,7 +61,8 @@ class PyArmorAPI:
 
     def est_pyarmor_installe(self):
         """Vérifie si PyArmor est installé sur le système."""
-        return shutil.which("pyarmor") is not None
+        with tracing.span("pyarmor.detect"):
+            return shutil.which("pyarmor") is not None
 
     def afficher_alerte_absence_pyarmor(self):
         """Affiche une alerte et propose d'installer PyArmor, ou de continuer sans protection."""
@@ -155,7 +158,8 @@ class PyArmorAPI:
             cmd = [
                 "pyarmor", "gen", "-r", workspace_path, "-O", dossier_temporaire
             ] + exclude_args
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            with tracing.span("pyarmor.gen", workspace=workspace_path):
+                result = subprocess.run(cmd, capture_output=True, text=True)
             output = (result.stdout or "") + "\n" + (result.stderr or "")
             # Considérer comme succès si pas d'ERROR/FAIL dans la sortie
             if (result.returncode == 0 or ("ERROR" not in output and "FAIL" not in output)):
@@ -0,0 +1,321 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Compilation distribuée pour PyCompiler Pro++.
+Répartit la file de compilation entre la machine locale et des agents (build_agent.py) sur le
+réseau local ou en boucle locale. RemoteBuild expose l'interface de QProcess utilisée par
+compiler.py (finished, state, kill, ...) : les logs arrivent dans le même OutputStream,
+la progression et les étapes post-build fonctionnent à l'identique une fois les artefacts
+rapatriés dans le workspace.
+"""
+import base64
+import json
+import os
+import platform
+import secrets
+import socket
+import sys
+import tempfile
+import time
+
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal
+from PySide6.QtNetwork import QAbstractSocket, QTcpSocket
+from PySide6.QtWidgets import QInputDialog
+
+from .artifact_analysis import artifact_paths, describe_build, outputs_outside
+from .build_agent import encode_message, iter_workspace_files, pack_workspace, safe_extract
+from .output_stream import OutputStream
+from .progress_tracking import init_build_progress
+
+CONNECT_RETRIES = 5
+CONNECT_RETRY_MS = 500
+LOOPBACK = "loopback"
+
+
+def parse_agents(lines):
+    """'hôte:port [places]' ou 'loopback [places]' -> liste de dicts."""
+    agents = []
+    for line in lines:
+        parts = line.split()
+        if not parts or parts[0].startswith("#"):
+            continue
+        slots = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+        if parts[0] == LOOPBACK:
+            agents.append({"address": LOOPBACK, "host": "127.0.0.1", "port": None, "slots": slots})
+            continue
+        host, _, port = parts[0].rpartition(":")
+        if host and port.isdigit():
+            agents.append({"address": parts[0], "host": host, "port": int(port), "slots": slots})
+    return agents
+
+
+class RemoteBuild(QObject):
+    """Compilation exécutée par un agent, pilotée comme un QProcess."""
+
+    finished = Signal(int, object)
+    remote = True
+
+    def __init__(self, agent, payload, log, parent=None):
+        super().__init__(parent)
+        self.agent = agent
+        self.payload = payload
+        self.log = log
+        self._running = False
+        self._buffer = bytearray()
+        self._artifact_file = None
+        self._exit_code = None
+        self._retries = 0
+        self.socket = QTcpSocket(self)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.errorOccurred.connect(self._on_error)
+        self.socket.disconnected.connect(self._on_disconnected)
+
+    # --- Interface QProcess utilisée par compiler.py ---
+    def start(self):
+        self._running = True
+        self.socket.connectToHost(self.agent["host"], self.agent["port"])
+
+    def state(self):
+        return QProcess.Running if self._running else QProcess.NotRunning
+
+    def processId(self):
+        return None
+
+    def kill(self):
+        if not self._running:
+            return
+        connected = self.socket.state() == QAbstractSocket.ConnectedState
+        if connected:
+            self.socket.write(encode_message({"type": "cancel"}))
+            self.socket.flush()
+        self._finish(-1, QProcess.CrashExit)
+        if connected:
+            self.socket.disconnectFromHost()
+
+    def waitForFinished(self, msecs=30000):
+        return not self._running
+
+    # --- Protocole ---
+    def _on_connected(self):
+        self.socket.write(encode_message({"type": "hello", "token": self.agent.get("token", "")}))
+
+    def _on_ready_read(self):
+        self._buffer += self.socket.readAll().data()
+        while True:
+            cut = self._buffer.find(b"\n")
+            if cut < 0:
+                break
+            line = bytes(self._buffer[:cut])
+            del self._buffer[:cut + 1]
+            try:
+                self._handle(json.loads(line.decode("utf-8")))
+            except Exception as e:
+                self.log(f"❌ Agent {self.agent['address']} : message invalide ({e})")
+                self.kill()
+                return
+
+    def _handle(self, message):
+        kind = message.get("type")
+        if kind == "welcome":
+            if message.get("platform") != platform.system():
+                self.log(f"⚠️ Agent {self.agent['address']} sous {message.get('platform')} : les exécutables produits ne seront pas pour {platform.system()}.")
+            self.socket.write(encode_message(self.payload))
+            self.payload = None
+        elif kind == "output":
+            self.output_stream.feed(message.get("channel", "stdout"), base64.b64decode(message["data"]))
+        elif kind == "exit":
+            self._exit_code = message.get("exit_code", 1)
+        elif kind == "artifact":
+            if self._artifact_file is None:
+                self._artifact_file = tempfile.TemporaryFile()
+            self._artifact_file.write(base64.b64decode(message["data"]))
+        elif kind == "done":
+            exit_code = message.get("exit_code", 1)
+            if exit_code == 0 and self._artifact_file is not None:
+                try:
+                    self._artifact_file.seek(0)
+                    safe_extract(self._artifact_file, self.workspace_dir)
+                except Exception as e:
+                    self.log(f"❌ Récupération des artefacts depuis {self.agent['address']} impossible : {e}")
+                    exit_code = 1
+            self._finish(exit_code, QProcess.NormalExit)
+            self.socket.disconnectFromHost()
+        elif kind == "error":
+            self.log(f"❌ Agent {self.agent['address']} : {message.get('message')}")
+            self._finish(1, QProcess.CrashExit)
+
+    def _on_error(self, error):
+        if not self._running:
+            return
+        # L'agent en boucle locale peut encore être en train de démarrer
+        if error == QAbstractSocket.ConnectionRefusedError and self._retries < CONNECT_RETRIES:
+            self._retries += 1
+            QTimer.singleShot(CONNECT_RETRY_MS, lambda: self.socket.connectToHost(self.agent["host"], self.agent["port"]))
+            return
+        if error != QAbstractSocket.RemoteHostClosedError:
+            self.log(f"❌ Agent {self.agent['address']} : {self.socket.errorString()}")
+            self._finish(1, QProcess.CrashExit)
+
+    def _on_disconnected(self):
+        if self._running:
+            self.log(f"❌ Connexion perdue avec l'agent {self.agent['address']}.")
+            self._finish(1, QProcess.CrashExit)
+
+    def _finish(self, exit_code, status):
+        if not self._running:
+            return
+        self._running = False
+        if self._artifact_file is not None:
+            self._artifact_file.close()
+            self._artifact_file = None
+        self.finished.emit(exit_code, status)
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _venv_python(self):
+    base = self.venv_path_manuel or self.workspace_dir
+    venv_bin = os.path.join(base, "venv", "Scripts" if platform.system() == "Windows" else "bin")
+    return os.path.join(venv_bin, "python.exe" if platform.system() == "Windows" else "python")
+
+
+def start_loopback_agent(self, agent):
+    """Démarre un agent local (tests, ou pour isoler des compilations) sur un port libre."""
+    proc = getattr(self, "_loopback_agent_process", None)
+    if proc is not None and proc.state() != QProcess.NotRunning:
+        agent["port"] = self._loopback_agent_port
+        agent["token"] = self._loopback_agent_token
+        return
+    agent["port"] = _free_port()
+    agent["token"] = secrets.token_hex(16)
+    proc = QProcess(self)
+    proc.setProgram(sys.executable)
+    proc.setArguments([
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "build_agent.py"),
+        "--host", "127.0.0.1", "--port", str(agent["port"]), "--slots", str(agent["slots"]),
+        "--python", _venv_python(self), "--token", agent["token"],
+    ])
+    stream = OutputStream(proc)
+    stream.lines.connect(lambda channel, lines: self.log.append("\n".join(lines)))
+    proc.start()
+    self._loopback_agent_process = proc
+    self._loopback_agent_port = agent["port"]
+    self._loopback_agent_token = agent["token"]
+    self.log.append(f"🛰️ Agent local démarré sur le port {agent['port']}.")
+
+
+def configure_build_agents(self):
+    """Édite la liste des agents (une ligne 'hôte:port places' ou 'loopback places')."""
+    text, ok = QInputDialog.getMultiLineText(
+        self, self.tr("Agents de compilation", "Build agents"),
+        self.tr(
+            "Un agent par ligne : hôte:port [places], ou « loopback [places] » pour un agent local.\nListe vide : compilation locale uniquement.",
+            "One agent per line: host:port [slots], or \"loopback [slots]\" for a local agent.\nEmpty list: local builds only.",
+        ),
+        "\n".join(self.build_agents),
+    )
+    if not ok:
+        return
+    self.build_agents = [line.strip() for line in text.splitlines() if line.strip()]
+    self._agents = None
+    agents = get_build_agents(self)
+    if agents:
+        self.log.append(f"🛰️ {len(agents)} agent(s) de compilation : " + ", ".join(a["address"] for a in agents))
+    else:
+        self.log.append("🛰️ Compilation distribuée désactivée.")
+    self.save_preferences()
+
+
+def get_build_agents(self):
+    if getattr(self, "_agents", None) is None:
+        self._agents = parse_agents(getattr(self, "build_agents", []))
+        for agent in self._agents:
+            agent.setdefault("token", getattr(self, "build_agent_token", ""))
+    return self._agents
+
+
+def free_build_agent(self):
+    """Premier agent ayant une place libre, ou None."""
+    for agent in get_build_agents(self):
+        running = sum(1 for p in self.processes if getattr(p, "agent", None) is agent)
+        if running < agent["slots"]:
+            return agent
+    return None
+
+
+def _workspace_archive(self):
+    # Une seule archive par état du workspace (un lot de 60 cibles n'archive qu'une fois)
+    snapshot = []
+    for full in iter_workspace_files(self.workspace_dir):
+        try:
+            snapshot.append((full, os.path.getmtime(full)))
+        except OSError:
+            pass
+    key = hash(tuple(snapshot))
+    cached = getattr(self, "_remote_archive", None)
+    if cached is None or cached[0] != key:
+        cached = (key, base64.b64encode(pack_workspace(self.workspace_dir)).decode("ascii"))
+        self._remote_archive = cached
+    return cached[1]
+
+
+def compiler_args(self, file, options=None):
+    """Arguments du compilateur, sans l'exécutable (python -m nuitka / pyinstaller)."""
+    if self.job_uses_nuitka(options):
+        # --jobs dépend de la machine qui compile : l'agent le fixe lui-même
+        return self.build_nuitka_command(file, dict(options or {}, c_jobs=None))[3:]
+    return self.build_pyinstaller_command(os.path.basename(file), options)[1:]
+
+
+def remote_compatible(self, file, options=None):
+    """
+    Vrai si la compilation peut partir sur un agent : ses sorties doivent être dans le workspace,
+    seul dossier que l'agent reproduit et dont il renvoie les artefacts.
+    """
+    build = describe_build(self, file, self.job_uses_nuitka(options), options)
+    return not outputs_outside(build, self.workspace_dir)
+
+
+def start_remote_compilation(self, agent, file, options=None):
+    """Envoie une compilation à un agent ; retourne l'objet RemoteBuild (ou None)."""
+    file_basename = os.path.basename(file)
+    use_nuitka = self.job_uses_nuitka(options)
+    cmd = compiler_args(self, file, options)
+    build = describe_build(self, file, use_nuitka, options)
+    if agent["address"] == LOOPBACK:
+        start_loopback_agent(self, agent)
+    try:
+        archive = _workspace_archive(self)
+    except Exception as e:
+        self.log.append(f"❌ Archivage du workspace impossible : {e}")
+        return None
+    payload = {
+        "type": "job",
+        "job_id": f"{file_basename}-{int(time.time() * 1000)}",
+        "compiler": "nuitka" if use_nuitka else "pyinstaller",
+        "args": cmd,
+        "workspace": self.workspace_dir,
+        "archive": archive,
+        "artifacts": artifact_paths(build, self.workspace_dir),
+    }
+    self.log.append(f"🛰️ Compilation de {file_basename} envoyée à l'agent {agent['address']}\nArguments : {' '.join(cmd)}\n")
+    process = RemoteBuild(agent, payload, self.log.append, self)
+    process.workspace_dir = self.workspace_dir
+    process.file_path = file
+    process.file_basename = file_basename
+    process.build_info = build
+    process._start_time = time.time()
+    process.output_stream = OutputStream(parent=process)
+    process.output_stream.lines.connect(lambda channel, lines, p=process: self.handle_output(p, channel, lines))
+    process.finished.connect(lambda ec, es, p=process: self.handle_finished(p, ec, es))
+    self.processes.append(process)
+    self.current_compiling.add(file)
+    init_build_progress(self, process)
+    process.start()
+    return process
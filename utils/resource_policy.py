@@ -0,0 +1,183 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Politique de ressources des compilations pour PyCompiler Pro++.
+Au démarrage de chaque processus de compilation (signal started, avant que le compilateur
+ne lance ses propres enfants, qui héritent des réglages) :
+- priorité CPU réduite (nice, ou BELOW_NORMAL sous Windows) ;
+- priorité d'E/S réduite (ionice, classe idle ou best-effort) ;
+- affinité CPU excluant le cœur 0, réservé à l'interface (machines de plus de 2 cœurs) ;
+- limites cgroup v2 optionnelles (memory.max, cpu.max), seulement dans un cgroup parent
+  délégué : cgroup.subtree_control inscriptible et aucun processus membre (un cgroup ne peut
+  à la fois contenir des processus et déléguer ses contrôleurs). Le processus de l'interface
+  n'est jamais déplacé : son propre cgroup, qui le contient, ne convient donc pas, et
+  cgroup_parent doit désigner un cgroup vide préparé et délégué (ex. un sous-cgroup créé dans
+  « systemd-run --user --scope -p Delegate=yes »). Sinon, les limites sont ignorées (journal).
+La préférence "resource_policy" (dictionnaire) complète DEFAULT_POLICY ; l'option de job
+"resource_policy" la surcharge pour une compilation.
+"""
+import os
+import platform
+
+import psutil
+
+DEFAULT_POLICY = {
+    "nice": 10,
+    "ionice": "idle",  # "idle", "best-effort" (priorité 7) ou None
+    "reserve_gui_core": True,
+    "memory_max": None,  # ex. "4G" (cgroup v2)
+    "cpus": None,  # ex. 2.5 cœurs (cgroup v2, cpu.max)
+    "cgroup_parent": None,  # cgroup délégué ; par défaut celui de l'application
+}
+CGROUP_ROOT = "/sys/fs/cgroup"
+CPU_PERIOD_US = 100000
+# cgroup de l'application, lu une fois (parent par défaut des cgroups de compilation)
+_prepared_parent = None
+
+
+def policy_for(self, options=None):
+    policy = dict(DEFAULT_POLICY)
+    policy.update(getattr(self, "resource_policy", None) or {})
+    if options and options.get("resource_policy"):
+        policy.update(options["resource_policy"])
+    return policy
+
+
+def compiler_cpus(policy):
+    """Cœurs autorisés aux compilateurs (le cœur 0 est laissé à l'interface), ou None."""
+    if not policy.get("reserve_gui_core") or not hasattr(psutil.Process, "cpu_affinity"):
+        return None
+    try:
+        cpus = psutil.Process().cpu_affinity()
+    except psutil.Error:
+        return None
+    return cpus[1:] if len(cpus) > 2 else None
+
+
+def _apply_priority(proc, policy):
+    applied = []
+    nice = policy.get("nice")
+    if nice:
+        if platform.system() == "Windows":
+            proc.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS if nice < 15 else psutil.IDLE_PRIORITY_CLASS)
+        else:
+            proc.nice(max(proc.nice(), int(nice)))
+        applied.append(f"nice {nice}")
+    io = policy.get("ionice")
+    if io and hasattr(proc, "ionice"):
+        if platform.system() == "Windows":
+            proc.ionice(psutil.IOPRIO_LOW if io != "idle" else psutil.IOPRIO_VERYLOW)
+        elif io == "idle":
+            proc.ionice(psutil.IOPRIO_CLASS_IDLE)
+        else:
+            proc.ionice(psutil.IOPRIO_CLASS_BE, value=7)
+        applied.append(f"ionice {io}")
+    cpus = compiler_cpus(policy)
+    if cpus:
+        proc.cpu_affinity(cpus)
+        applied.append(f"cœurs {cpus[0]}-{cpus[-1]}")
+    return applied
+
+
+def _own_cgroup():
+    try:
+        with open("/proc/self/cgroup", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return os.path.join(CGROUP_ROOT, line[3:].strip().lstrip("/"))
+    except OSError:
+        pass
+    return None
+
+
+def _read_words(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return set(f.read().split())
+
+
+def _check_delegated(parent):
+    """Lève OSError si parent n'est pas un cgroup délégué utilisable (inscriptible et sans processus)."""
+    if not os.access(os.path.join(parent, "cgroup.subtree_control"), os.W_OK):
+        raise OSError(f"{parent} non délégué (cgroup.subtree_control non inscriptible) ; voir l'option cgroup_parent")
+    if _read_words(os.path.join(parent, "cgroup.procs")):
+        raise OSError(f"{parent} contient des processus (dont l'interface ?) ; cgroup_parent doit désigner un cgroup délégué vide")
+
+
+def _enable_controllers(parent, needed):
+    """Active les contrôleurs needed pour les enfants de parent (cgroup.subtree_control)."""
+    _check_delegated(parent)
+    missing = needed - _read_words(os.path.join(parent, "cgroup.subtree_control"))
+    if not missing:
+        return
+    unavailable = missing - _read_words(os.path.join(parent, "cgroup.controllers"))
+    if unavailable:
+        raise OSError(f"contrôleur(s) {', '.join(sorted(unavailable))} non délégué(s) à {parent}")
+    with open(os.path.join(parent, "cgroup.subtree_control"), "w") as f:
+        f.write(" ".join(f"+{c}" for c in sorted(missing)))
+
+
+def _cgroup_parent(policy):
+    global _prepared_parent
+    if policy.get("cgroup_parent"):
+        return policy["cgroup_parent"]
+    if _prepared_parent is None:
+        _prepared_parent = _own_cgroup()
+    return _prepared_parent
+
+
+def _apply_cgroup(pid, name, policy):
+    """Place pid dans un cgroup v2 dédié ; retourne son chemin. Lève OSError si indisponible."""
+    if not os.path.isfile(os.path.join(CGROUP_ROOT, "cgroup.controllers")):
+        raise OSError("cgroup v2 non monté")
+    parent = _cgroup_parent(policy)
+    if not parent:
+        raise OSError("cgroup de l'application inconnu")
+    needed = {c for c, key in (("memory", "memory_max"), ("cpu", "cpus")) if policy.get(key)}
+    _enable_controllers(parent, needed)
+    path = os.path.join(parent, name)
+    os.makedirs(path, exist_ok=True)
+    try:
+        if policy.get("memory_max"):
+            with open(os.path.join(path, "memory.max"), "w") as f:
+                f.write(str(policy["memory_max"]))
+        if policy.get("cpus"):
+            with open(os.path.join(path, "cpu.max"), "w") as f:
+                f.write(f"{int(float(policy['cpus']) * CPU_PERIOD_US)} {CPU_PERIOD_US}")
+        with open(os.path.join(path, "cgroup.procs"), "w") as f:
+            f.write(str(pid))
+    except OSError:
+        remove_cgroup(path)
+        raise
+    return path
+
+
+def remove_cgroup(path):
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+def apply_resource_policy(self, process, options=None):
+    """Applique la politique au processus qui vient de démarrer (connecté à process.started)."""
+    if getattr(process, "remote", False):
+        return
+    policy = policy_for(self, options)
+    try:
+        pid = int(process.processId())
+        applied = _apply_priority(psutil.Process(pid), policy)
+    except (psutil.Error, OSError, TypeError, ValueError) as e:
+        self.log.append(f"⚠️ Politique de ressources non appliquée à {process.file_basename} : {e}")
+        return
+    if (policy.get("memory_max") or policy.get("cpus")) and platform.system() == "Linux":
+        try:
+            process.cgroup_path = _apply_cgroup(pid, f"pycompiler-{pid}", policy)
+            process.finished.connect(lambda *args, p=process: remove_cgroup(p.cgroup_path))
+            applied.append(f"cgroup {policy.get('memory_max') or '-'} / {policy.get('cpus') or '-'} cœurs")
+        except OSError as e:
+            if not getattr(self, "_cgroup_warned", False):
+                self._cgroup_warned = True
+                self.log.append(f"ℹ️ Limites cgroup v2 indisponibles ({e}) ; nice/ionice/affinité seuls appliqués.")
+    if applied:
+        self.log.append(f"🎚️ {process.file_basename} : {', '.join(applied)}.")
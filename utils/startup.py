@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Chronométrage et profilage du démarrage de PyCompiler Pro++ (bibliothèque standard uniquement).
+Désactivé par défaut ; PYCOMPILER_STARTUP_TIMING=1 affiche sur stderr la durée de chaque
+phase (imports, préférences, construction de l'interface, langue, premier affichage).
+
+python main.py --profile-startup[=fichier.json] mesure en plus le temps d'import de chaque
+module (crochet sur sys.meta_path) et le temps jusqu'au premier rendu de la fenêtre, puis
+écrit une trace au format Chrome Trace Event (chrome://tracing, Perfetto, speedscope).
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("PYCOMPILER_STARTUP_TIMING", "") not in ("", "0")
+T0 = time.perf_counter()
+DEFAULT_TRACE = "startup_trace.json"
+TOP_IMPORTS = 20
+
+# (nom, début en s depuis T0, durée en s)
+_phases = []
+# Événements Chrome Trace (phases et imports)
+_events = []
+# nom -> (durée totale, durée propre) des modules importés
+_imports = {}
+_lock = threading.Lock()
+_local = threading.local()
+_hook = None
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def _event(name, category, start, duration, tid=None, args=None):
+    event = {
+        "name": name, "cat": category, "ph": "X", "pid": os.getpid(),
+        "tid": tid if tid is not None else threading.get_ident(),
+        "ts": round((start - T0) * 1e6, 1), "dur": round(duration * 1e6, 1),
+    }
+    if args:
+        event["args"] = args
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def phase(name):
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        _phases.append((name, start - T0, duration))
+        _event(name, "startup", start, duration)
+
+
+def mark(name):
+    """Jalon instantané (ex. premier rendu)."""
+    if not ENABLED:
+        return
+    now = time.perf_counter()
+    _phases.append((name, now - T0, 0.0))
+    with _lock:
+        _events.append({
+            "name": name, "cat": "startup", "ph": "i", "s": "g", "pid": os.getpid(),
+            "tid": threading.get_ident(), "ts": round((now - T0) * 1e6, 1),
+        })
+
+
+def phases():
+    return list(_phases)
+
+
+class _ImportTimer:
+    """Chercheur placé en tête de sys.meta_path : chronomètre l'exécution de chaque module importé."""
+
+    def find_spec(self, name, path=None, target=None):
+        if getattr(_local, "finding", False):
+            return None
+        _local.finding = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                find = getattr(finder, "find_spec", None)
+                if finder is self or find is None:
+                    continue
+                spec = find(name, path, target)
+                if spec is not None:
+                    break
+        finally:
+            _local.finding = False
+        if spec is None:
+            return None
+        loader = spec.loader
+        # Importeurs natifs (classes) et chargeurs déjà instrumentés : laissés tels quels
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        try:
+            if "exec_module" not in vars(loader):
+                loader.exec_module = _timed_exec(loader.exec_module)
+        except (TypeError, AttributeError):
+            pass
+        return spec
+
+
+def _timed_exec(exec_module):
+    def wrapper(module):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        start = time.perf_counter()
+        stack.append(0.0)
+        try:
+            exec_module(module)
+        finally:
+            duration = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += duration
+            self_time = duration - children
+            with _lock:
+                _imports[module.__name__] = (duration, self_time)
+            _event(module.__name__, "import", start, duration, args={"self_ms": round(self_time * 1000, 3)})
+    return wrapper
+
+
+def install_import_hook():
+    global _hook
+    if _hook is None:
+        _hook = _ImportTimer()
+        sys.meta_path.insert(0, _hook)
+
+
+def remove_import_hook():
+    global _hook
+    if _hook is not None and _hook in sys.meta_path:
+        sys.meta_path.remove(_hook)
+    _hook = None
+
+
+def report():
+    lines = ["[startup] phase                              début (ms)  durée (ms)"]
+    for name, start, duration in _phases:
+        lines.append(f"[startup] {name:<34} {start * 1000:>10.1f}  {duration * 1000:>10.1f}")
+    if _imports:
+        with _lock:
+            imports = dict(_imports)
+        lines.append(f"[startup] {len(imports)} modules importés ; les plus lents (temps propre) :")
+        slowest = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)[:TOP_IMPORTS]
+        for name, (total, self_time) in slowest:
+            lines.append(f"[startup]   {name:<48} propre {self_time * 1000:>8.1f} ms  cumulé {total * 1000:>8.1f} ms")
+    return "\n".join(lines)
+
+
+def print_report(stream=None):
+    if ENABLED and _phases:
+        print(report(), file=stream or sys.stderr, flush=True)
+
+
+def write_trace(path=DEFAULT_TRACE):
+    """Écrit les événements au format Chrome Trace Event ; retourne le chemin absolu."""
+    with _lock:
+        events = list(_events)
+    metadata = {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "PyCompiler Pro++ (démarrage)"}}
+    path = os.path.abspath(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": [metadata] + events, "displayTimeUnit": "ms"}, f)
+    return path
+
+
+def watch_first_paint(widget, callback):
+    """Appelle callback() au premier événement Paint reçu par widget (ou un de ses enfants)."""
+    from PySide6.QtCore import QEvent, QObject
+    from PySide6.QtWidgets import QApplication
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and obj.isWidgetType() and (obj is widget or widget.isAncestorOf(obj)):
+                QApplication.instance().removeEventFilter(self)
+                callback()
+            return False
+
+    paint_filter = FirstPaintFilter(widget)
+    QApplication.instance().installEventFilter(paint_filter)
+    return paint_filter
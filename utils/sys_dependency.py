@@ -6,6 +6,10 @@ import subprocess
 import webbrowser
 from PySide6.QtWidgets import QMessageBox, QInputDialog, QLineEdit
 
+from .job_queue import JOB_FAILED
+from .toolchain import describe, get_capabilities, invalidate, missing_for_nuitka, start_toolchain_probe
+from . import tracing
+
 class SysDependencyManager:
     def __init__(self, parent_widget=None):
         self.parent_widget = parent_widget
@@ -37,23 +41,26 @@ class SysDependencyManager:
             return pwd
         return None
 
-    def check_dependencies_installed(self):
-        import shutil
-        os_name = platform.system()
-        if os_name == "Linux":
-            gcc = shutil.which("gcc")
-            p7zip = shutil.which("7z") or shutil.which("p7zip") or shutil.which("p7zip-full")
-            patchelf = shutil.which("patchelf")
-            return bool(gcc and p7zip and patchelf)
-        elif os_name == "Windows":
-            mingw = shutil.which("gcc") or shutil.which("mingw32-gcc")
-            return bool(mingw)
-        return False
+    def capabilities(self, refresh=False):
+        """Enregistrement de capacités de la chaîne C (sondé une fois, mis en cache, voir toolchain.py)."""
+        return get_capabilities(refresh)
+
+    def check_dependencies_installed(self, capabilities=None):
+        capabilities = capabilities or self.capabilities()
+        if capabilities.get("platform") not in ("Linux", "Windows"):
+            return False
+        return not missing_for_nuitka(capabilities)
 
-    def install_gcc_and_p7zip(self):
+    def install_gcc_and_p7zip(self, capabilities=None):
         """Propose d'installer gcc, p7zip-full et patchelf selon l'OS et la distribution."""
-        if self.check_dependencies_installed():
+        if self.check_dependencies_installed(capabilities):
             return True
+        installed = self._install_gcc_and_p7zip()
+        if installed:
+            invalidate()  # les outils viennent d'être installés : refaire la sonde
+        return installed
+
+    def _install_gcc_and_p7zip(self):
         os_name = platform.system()
         if os_name == "Linux":
             pm = self.detect_linux_package_manager()
@@ -169,3 +176,46 @@ class SysDependencyManager:
                 self.tr("L'installation automatique de gcc/p7zip ou MinGW-w64 n'est supportée que sous Linux et Windows.", "Automatic installation of gcc/p7zip or MinGW-w64 is only supported on Linux and Windows.")
             )
             return False
+
+
+def ensure_batch_toolchain(self, on_done):
+    """
+    Vérifie une seule fois par lot que la chaîne C requise par Nuitka est présente
+    (plutôt qu'à chaque fichier, au milieu du lot), puis appelle on_done(). Les sondes
+    tournent dans un thread (ToolchainProbeWorker) : l'interface ne se fige pas. Si
+    l'installation est refusée, les jobs Nuitka du lot sont retirés et les autres continuent.
+    """
+    if not any(self.job_uses_nuitka(job.options) for job in self.queue):
+        on_done()
+        return
+    if getattr(self, "toolchain", None) is None:
+        # Sonde de démarrage pas encore terminée (ou jamais lancée) : cache disque ou nouvelle sonde
+        start_toolchain_probe(self, lambda record: _check_batch_toolchain(self, record, on_done))
+        return
+    _check_batch_toolchain(self, self.toolchain, on_done)
+
+
+def _check_batch_toolchain(self, capabilities, on_done, refreshed=False):
+    with tracing.span("toolchain.check", refreshed=refreshed) as check:
+        missing = missing_for_nuitka(capabilities)
+        check.args["missing"] = len(missing)
+    if missing and not refreshed:
+        # Sonde mémorisée (démarrage, cache disque) : un outil installé depuis n'y figure pas
+        start_toolchain_probe(self, lambda record: _check_batch_toolchain(self, record, on_done, True), refresh=True)
+        return
+    if not missing:
+        on_done()
+        return
+    nuitka_jobs = [job for job in self.queue if self.job_uses_nuitka(job.options)]
+    sysdep = SysDependencyManager(parent_widget=self)
+    if sysdep.install_gcc_and_p7zip(capabilities):
+        start_toolchain_probe(self, lambda _record: on_done(), refresh=True)
+        return
+    self.log.append(f"⛔ Compilation Nuitka annulée : dépendances système manquantes ou installation refusée ({describe(capabilities)}).\n")
+    for job in nuitka_jobs:
+        if self.queue.take(job):
+            self.queue.mark_finished(job, JOB_FAILED)
+            self._batch_done = getattr(self, "_batch_done", 0) + 1
+            if job.options and job.options.get("matrix_run"):
+                self.on_matrix_job_done(job.options)
+    on_done()
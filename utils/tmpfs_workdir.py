@@ -0,0 +1,156 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Dossiers de travail en mémoire (tmpfs) pour PyCompiler Pro++.
+Option « tmpfs_workdir » : les fichiers intermédiaires de chaque compilation locale sont écrits
+dans <racine tmpfs>/pycompiler-<pid>/<job> (par défaut /dev/shm sous Linux) :
+- PyInstaller : --workpath (le dist/ reste sur disque) ; les TOC utiles à l'analyse de taille
+  sont recopiées dans le dossier build/ habituel ;
+- Nuitka : --output-dir (.build, .dist, .onefile-build) ; seuls l'exécutable et le dossier
+  .dist finaux sont déplacés vers le dossier de sortie réel.
+Chaque job réserve une taille estimée dans le budget (budget_mb) ; sans place suffisante, ou si
+le tmpfs se remplit pendant la compilation (disque plein), le job est compilé sur disque.
+"""
+import glob
+import os
+import platform
+import shutil
+
+import psutil
+
+from .artifact_analysis import describe_build, locate_artifacts
+from .failure_classifier import FAILURE_DISK_FULL
+from .job_queue import JOB_FAILED
+
+DEFAULT_SETTINGS = {"enabled": False, "root": None, "budget_mb": 4096}
+# Taille estimée des intermédiaires d'une compilation (Mo)
+ESTIMATE_MB = {"nuitka": 1500, "pyinstaller": 400}
+MB = 1024 * 1024
+
+
+def tmpfs_settings(self):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(getattr(self, "tmpfs_workdir", None) or {})
+    return settings
+
+
+def tmpfs_root(settings):
+    if settings.get("root"):
+        return settings["root"]
+    if platform.system() == "Linux" and os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return None
+
+
+def _purge_stale(root):
+    """Supprime les dossiers laissés par des instances terminées (plantage, arrêt forcé)."""
+    for folder in glob.glob(os.path.join(root, "pycompiler-*")):
+        try:
+            pid = int(folder.rsplit("-", 1)[1])
+        except ValueError:
+            continue
+        if pid != os.getpid() and not psutil.pid_exists(pid):
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+def prepare_scratch(self, file, options, use_nuitka):
+    """
+    Retourne (options du job, scratch) : options redirigeant les intermédiaires vers le tmpfs et
+    description du dossier temporaire, ou (options, None) si le job est compilé sur disque.
+    """
+    settings = tmpfs_settings(self)
+    if not settings["enabled"] or (options and options.get("tmpfs") is False):
+        return options, None
+    root = tmpfs_root(settings)
+    if not root or not os.path.isdir(root):
+        return options, None
+    if not getattr(self, "_tmpfs_purged", False):
+        self._tmpfs_purged = True
+        _purge_stale(root)
+    compiler = "nuitka" if use_nuitka else "pyinstaller"
+    estimate = ESTIMATE_MB[compiler]
+    reserved = getattr(self, "_tmpfs_reserved", {})
+    self._tmpfs_reserved = reserved
+    used = sum(reserved.values())
+    try:
+        free = shutil.disk_usage(root).free // MB
+    except OSError:
+        return options, None
+    label = os.path.basename(file)
+    if used + estimate > settings["budget_mb"] or estimate > free:
+        self.log.append(
+            f"💾 {label} : budget tmpfs insuffisant ({used} + {estimate} Mo sur {settings['budget_mb']} Mo, "
+            f"{free} Mo libres) ; intermédiaires sur disque."
+        )
+        return options, None
+    self._tmpfs_seq = getattr(self, "_tmpfs_seq", 0) + 1
+    folder = os.path.join(root, f"pycompiler-{os.getpid()}", f"{self._tmpfs_seq}-{os.path.splitext(label)[0]}")
+    os.makedirs(folder, exist_ok=True)
+    reserved[folder] = estimate
+    final = describe_build(self, file, use_nuitka, options)
+    options = dict(options or {})
+    if use_nuitka:
+        options["output_dir"] = folder
+    else:
+        options["workpath"] = folder
+    return options, {"folder": folder, "final": final}
+
+
+def _move(src, dest):
+    if not os.path.exists(src):
+        return
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    if os.path.isdir(dest):
+        shutil.rmtree(dest)
+    elif os.path.exists(dest):
+        os.remove(dest)
+    shutil.move(src, dest)
+
+
+def finalize_scratch(self, process, success):
+    """
+    Fin de compilation : recopie les sorties finales vers leurs dossiers habituels, restaure
+    process.build_info et libère le dossier tmpfs (appelé au début de handle_finished).
+    """
+    scratch = getattr(process, "scratch", None)
+    if scratch is None:
+        return
+    process.scratch = None
+    final = scratch["final"]
+    used = process.build_info
+    try:
+        if success:
+            if final["compiler"] == "nuitka":
+                for src, dest in zip(locate_artifacts(used), locate_artifacts(final)):
+                    if src and dest:
+                        _move(src, dest)
+            else:
+                toc_dir = os.path.join(final["workpath"], final["name"])
+                os.makedirs(toc_dir, exist_ok=True)
+                for toc in glob.glob(os.path.join(scratch["folder"], final["name"], "*.toc")):
+                    shutil.copy2(toc, toc_dir)
+    except OSError as e:
+        self.log.append(f"⚠️ {process.file_basename} : copie des sorties depuis le tmpfs impossible : {e}")
+    finally:
+        discard_scratch(self, scratch)
+    process.build_info = final
+
+
+def discard_scratch(self, scratch):
+    """Le processus n'a pas été lancé : libère le dossier et sa réservation."""
+    if scratch is not None:
+        shutil.rmtree(scratch["folder"], ignore_errors=True)
+        getattr(self, "_tmpfs_reserved", {}).pop(scratch["folder"], None)
+
+
+def fallback_to_disk(self, process, failure):
+    """Tmpfs plein pendant la compilation : le job repart en tête de file, intermédiaires sur disque."""
+    job = getattr(process, "job", None)
+    if job is None or not getattr(process, "used_tmpfs", False) or failure is None or failure.kind != FAILURE_DISK_FULL:
+        return False
+    job.options = dict(job.options or {}, tmpfs=False)
+    self.queue.mark_finished(job, JOB_FAILED)
+    self.queue.requeue_front(job)
+    self.log.append(f"💾 {job.label} : tmpfs plein, relance avec les intermédiaires sur disque.")
+    return True
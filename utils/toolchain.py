@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Sonde de la chaîne de compilation C pour PyCompiler Pro++.
+Détecte une seule fois (en arrière-plan au démarrage) gcc, clang, ccache, patchelf, 7z et
+MinGW avec leurs versions, et met le résultat en cache sur disque. Le cache est invalidé
+quand le PATH ou le système change. Le résultat est un enregistrement de capacités que
+le planificateur consulte une fois par lot de compilation.
+"""
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QThread, Signal
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".pycompiler", "toolchain.json")
+PROBE_TIMEOUT = 5
+VERSION_RE = re.compile(r"(\d+\.\d+(?:\.\d+)?)")
+
+# outil -> (exécutables candidats, arguments pour obtenir la version)
+TOOLS = {
+    "gcc": (["gcc"], ["--version"]),
+    "clang": (["clang"], ["--version"]),
+    "ccache": (["ccache"], ["--version"]),
+    "patchelf": (["patchelf"], ["--version"]),
+    "7z": (["7z", "7za", "p7zip"], []),  # 7z affiche sa version dans la bannière
+    "mingw": (["mingw32-gcc", "x86_64-w64-mingw32-gcc"], ["--version"]),
+}
+# Outils indispensables à Nuitka selon le système
+NUITKA_REQUIREMENTS = {
+    "Linux": [("gcc", "clang"), ("patchelf",), ("7z",)],
+    "Windows": [("gcc", "mingw", "clang")],
+    "Darwin": [("clang", "gcc")],
+}
+
+_lock = threading.Lock()
+_record = None
+
+
+def path_hash():
+    return hashlib.sha256(os.environ.get("PATH", "").encode("utf-8")).hexdigest()
+
+
+def _probe_tool(candidates, args):
+    for exe in candidates:
+        path = shutil.which(exe)
+        if not path:
+            continue
+        version = None
+        try:
+            proc = subprocess.run([path] + args, capture_output=True, text=True, timeout=PROBE_TIMEOUT, errors="replace")
+            m = VERSION_RE.search((proc.stdout or "") + (proc.stderr or ""))
+            version = m.group(1) if m else None
+        except Exception:
+            pass
+        return {"path": path, "version": version}
+    return None
+
+
+def probe_toolchain():
+    """Sonde tous les outils en parallèle et retourne l'enregistrement de capacités."""
+    with ThreadPoolExecutor(max_workers=len(TOOLS)) as pool:
+        futures = {name: pool.submit(_probe_tool, *spec) for name, spec in TOOLS.items()}
+        tools = {name: f.result() for name, f in futures.items()}
+    return {
+        "platform": platform.system(),
+        "path_hash": path_hash(),
+        "probed_at": time.time(),
+        "tools": {name: info for name, info in tools.items() if info},
+    }
+
+
+def _load_cached():
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except Exception:
+        return None
+    if record.get("path_hash") != path_hash() or record.get("platform") != platform.system():
+        return None
+    # Un outil désinstallé depuis la sonde invalide aussi le cache
+    if any(not os.path.exists(info.get("path", "")) for info in record.get("tools", {}).values()):
+        return None
+    return record
+
+
+def _save(record):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+    except Exception:
+        pass
+
+
+def get_capabilities(refresh=False):
+    """
+    Capacités de la machine : cache mémoire, puis disque, sinon nouvelle sonde (bloquante : à
+    appeler hors du thread de l'interface, voir start_toolchain_probe). La sonde se fait hors
+    du verrou ; deux sondes simultanées donnent le même résultat.
+    """
+    global _record
+    with _lock:
+        if not refresh and _record is not None and _record.get("path_hash") == path_hash():
+            return _record
+    record = None if refresh else _load_cached()
+    if record is None:
+        record = probe_toolchain()
+        _save(record)
+    with _lock:
+        _record = record
+    return record
+
+
+def invalidate():
+    global _record
+    with _lock:
+        _record = None
+        try:
+            os.remove(CACHE_PATH)
+        except OSError:
+            pass
+
+
+def has_tool(capabilities, name):
+    return name in capabilities.get("tools", {})
+
+
+def missing_for_nuitka(capabilities):
+    """Groupes d'outils requis par Nuitka dont aucun n'est disponible (ex. [('patchelf',)])."""
+    requirements = NUITKA_REQUIREMENTS.get(capabilities.get("platform"), [])
+    return [group for group in requirements if not any(has_tool(capabilities, t) for t in group)]
+
+
+def describe(capabilities):
+    tools = capabilities.get("tools", {})
+    return ", ".join(f"{name} {info.get('version') or '?'}" for name, info in sorted(tools.items())) or "aucun outil"
+
+
+class ToolchainProbeWorker(QThread):
+    probed = Signal(dict)
+
+    def __init__(self, refresh=False, parent=None):
+        super().__init__(parent)
+        self.refresh = refresh
+
+    def run(self):
+        self.probed.emit(get_capabilities(self.refresh))
+
+
+def start_toolchain_probe(self, on_done=None, refresh=False):
+    """
+    Lance la sonde en arrière-plan (démarrage, ou refresh=True pour ignorer les caches) ;
+    self.toolchain reçoit le résultat, puis on_done(record) est appelé dans le thread de l'interface.
+    """
+    self.toolchain = getattr(self, "toolchain", None)
+    worker = ToolchainProbeWorker(refresh, self)
+    worker.probed.connect(lambda record: setattr(self, "toolchain", record))
+    if on_done is not None:
+        worker.probed.connect(on_done)
+    if not hasattr(self, "_toolchain_workers"):
+        self._toolchain_workers = []
+    self._toolchain_workers.append(worker)
+    worker.finished.connect(lambda w=worker: self._toolchain_workers.remove(w))
+    worker.start()
@@ -0,0 +1,175 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Traçage du pipeline de compilation pour PyCompiler Pro++ (bibliothèque standard uniquement).
+Chaque étape (obfuscation PyArmor, points d'entrée, chaîne C, cache, commande, lancement,
+compilation, fin de compilation, post-build, vérifications du venv, pip...) ouvre un span.
+Les spans terminés sont transmis aux hooks enregistrés (add_hook) et, à la fin de chaque lot,
+écrits au format Chrome Trace Event dans <workspace>/.pycompiler/traces/<lot>.json
+(chrome://tracing, Perfetto, speedscope). Les étapes faites entre deux lots (venv, pip)
+figurent dans la trace du lot suivant.
+
+    with tracing.span("command", track=label):
+        cmd = self.build_nuitka_command(file, options)
+
+    s = tracing.span("compile", track=label)   # span asynchrone (durée de vie d'un processus)
+    ...
+    s.end(exit_code=0)
+"""
+import json
+import os
+import threading
+import time
+
+from .build_history import history_dir
+
+TRACES_DIR = "traces"
+MAX_TRACES = 20
+T0 = time.perf_counter()
+
+_lock = threading.Lock()
+_events = []
+_tracks = {}
+_hooks = []
+
+
+def add_hook(hook):
+    """hook(span) est appelé pour chaque span terminé (depuis le thread qui le termine)."""
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def _track_id(track):
+    with _lock:
+        if track not in _tracks:
+            _tracks[track] = len(_tracks) + 1
+        return _tracks[track]
+
+
+def _default_track():
+    thread = threading.current_thread()
+    return "interface" if thread is threading.main_thread() else thread.name
+
+
+class Span:
+    __slots__ = ("name", "category", "track", "args", "start", "end_time")
+
+    def __init__(self, name, category="pipeline", track=None, **args):
+        self.name = name
+        self.category = category
+        self.track = track or _default_track()
+        self.args = args
+        self.start = time.perf_counter()
+        self.end_time = None
+
+    @property
+    def duration(self):
+        return (self.end_time or time.perf_counter()) - self.start
+
+    def end(self, **args):
+        """Termine le span (une seule fois) ; args complète ses attributs."""
+        if self.end_time is not None:
+            return
+        self.end_time = time.perf_counter()
+        self.args.update(args)
+        event = {
+            "name": self.name, "cat": self.category, "ph": "X", "pid": os.getpid(),
+            "tid": _track_id(self.track),
+            "ts": round((self.start - T0) * 1e6, 1), "dur": round((self.end_time - self.start) * 1e6, 1),
+        }
+        if self.args:
+            event["args"] = {k: v if isinstance(v, (int, float, str, bool, type(None))) else str(v) for k, v in self.args.items()}
+        with _lock:
+            _events.append(event)
+        for hook in list(_hooks):
+            try:
+                hook(self)
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(**({"error": f"{exc_type.__name__}: {exc}"} if exc_type else {}))
+        return False
+
+
+def span(name, category="pipeline", track=None, **args):
+    """Démarre un span ; à utiliser comme gestionnaire de contexte ou à terminer par .end()."""
+    return Span(name, category, track, **args)
+
+
+def instant(name, category="pipeline", track=None, **args):
+    event = {
+        "name": name, "cat": category, "ph": "i", "s": "p", "pid": os.getpid(),
+        "tid": _track_id(track or _default_track()), "ts": round((time.perf_counter() - T0) * 1e6, 1),
+    }
+    if args:
+        event["args"] = {k: str(v) for k, v in args.items()}
+    with _lock:
+        _events.append(event)
+
+
+def take_events():
+    """Retire et retourne les événements accumulés, avec les noms des pistes."""
+    with _lock:
+        events = list(_events)
+        _events.clear()
+        tracks = dict(_tracks)
+    metadata = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "PyCompiler Pro++"}}]
+    metadata += [
+        {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": track}}
+        for track, tid in tracks.items()
+    ]
+    return metadata + events
+
+
+def write_batch_trace(workspace_dir, batch_id):
+    """Écrit la trace du lot et ne garde que les MAX_TRACES plus récentes ; retourne le chemin (ou None)."""
+    events = take_events()
+    if not workspace_dir:
+        return None
+    folder = os.path.join(history_dir(workspace_dir), TRACES_DIR)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{batch_id}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    traces = sorted(
+        (os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(".json")),
+        key=os.path.getmtime,
+    )
+    for old in traces[:-MAX_TRACES]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+    return path
+
+
+def begin_batch_trace(self):
+    """Ouvre le span du lot (appelé par start_batch)."""
+    if getattr(self, "_batch_trace", None) is None:
+        self._batch_trace = span("batch", track="lot", id=time.strftime("%Y%m%d-%H%M%S"), jobs=len(self.queue))
+
+
+def end_batch_trace(self):
+    """Ferme le span du lot et écrit sa trace dans le workspace."""
+    batch = getattr(self, "_batch_trace", None)
+    if batch is None:
+        return
+    self._batch_trace = None
+    batch.end()
+    try:
+        path = write_batch_trace(self.workspace_dir, batch.args["id"])
+    except OSError as e:
+        self.log.append(f"⚠️ Impossible d'écrire la trace du lot : {e}")
+        return
+    if path:
+        self.log.append(f"🧭 Trace du lot : {path} (chrome://tracing, Perfetto ou speedscope)")
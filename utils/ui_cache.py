@@ -0,0 +1,135 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Interface précompilée pour PyCompiler Pro++.
+ui/ui_design.ui est converti une fois par pyside6-uic en module Python (ui/ui_design_compiled.py),
+sans les styles inline que init_ui supprime de toute façon au profit de ui/style.qss. Au
+démarrage, ce module remplace l'analyse du .ui par QUiLoader ; il est régénéré en
+arrière-plan quand le .ui change (empreinte SHA-256 en tête du fichier).
+
+    python utils/ui_cache.py    # (re)génère le module, aussi fait par run.sh / run.ps1
+"""
+import hashlib
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+
+UI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ui")
+UI_PATH = os.path.abspath(os.path.join(UI_DIR, "ui_design.ui"))
+COMPILED_PATH = os.path.abspath(os.path.join(UI_DIR, "ui_design_compiled.py"))
+HASH_PREFIX = "# source-sha256: "
+
+_compile_lock = threading.Lock()
+
+
+def ui_digest(ui_path=UI_PATH):
+    with open(ui_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _compiled_digest(out_path=COMPILED_PATH):
+    try:
+        with open(out_path, "r", encoding="utf-8") as f:
+            first = f.readline()
+    except OSError:
+        return None
+    return first[len(HASH_PREFIX):].strip() if first.startswith(HASH_PREFIX) else None
+
+
+def is_up_to_date(ui_path=UI_PATH, out_path=COMPILED_PATH):
+    try:
+        return _compiled_digest(out_path) == ui_digest(ui_path)
+    except OSError:
+        return False
+
+
+def find_uic():
+    found = shutil.which("pyside6-uic")
+    if found:
+        return found
+    bin_dir = os.path.dirname(sys.executable)
+    for name in ("pyside6-uic", "pyside6-uic.exe"):
+        candidate = os.path.join(bin_dir, name)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def compile_ui(ui_path=UI_PATH, out_path=COMPILED_PATH):
+    """Génère le module précompilé (styles inline retirés) ; False si pyside6-uic est absent ou échoue."""
+    uic = find_uic()
+    if uic is None:
+        return False
+    with _compile_lock:
+        digest = ui_digest(ui_path)
+        tree = ET.parse(ui_path)
+        for parent in tree.iter():
+            for prop in list(parent.findall("property")):
+                if prop.get("name") == "styleSheet":
+                    parent.remove(prop)
+        tmp_dir = tempfile.mkdtemp(prefix="pycompiler-uic-")
+        try:
+            stripped = os.path.join(tmp_dir, "ui_design.ui")
+            generated = os.path.join(tmp_dir, "ui_design_compiled.py")
+            tree.write(stripped, encoding="utf-8", xml_declaration=True)
+            proc = subprocess.run([uic, stripped, "-o", generated], capture_output=True, text=True, timeout=60)
+            if proc.returncode != 0 or not os.path.isfile(generated):
+                return False
+            with open(generated, "r", encoding="utf-8") as f:
+                code = f.read()
+            partial = out_path + ".part"
+            with open(partial, "w", encoding="utf-8") as f:
+                f.write(f"{HASH_PREFIX}{digest}\n{code}")
+            os.replace(partial, out_path)
+            return True
+        except (OSError, subprocess.SubprocessError):
+            return False
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _load_compiled_class(out_path=COMPILED_PATH):
+    spec = importlib.util.spec_from_file_location("ui_design_compiled", out_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Ui_PyInstallerGUI
+
+
+def load_ui(parent):
+    """
+    Construit le widget principal de l'interface. Retourne (widget, précompilé) : avec le module
+    précompilé les styles inline sont déjà absents ; sinon repli sur QUiLoader et régénération
+    du module en arrière-plan pour le prochain démarrage.
+    """
+    from PySide6.QtWidgets import QWidget
+    if is_up_to_date():
+        try:
+            widget = QWidget(parent)
+            _load_compiled_class()().setupUi(widget)
+            return widget, True
+        except Exception:
+            pass
+    from PySide6.QtCore import QFile
+    from PySide6.QtUiTools import QUiLoader
+    ui_file = QFile(UI_PATH)
+    ui_file.open(QFile.ReadOnly)
+    widget = QUiLoader().load(ui_file, parent)
+    ui_file.close()
+    threading.Thread(target=compile_ui, daemon=True).start()
+    return widget, False
+
+
+if __name__ == "__main__":
+    if is_up_to_date():
+        print("Interface précompilée à jour.")
+    elif compile_ui():
+        print(f"Interface précompilée : {COMPILED_PATH}")
+    else:
+        print("pyside6-uic introuvable ou en échec : l'interface sera chargée par QUiLoader.")
+        sys.exit(1)
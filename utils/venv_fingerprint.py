@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Empreinte du venv d'un workspace pour PyCompiler Pro++.
+L'empreinte combine le contenu de requirements.txt, la version de l'interpréteur du venv
+(pyvenv.cfg) et la liste des dossiers *.dist-info de site-packages. Elle est enregistrée
+dans le venv après une vérification complète (PyInstaller, Nuitka, requirements.txt) ; tant
+qu'elle est identique, la réouverture du workspace saute les « pip show » et « pip install ».
+"""
+import hashlib
+import os
+
+FINGERPRINT_FILE = ".pycompiler_fingerprint"
+# Paquets dont la présence est vérifiée à l'ouverture d'un workspace
+REQUIRED_PACKAGES = ("pyinstaller", "nuitka")
+
+
+def _dist_infos(venv_dir):
+    from .exclusion_analysis import find_site_packages  # import différé : module d'analyse non requis au démarrage
+    site_packages = find_site_packages(venv_dir)
+    if not site_packages:
+        return []
+    try:
+        return sorted(name for name in os.listdir(site_packages) if name.endswith((".dist-info", ".egg-info")))
+    except OSError:
+        return []
+
+
+def compute_fingerprint(venv_dir, workspace_dir):
+    digest = hashlib.sha256()
+    req_path = os.path.join(workspace_dir, "requirements.txt")
+    try:
+        with open(req_path, "rb") as f:
+            digest.update(b"requirements\0" + hashlib.sha256(f.read()).digest())
+    except OSError:
+        digest.update(b"requirements\0none")
+    try:
+        with open(os.path.join(venv_dir, "pyvenv.cfg"), "r", encoding="utf-8", errors="replace") as f:
+            digest.update("".join(line for line in f if line.strip().startswith("version")).encode("utf-8"))
+    except OSError:
+        digest.update(b"pyvenv\0none")
+    for name in _dist_infos(venv_dir):
+        digest.update(b"\0" + name.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def missing_required(venv_dir):
+    """Paquets de REQUIRED_PACKAGES sans dist-info dans le venv."""
+    installed = {name.split("-", 1)[0].lower().replace("_", "-") for name in _dist_infos(venv_dir)}
+    return [pkg for pkg in REQUIRED_PACKAGES if pkg not in installed]
+
+
+def read_fingerprint(venv_dir):
+    try:
+        with open(os.path.join(venv_dir, FINGERPRINT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def is_venv_current(venv_dir, workspace_dir):
+    stored = read_fingerprint(venv_dir)
+    return stored is not None and stored == compute_fingerprint(venv_dir, workspace_dir)
+
+
+def record_venv_ready(self, workspace_dir):
+    """Enregistre l'empreinte du venv du workspace si PyInstaller et Nuitka y sont bien installés."""
+    venv_dir = os.path.join(workspace_dir, "venv")
+    if not os.path.isdir(venv_dir) or missing_required(venv_dir):
+        return False
+    try:
+        with open(os.path.join(venv_dir, FINGERPRINT_FILE), "w", encoding="utf-8") as f:
+            f.write(compute_fingerprint(venv_dir, workspace_dir) + "\n")
+    except OSError as e:
+        self._safe_log(f"⚠️ Impossible d'enregistrer l'empreinte du venv : {e}")
+        return False
+    return True
@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (C) 2025 Samuel Amen Ague
+
+"""
+Surveillance des compilations bloquées pour PyCompiler Pro++.
+Toutes les CHECK_INTERVAL_MS, chaque compilation locale en cours est examinée : dernière ligne
+de sortie reçue et temps CPU cumulé de son arbre de processus (compilateur C compris). Une
+compilation sans sortie ET sans activité CPU depuis plus de watchdog_timeout secondes est
+considérée bloquée : son arbre est arrêté, l'événement est enregistré dans l'historique
+(« stalled ») et le job est relancé tant qu'il reste des tentatives (watchdog_retries).
+Une compilation silencieuse mais active (longue compilation C) n'est jamais arrêtée.
+"""
+import time
+
+import psutil
+from PySide6.QtCore import QTimer
+
+from .job_queue import JOB_FAILED
+from .process_supervisor import terminate_tree
+from . import tracing
+
+CHECK_INTERVAL_MS = 15000
+# Fraction d'un cœur en dessous de laquelle l'arbre est considéré inactif
+CPU_ACTIVE_FRACTION = 0.05
+DEFAULT_TIMEOUT = 600
+DEFAULT_RETRIES = 1
+
+
+def _tree_cpu_seconds(process):
+    try:
+        root = psutil.Process(int(process.processId()))
+        procs = [root] + root.children(recursive=True)
+    except (psutil.Error, TypeError, ValueError):
+        return None
+    total = 0.0
+    for proc in procs:
+        try:
+            times = proc.cpu_times()
+            total += times.user + times.system + getattr(times, "children_user", 0.0) + getattr(times, "children_system", 0.0)
+        except psutil.Error:
+            continue
+    return total
+
+
+def watchdog_timeout(self, job=None):
+    """Délai d'inactivité en secondes (option du job prioritaire, 0 = surveillance désactivée)."""
+    options = getattr(job, "options", None) or {}
+    return options.get("watchdog_timeout", getattr(self, "watchdog_timeout", DEFAULT_TIMEOUT)) or 0
+
+
+def note_output(process):
+    """Appelé à chaque lot de lignes reçu (handle_output)."""
+    process.last_output_at = time.monotonic()
+
+
+def ensure_watchdog(self):
+    """Démarre la vérification périodique si besoin (appelé après le lancement des compilations)."""
+    timer = getattr(self, "_watchdog_timer", None)
+    if timer is None:
+        timer = self._watchdog_timer = QTimer(self)
+        timer.setInterval(CHECK_INTERVAL_MS)
+        timer.timeout.connect(lambda: check_stalled(self))
+    if self.processes and not timer.isActive():
+        timer.start()
+
+
+def check_stalled(self):
+    now = time.monotonic()
+    local = [p for p in self.processes if not getattr(p, "remote", False)]
+    if not local:
+        self._watchdog_timer.stop()
+        return
+    for process in local:
+        job = getattr(process, "job", None)
+        timeout = watchdog_timeout(self, job)
+        if not timeout or getattr(process, "stalled", False) or getattr(job, "paused", False):
+            # Un job en pause n'est pas bloqué ; sa surveillance reprend à zéro
+            process.last_activity_at = now
+            continue
+        cpu = _tree_cpu_seconds(process)
+        last_cpu = getattr(process, "watch_cpu", None)
+        process.watch_cpu = cpu
+        if cpu is None:
+            continue
+        if last_cpu is None or cpu - last_cpu > CPU_ACTIVE_FRACTION * CHECK_INTERVAL_MS / 1000 or cpu < last_cpu:
+            process.last_activity_at = now
+        last_output = getattr(process, "last_output_at", now)
+        last_activity = getattr(process, "last_activity_at", now)
+        idle = now - max(last_output, last_activity)
+        if idle >= timeout:
+            process.stalled = True
+            process.stalled_after = round(idle)
+            tracing.instant("watchdog.stalled", track=getattr(process, "file_basename", None), idle=round(idle))
+            self.log.append(
+                f"<span style='color:orange;'>⏱️ {process.file_basename} : ni sortie ni activité CPU depuis "
+                f"{round(idle)} s, compilation considérée bloquée. Arrêt de son arbre de processus.</span>"
+            )
+            terminate_tree(self, process)
+
+
+def retry_stalled(self, process):
+    """
+    Appelé par handle_finished pour une compilation arrêtée par le watchdog. Retourne True si
+    le job est remis en tête de file (tentatives restantes), False s'il échoue définitivement.
+    """
+    job = getattr(process, "job", None)
+    if job is None:
+        return False
+    retries = getattr(self, "watchdog_retries", DEFAULT_RETRIES)
+    if job.attempts > retries:
+        self.log.append(f"❌ {job.label} bloqué {job.attempts} fois : abandon (watchdog_retries = {retries}).")
+        return False
+    self.queue.mark_finished(job, JOB_FAILED)
+    self.queue.requeue_front(job)
+    self.log.append(f"🔁 {job.label} relancé après blocage (tentative {job.attempts}/{retries + 1}).")
+    return True
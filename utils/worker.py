@@ -11,10 +11,12 @@ from PySide6.QtWidgets import (
     QWidget, QFileDialog,
     QMessageBox, QApplication
 )
-from PySide6.QtCore import Qt, QProcess
+from PySide6.QtCore import Qt, QProcess, QTimer
 from PySide6.QtGui import QDropEvent, QPixmap
 
+from . import startup
 from .dialogs import ProgressDialog
+from .lazy import install_lazy_methods
 
 class PyInstallerWorkspaceGUI(QWidget):
     def __init__(self):
@@ -28,9 +30,10 @@ class PyInstallerWorkspaceGUI(QWidget):
         self.icon_path = None
         self.selected_files = []
         self.venv_path_manuel = None
+        self.auto_exclusions = {}
 
         self.processes = []
-        self.queue = []
+        self._queue = None  # JobQueue créée au premier accès (propriété queue)
         self.current_compiling = set()
         self._closing = False
         # Références aux QProcess pour arrêt propre lors de la fermeture
@@ -41,12 +44,21 @@ class PyInstallerWorkspaceGUI(QWidget):
         self._venv_check_install_process = None
         self._req_install_process = None
 
-        self.load_preferences()
-        self.init_ui()
+        self.toolchain = None
+
+        with startup.phase("load_preferences"):
+            self.load_preferences()
+        with startup.phase("init_ui"):
+            self.init_ui()
+        # Sonde de la chaîne C (gcc, clang, patchelf, 7z...) en arrière-plan, résultat mis en cache ;
+        # lancée après le premier affichage
+        QTimer.singleShot(0, lambda: self.start_toolchain_probe())
         # Appliquer la langue des préférences si présente, sinon anglais
         lang = getattr(self, "language", "English")
-        self.apply_language(lang)
-        self.update_ui_state()
+        with startup.phase("apply_language"):
+            self.apply_language(lang)
+        with startup.phase("update_ui_state"):
+            self.update_ui_state()
 
     from .init_ui import init_ui
 
@@ -143,9 +155,20 @@ class PyInstallerWorkspaceGUI(QWidget):
                         count += 1
         return count
 
+    @property
+    def queue(self):
+        # job_queue.py (et psutil, progress_tracking, build_history...) importé à la première compilation
+        if self._queue is None:
+            from .job_queue import JobQueue
+            self._queue = JobQueue()
+        return self._queue
+
     def select_workspace(self):
+        from .venv_fingerprint import is_venv_current
         folder = QFileDialog.getExistingDirectory(self, "Choisir le dossier du projet")
         if folder:
+            if self.auto_exclusions and folder != self.workspace_dir:
+                self.reset_auto_exclusions("nouveau workspace")
             self.workspace_dir = folder
             self.label_folder.setText(f"Dossier sélectionné : {folder}")
             self.python_files.clear()
@@ -160,6 +183,9 @@ class PyInstallerWorkspaceGUI(QWidget):
             venv_path = os.path.join(folder, "venv")
             if not os.path.isdir(venv_path):
                 self.log.append("Aucun dossier venv détecté dans ce workspace.")
+            elif is_venv_current(venv_path, folder):
+                # requirements.txt, interpréteur et paquets installés inchangés depuis la dernière vérification
+                self.log.append("✅ Venv inchangé depuis la dernière vérification (empreinte identique) : vérifications pip ignorées.")
             else:
                 self.log.append("Dossier venv détecté.")
                 # Vérification/installation auto de nuitka et pyinstaller (asynchrone avec ProgressDialog)
@@ -175,6 +201,7 @@ class PyInstallerWorkspaceGUI(QWidget):
                 self._check_next_venv_pkg()
 
     def _check_next_venv_pkg(self):
+        from . import tracing
         if self._venv_check_index >= len(self._venv_check_pkgs):
             self.venv_check_progress.set_message("Vérification terminée.")
             self.venv_check_progress.set_progress(2, 2)
@@ -189,10 +216,14 @@ class PyInstallerWorkspaceGUI(QWidget):
         process.setProgram(self._venv_check_pip_exe)
         process.setArguments(["show", pkg])
         process.setWorkingDirectory(self._venv_check_path)
+        process.trace_span = tracing.span("venv.pip_show", track="venv", package=pkg)
         process.finished.connect(lambda code, status: self._on_venv_pkg_checked(process, code, status, pkg))
         process.start()
 
     def _on_venv_pkg_checked(self, process, code, status, pkg):
+        from . import tracing
+        from .output_stream import OutputStream
+        process.trace_span.end(exit_code=code)
         if code == 0:
             self.log.append(f"✅ {pkg} déjà installé dans le venv.")
             self._venv_check_index += 1
@@ -208,22 +239,21 @@ class PyInstallerWorkspaceGUI(QWidget):
             process2.setProgram(self._venv_check_pip_exe)
             process2.setArguments(["install", pkg])
             process2.setWorkingDirectory(self._venv_check_path)
-            process2.readyReadStandardOutput.connect(lambda: self._on_venv_check_output(process2))
-            process2.readyReadStandardError.connect(lambda: self._on_venv_check_output(process2, error=True))
+            process2.trace_span = tracing.span("venv.pip_install", track="venv", package=pkg)
+            OutputStream(process2).lines.connect(lambda channel, lines: self._on_venv_check_output(lines, error=channel == "stderr"))
             process2.finished.connect(lambda code2, status2: self._on_venv_pkg_installed(process2, code2, status2, pkg))
             process2.start()
 
-    def _on_venv_check_output(self, process, error=False):
+    def _on_venv_check_output(self, lines, error=False):
         if getattr(self, "_closing", False):
             return
-        data = process.readAllStandardError().data().decode() if error else process.readAllStandardOutput().data().decode()
         if hasattr(self, 'venv_check_progress') and self.venv_check_progress:
-            lines = data.strip().splitlines()
             if lines:
                 self.venv_check_progress.set_message(lines[-1])
-        self._safe_log(data)
+        self._safe_log("\n".join(lines))
 
     def _on_venv_pkg_installed(self, process, code, status, pkg):
+        process.trace_span.end(exit_code=code)
         if getattr(self, "_closing", False):
             return
         if code == 0:
@@ -238,6 +268,8 @@ class PyInstallerWorkspaceGUI(QWidget):
 
     def select_venv_manually(self):
         folder = QFileDialog.getExistingDirectory(self, "Choisir un dossier venv", "")
+        if self.auto_exclusions and (folder or None) != self.venv_path_manuel:
+            self.reset_auto_exclusions("venv changé")
         if folder:
             self.venv_path_manuel = folder
             self.venv_label.setText(f"Venv sélectionné : {folder}")
@@ -249,6 +281,8 @@ class PyInstallerWorkspaceGUI(QWidget):
 
 
     def create_venv_if_needed(self, path):
+        from . import tracing
+        from .output_stream import OutputStream
         venv_path = os.path.join(path, "venv")
         if not os.path.exists(venv_path):
             self._safe_log("🔧 Aucun venv trouvé, création automatique...")
@@ -306,8 +340,8 @@ class PyInstallerWorkspaceGUI(QWidget):
                     args = ["-3"] + args
                 process.setArguments(args)
                 process.setWorkingDirectory(path)
-                process.readyReadStandardOutput.connect(lambda: self._on_venv_output(process))
-                process.readyReadStandardError.connect(lambda: self._on_venv_output(process, error=True))
+                process.trace_span = tracing.span("venv.create", track="venv")
+                OutputStream(process).lines.connect(lambda channel, lines: self._on_venv_output(lines, error=channel == "stderr"))
                 process.finished.connect(lambda code, status: self._on_venv_created(process, code, status, venv_path))
                 self._venv_progress_lines = 0
                 self.venv_progress_dialog.show()
@@ -315,19 +349,18 @@ class PyInstallerWorkspaceGUI(QWidget):
             except Exception as e:
                 self._safe_log(f"❌ Échec de création du venv ou installation de PyInstaller : {e}")
 
-    def _on_venv_output(self, process, error=False):
+    def _on_venv_output(self, lines, error=False):
         if getattr(self, "_closing", False):
             return
-        data = process.readAllStandardError().data().decode() if error else process.readAllStandardOutput().data().decode()
         if hasattr(self, 'venv_progress_dialog') and self.venv_progress_dialog:
-            lines = data.strip().splitlines()
             if lines:
                 self.venv_progress_dialog.set_message(lines[-1])
             self._venv_progress_lines += len(lines)
             self.venv_progress_dialog.set_progress(self._venv_progress_lines, 0)
-        self._safe_log(data)
+        self._safe_log("\n".join(lines))
 
     def _on_venv_created(self, process, code, status, venv_path):
+        process.trace_span.end(exit_code=code)
         if getattr(self, "_closing", False):
             return
         if code == 0:
@@ -348,18 +381,23 @@ class PyInstallerWorkspaceGUI(QWidget):
         QApplication.processEvents()
 
     def _install_pyinstaller_then_nuitka(self):
+        from . import tracing
+        from .output_stream import OutputStream
         # Installe PyInstaller
         process = QProcess(self)
         self._venv_install_pyinstaller_process = process
         process.setProgram(self._venv_pip_exe)
         process.setArguments(["install", "pyinstaller"])
         process.setWorkingDirectory(self._venv_path)
-        process.readyReadStandardOutput.connect(lambda: self._on_venv_output(process))
-        process.readyReadStandardError.connect(lambda: self._on_venv_output(process, error=True))
+        process.trace_span = tracing.span("venv.pip_install", track="venv", package="pyinstaller")
+        OutputStream(process).lines.connect(lambda channel, lines: self._on_venv_output(lines, error=channel == "stderr"))
         process.finished.connect(lambda code, status: self._on_pyinstaller_then_nuitka_installed(process, code, status, step=1))
         process.start()
 
     def _on_pyinstaller_then_nuitka_installed(self, process, code, status, step):
+        from . import tracing
+        from .output_stream import OutputStream
+        process.trace_span.end(exit_code=code)
         if getattr(self, "_closing", False):
             return
         if step == 1:
@@ -374,8 +412,8 @@ class PyInstallerWorkspaceGUI(QWidget):
                 process2.setProgram(self._venv_pip_exe)
                 process2.setArguments(["install", "nuitka"])
                 process2.setWorkingDirectory(self._venv_path)
-                process2.readyReadStandardOutput.connect(lambda: self._on_venv_output(process2))
-                process2.readyReadStandardError.connect(lambda: self._on_venv_output(process2, error=True))
+                process2.trace_span = tracing.span("venv.pip_install", track="venv", package="nuitka")
+                OutputStream(process2).lines.connect(lambda channel, lines: self._on_venv_output(lines, error=channel == "stderr"))
                 process2.finished.connect(lambda code2, status2: self._on_pyinstaller_then_nuitka_installed(process2, code2, status2, step=2))
                 process2.start()
             else:
@@ -400,8 +438,12 @@ class PyInstallerWorkspaceGUI(QWidget):
         QApplication.processEvents()
 
     def install_requirements_if_needed(self, path):
+        from . import tracing
+        from .output_stream import OutputStream
         req_path = os.path.join(path, "requirements.txt")
-        if os.path.exists(req_path):
+        if not os.path.exists(req_path):
+            self.record_venv_ready(path)
+        else:
             self._safe_log("📦 Installation des dépendances à partir de requirements.txt...")
             pip_exe = os.path.join(path, "venv", "Scripts" if platform.system() == "Windows" else "bin", "pip")
             try:
@@ -412,8 +454,9 @@ class PyInstallerWorkspaceGUI(QWidget):
                 process.setProgram(pip_exe)
                 process.setArguments(["install", "-r", req_path])
                 process.setWorkingDirectory(path)
-                process.readyReadStandardOutput.connect(lambda: self._on_pip_output(process))
-                process.readyReadStandardError.connect(lambda: self._on_pip_output(process, error=True))
+                self._req_install_path = path
+                process.trace_span = tracing.span("venv.requirements", track="venv")
+                OutputStream(process).lines.connect(lambda channel, lines: self._on_pip_output(lines, error=channel == "stderr"))
                 process.finished.connect(lambda code, status: self._on_pip_finished(process, code, status))
                 self._pip_progress_lines = 0
                 self.progress_dialog.show()
@@ -422,25 +465,25 @@ class PyInstallerWorkspaceGUI(QWidget):
             except Exception as e:
                 self.log.append(f"❌ Échec installation requirements.txt : {e}")
 
-    def _on_pip_output(self, process, error=False):
+    def _on_pip_output(self, lines, error=False):
         if getattr(self, "_closing", False):
             return
-        data = process.readAllStandardError().data().decode() if error else process.readAllStandardOutput().data().decode()
         if hasattr(self, 'progress_dialog') and self.progress_dialog:
             # Affiche la dernière ligne reçue
-            lines = data.strip().splitlines()
             if lines:
                 self.progress_dialog.set_message(lines[-1])
             self._pip_progress_lines += len(lines)
             # Simule une progression (pip ne donne pas de %)
             self.progress_dialog.set_progress(self._pip_progress_lines, 0)
-        self._safe_log(data)
+        self._safe_log("\n".join(lines))
 
     def _on_pip_finished(self, process, code, status):
+        process.trace_span.end(exit_code=code)
         if getattr(self, "_closing", False):
             return
         if code == 0:
             self._safe_log("✅ requirements.txt installé.")
+            self.record_venv_ready(self._req_install_path)
             if hasattr(self, 'progress_dialog') and self.progress_dialog:
                 self.progress_dialog.set_message("Installation terminée.")
         else:
@@ -496,7 +539,6 @@ class PyInstallerWorkspaceGUI(QWidget):
             self.update_command_preview()
             self.save_preferences()
 
-    from .compiler import build_nuitka_command, build_pyinstaller_command
 
     def select_nuitka_icon(self):
         from PySide6.QtWidgets import QFileDialog
@@ -671,9 +713,14 @@ class PyInstallerWorkspaceGUI(QWidget):
         if self.output_dir_input.text().strip(): summary.append(f"Sortie: {self.output_dir_input.text().strip()}")
         # Widget options_summary supprimé; plus de mise à jour de résumé visuel
 
-    from .compiler import compile_all, try_start_processes, try_install_missing_modules, handle_finished, handle_stderr, handle_stdout, show_error_dialog, start_compilation_process, cancel_all_compilations
     def set_controls_enabled(self, enabled):
         self.btn_build_all.setEnabled(enabled)
+        if self.btn_matrix_build:
+            self.btn_matrix_build.setEnabled(enabled)
+        if self.btn_build_agents:
+            self.btn_build_agents.setEnabled(enabled)
+        if self.btn_artifact_cache:
+            self.btn_artifact_cache.setEnabled(enabled)
         self.btn_cancel_all.setEnabled(not enabled)
         self.btn_select_folder.setEnabled(enabled)
         self.btn_select_icon.setEnabled(enabled)
@@ -759,10 +806,14 @@ class PyInstallerWorkspaceGUI(QWidget):
             "select_folder": "📁 Workspace",
             "select_files": "📋 Fichiers",
             "build_all": "🚀 Compiler",
+            "matrix_build": "🧪 Matrice de compilation",
+            "build_agents": "🛰️ Agents de compilation",
+            "artifact_cache": "♻️ Cache d'artefacts",
             "export_config": "💾 Exporter config",
             "import_config": "📥 Importer config",
             "cancel_all": "⛔ Annuler",
             "suggest_deps": "🔎 Analyser les dépendances",
+            "analyze_exclusions": "✂️ Analyser les exclusions",
             "help": "❓ Aide",
             "show_stats": "📊 Statistiques",
             "select_lang": "Choisir une langue",
@@ -788,6 +839,7 @@ class PyInstallerWorkspaceGUI(QWidget):
             "opt_debug": "Mode debug (--debug)",
             "opt_auto_install": "Auto-installer les modules manquants",
             "opt_silent_errors": "Ne pas afficher de boîte d'erreur (mode silencieux)",
+            "opt_benchmark": "Mesurer le démarrage des exécutables produits",
             # "custom_args" supprimé (widget supprimé)
             # Nuitka tab
             "tab_nuitka": "Nuitka",
@@ -805,10 +857,14 @@ class PyInstallerWorkspaceGUI(QWidget):
             "select_folder": "📁 Workspace",
             "select_files": "📋 Files",
             "build_all": "🚀 Build",
+            "matrix_build": "🧪 Build matrix",
+            "build_agents": "🛰️ Build agents",
+            "artifact_cache": "♻️ Artifact cache",
             "export_config": "💾 Export config",
             "import_config": "📥 Import config",
             "cancel_all": "⛔ Cancel",
             "suggest_deps": "🔎 Analyze dependencies",
+            "analyze_exclusions": "✂️ Analyze exclusions",
             "help": "❓ Help",
             "show_stats": "📊 Statistics",
             "select_lang": "Choose language",
@@ -834,6 +890,7 @@ class PyInstallerWorkspaceGUI(QWidget):
             "opt_debug": "Debug mode (--debug)",
             "opt_auto_install": "Auto-install missing modules",
             "opt_silent_errors": "Do not show error box (silent mode)",
+            "opt_benchmark": "Benchmark startup of produced executables",
             # "custom_args" supprimé (widget supprimé)
             # Nuitka tab
             "tab_nuitka": "Nuitka",
@@ -855,10 +912,18 @@ class PyInstallerWorkspaceGUI(QWidget):
         self.btn_select_folder.setText(tr["select_folder"])
         self.btn_select_files.setText(tr["select_files"])
         self.btn_build_all.setText(tr["build_all"])
+        if self.btn_matrix_build:
+            self.btn_matrix_build.setText(tr["matrix_build"])
+        if self.btn_build_agents:
+            self.btn_build_agents.setText(tr["build_agents"])
+        if self.btn_artifact_cache:
+            self.btn_artifact_cache.setText(tr["artifact_cache"])
         self.btn_export_config.setText(tr["export_config"])
         self.btn_import_config.setText(tr["import_config"])
         self.btn_cancel_all.setText(tr["cancel_all"])
         self.btn_suggest_deps.setText(tr["suggest_deps"])
+        if self.btn_analyze_exclusions:
+            self.btn_analyze_exclusions.setText(tr["analyze_exclusions"])
         self.btn_help.setText(tr["help"])
         self.btn_show_stats.setText(tr["show_stats"])
         self.select_lang.setText(tr["select_lang"])
@@ -886,6 +951,8 @@ class PyInstallerWorkspaceGUI(QWidget):
         self.opt_debug.setText(tr["opt_debug"])
         self.opt_auto_install.setText(tr["opt_auto_install"])
         self.opt_silent_errors.setText(tr["opt_silent_errors"])
+        if self.opt_benchmark:
+            self.opt_benchmark.setText(tr["opt_benchmark"])
         # self.custom_args supprimé (widget supprimé)
         # Nuitka options
         self.nuitka_onefile.setText(tr["nuitka_onefile"])
@@ -918,7 +985,6 @@ class PyInstallerWorkspaceGUI(QWidget):
 
     
 
-    from .dependency_analysis import suggest_missing_dependencies, _install_next_dependency, _on_dep_pip_finished, _on_dep_pip_output
 
     def _safe_log(self, text):
         try:
@@ -948,7 +1014,8 @@ class PyInstallerWorkspaceGUI(QWidget):
         return False
 
     def _terminate_background_tasks(self):
-        # Tuer proprement les QProcess en cours
+        from .process_supervisor import kill_tree_now
+        # Tuer les QProcess en cours et leurs enfants (pip lance des builds de wheels)
         for attr in [
             '_venv_create_process',
             '_venv_install_pyinstaller_process',
@@ -956,11 +1023,12 @@ class PyInstallerWorkspaceGUI(QWidget):
             '_venv_check_process',
             '_venv_check_install_process',
             '_req_install_process',
+            '_loopback_agent_process',
         ]:
             proc = getattr(self, attr, None)
             try:
                 if proc:
-                    proc.kill()
+                    kill_tree_now(proc)
             except Exception:
                 pass
             setattr(self, attr, None)
@@ -1021,4 +1089,25 @@ class PyInstallerWorkspaceGUI(QWidget):
             else:
                 event.ignore()
         else:
-            event.accept()
\ No newline at end of file
+            event.accept()
+
+
+# Méthodes des sous-systèmes, importées au premier usage (lazy.py) pour accélérer le démarrage
+install_lazy_methods(PyInstallerWorkspaceGUI, {
+    ".toolchain": ("start_toolchain_probe",),
+    ".venv_fingerprint": ("record_venv_ready",),
+    ".compiler": (
+        "build_nuitka_command", "build_pyinstaller_command", "compile_all", "try_start_processes",
+        "try_install_missing_modules", "handle_finished", "handle_output", "handle_stderr", "handle_stdout",
+        "show_error_dialog", "start_compilation_process", "cancel_all_compilations", "job_uses_nuitka",
+    ),
+    ".dependency_analysis": (
+        "suggest_missing_dependencies", "_install_next_dependency", "_on_dep_pip_finished", "_on_dep_pip_output",
+    ),
+    ".exclusion_analysis": ("analyze_exclusions", "reset_auto_exclusions"),
+    ".matrix_build": ("start_matrix_build", "on_matrix_job_done"),
+    ".job_queue": ("show_queue_context_menu", "prioritize_target", "cancel_target", "retry_target", "toggle_pause_target"),
+    ".remote_build": ("configure_build_agents", "start_remote_compilation"),
+    ".build_cache": ("configure_artifact_cache", "start_batch"),
+    ".c_backend": ("benchmark_c_backend",),
+})